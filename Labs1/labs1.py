@@ -2,48 +2,144 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
 
-
-fig, ax = plt.subplots(figsize=(7, 7), subplot_kw={'projection': 'polar'})
-plt.subplots_adjust(left=0.1, bottom=0.25)
-
-
-a_init = 1.0
-phi = np.linspace(0, 2*np.pi, 1000)
-rho = a_init * np.sin(6 * phi)
-
-
-line, = ax.plot(phi, rho)
-
-
-ax.set_rorigin(0)
-ax.set_rlim(0, max(abs(rho)) + 0.5)
-
-
-ax.grid(True, color='black', linestyle='-', linewidth=0.5)
-ax.spines['polar'].set_visible(True)
-ax.spines['polar'].set_linewidth(2)
-
-
-rmax = max(abs(rho)) + 0.5
-ax.annotate("", xy=(0, rmax), xytext=(0, rmax - 0.5), 
-            arrowprops=dict(arrowstyle="->", color="k"))
-ax.annotate("", xy=(np.pi/2, rmax), xytext=(np.pi/2, rmax - 0.5), 
-            arrowprops=dict(arrowstyle="->", color="k"))
-
-
-ax_slider = plt.axes([0.1, 0.1, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-slider = Slider(ax_slider, 'a', -10.0, 10.0, valinit=a_init)
-
-
-def update(val):
-    a = slider.val
-    rho_new = a * np.sin(6 * phi)
-    line.set_ydata(rho_new)
-    
-    
-    ax.set_rlim(0, max(abs(rho_new)) + 0.5)
-    fig.canvas.draw_idle()
-
-slider.on_changed(update)
-
-plt.show()
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cglib.curves import adaptive_sample, polar_curve, sampling_report
+from cglib.mpl_incremental import FrameTimes
+
+
+# Роза ρ = sin(6φ) для a = 1
+rose = polar_curve(lambda p: np.sin(6 * p))
+
+# Граница по ρ округляется вверх до шага, чтобы полная перерисовка была нужна редко
+rlim_step = 1.0
+
+
+def rose_basis(pixels_per_unit, pixel_error=0.25):
+    """
+    Углы и базис sin(6φ) розы. Форма розы от a не зависит (меняется только масштаб),
+    поэтому углы подбираются один раз для a = 1 с ошибкой хорды не больше pixel_error пикселей.
+    :param pixels_per_unit: Сколько пикселей занимает единица радиуса.
+    :return: Кортеж (phi, basis).
+    """
+    phi = adaptive_sample(rose, 0, 2*np.pi, pixel_error, scale=pixels_per_unit)[0]
+    return phi, np.sin(6 * phi)
+
+
+def rlim_bound(a, basis_max):
+    return np.ceil((abs(a) * basis_max + 0.5) / rlim_step) * rlim_step
+
+
+def main(report=False):
+    """
+    :param report: Вывести сравнение адаптивной и равномерной выборки кривой
+        (двоичный поиск числа равномерных точек заметно дороже самой выборки).
+    """
+    fig, ax = plt.subplots(figsize=(7, 7), subplot_kw={'projection': 'polar'})
+    plt.subplots_adjust(left=0.1, bottom=0.25)
+
+    a_init = 1.0
+    # Кривая радиуса 1 занимает не больше половины ширины осей в пикселях
+    pixels_per_unit = ax.get_window_extent().width / 2
+    pixel_error = 0.25
+    phi, basis = rose_basis(pixels_per_unit, pixel_error)
+    if report:
+        print('Точки кривой:', sampling_report(rose, phi, pixel_error, scale=pixels_per_unit))
+    # Базис sin(6φ) считается один раз: смена a — это одно умножение в готовый буфер
+    basis_max = np.abs(basis).max()
+    rho = np.empty_like(basis)
+    np.multiply(basis, a_init, out=rho)
+
+    line, = ax.plot(phi, rho)
+
+    ax.set_rorigin(0)
+    rlim = rlim_bound(a_init, basis_max)
+    ax.set_rlim(0, rlim)
+
+    ax.grid(True, color='black', linestyle='-', linewidth=0.5)
+    ax.spines['polar'].set_visible(True)
+    ax.spines['polar'].set_linewidth(2)
+
+    rmax = max(abs(rho)) + 0.5
+    ax.annotate("", xy=(0, rmax), xytext=(0, rmax - 0.5),
+                arrowprops=dict(arrowstyle="->", color="k"))
+    ax.annotate("", xy=(np.pi/2, rmax), xytext=(np.pi/2, rmax - 0.5),
+                arrowprops=dict(arrowstyle="->", color="k"))
+
+    ax_slider = plt.axes([0.1, 0.1, 0.65, 0.03], facecolor='lightgoldenrodyellow')
+    slider = Slider(ax_slider, 'a', -10.0, 10.0, valinit=a_init)
+    # Ползунок не перерисовывает всю фигуру сам: его подвижные части блитятся вместе с кривой
+    slider.drawon = False
+
+    fps_text = fig.text(0.1, 0.03, '')
+
+    # Подвижные артисты рисуются поверх закэшированного статического фона. Оси ползунка
+    # рисуются целиком (полоса, ручка, подпись значения) — без закрытых полей Slider
+    animated = [line, slider.ax, fps_text]
+    for artist in animated:
+        artist.set_animated(True)
+
+    background = None
+    frame_times = FrameTimes()
+    # Начало кадра с полной перерисовкой: draw_idle только планирует ее, поэтому кадр
+    # замеряется до события draw_event
+    frame_start = None
+
+    def show_fps():
+        # Текст задается до отрисовки подвижных артистов: показан последний завершенный кадр
+        if frame_times.samples:
+            fps_text.set_text(f'{1 / max(frame_times.samples[-1], 1e-6):.0f} FPS')
+
+    def on_draw(event):
+        # После полной перерисовки кэшируем фон без подвижных артистов и дорисовываем их
+        nonlocal background, frame_start
+        background = fig.canvas.copy_from_bbox(fig.bbox)
+        if frame_start is not None:
+            frame_times.record(time.perf_counter() - frame_start)
+            frame_start = None
+        show_fps()
+        for artist in animated:
+            fig.draw_artist(artist)
+
+    def update(val):
+        nonlocal rlim, frame_start
+        start = time.perf_counter()
+        np.multiply(basis, slider.val, out=rho)
+        line.set_ydata(rho)
+
+        new_rlim = rlim_bound(slider.val, basis_max)
+        if new_rlim != rlim or background is None or not fig.canvas.supports_blit:
+            # Граница изменилась — нужна полная перерисовка сетки и подписей
+            rlim = new_rlim
+            ax.set_rlim(0, rlim)
+            # Несколько изменений до перерисовки — один кадр с начала первого из них
+            if frame_start is None:
+                frame_start = start
+            fig.canvas.draw_idle()
+        else:
+            fig.canvas.restore_region(background)
+            show_fps()
+            for artist in animated:
+                fig.draw_artist(artist)
+            fig.canvas.blit(fig.bbox)
+            frame_times.record(time.perf_counter() - start)
+
+    def on_close(event):
+        print('Кадры:', frame_times.summary())
+
+    fig.canvas.mpl_connect('draw_event', on_draw)
+    fig.canvas.mpl_connect('close_event', on_close)
+    slider.on_changed(update)
+
+    plt.show()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Роза ρ = a*sin(6φ)')
+    parser.add_argument('--report', action='store_true', help='Вывести число точек адаптивной и равномерной выборки')
+    args = parser.parse_args()
+    main(args.report)
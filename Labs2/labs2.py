@@ -2,48 +2,18 @@ import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 
-# Золотое сечение
-phi = (1 + np.sqrt(5)) / 2
-
-# Вершины додекаэдра
-vertices = np.array([
-    [1, 1, -1],
-    [phi, 0, -1 / phi],
-    [1, -1, -1],
-    [0, -1/phi, -phi],
-    [0, 1/phi, -phi],
-    [1, 1, 1],
-    [1, -1, 1],
-    [-1, -1, -1],
-    [-1, -1, 1],
-    [-1, 1, -1],
-    [-1, 1, 1],
-    [0, 1/phi, phi],
-    [0, -1/phi, phi],
-    [1/phi, phi, 0],
-    [1/phi, -phi, 0],
-    [-1/phi, phi, 0],
-    [-1/phi, -phi, 0],
-    [phi, 0, 1/phi],
-    [-phi, 0, 1/phi],
-    [-phi, 0, -1/phi]
-])
-
-# Грани додекаэдра
-faces = np.array([
-    [0, 1, 2, 3, 4],
-    [3, 4, 9, 19, 7],
-    [3, 2, 14, 16, 7],
-    [0, 4, 9, 15, 13],
-    [15, 13, 5, 11, 10],
-    [11, 10, 18, 8, 12],
-    [18, 8, 16, 7, 19],
-    [18, 19, 9, 15, 10],
-    [14, 16, 8, 12, 6],
-    [12, 6, 17, 5, 11],
-    [6, 17, 1, 2, 14],
-    [17, 1, 0, 13, 5]
-])
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cglib.culling import cull_back_faces
+from cglib.meshgen import dodecahedron
+from cglib.raster import view_basis
+from cglib.transforms import TransformStack
+
+# Вершины и грани додекаэдра; обход граней согласован, чтобы все нормали смотрели наружу:
+# без этого отсечение невозможно
+vertices, faces = dodecahedron()
 
 def rotation_matrix(alpha, beta, gamma):
     """
@@ -102,24 +72,45 @@ def draw_dodecahedron_3d(vertices, faces):
 
     plt.show()
 
-def calculate_face_depth(vertices, face):
-    """
-    Вычисляет среднюю глубину (z-координату) для грани.
-    """
-    return np.mean([vertices[index][2] for index in face])
-
 def draw_dodecahedron_3d_with_culling(vertices, faces):
     fig = plt.figure()
     ax = fig.add_subplot(111, projection='3d')
-
-    # Сортировка граней по средней глубине
-    faces_sorted = sorted(faces, key=lambda face: calculate_face_depth(vertices, face), reverse=True)
-
-    # Рисуем грани в порядке от самых дальних до самых ближних
-    for face in faces_sorted:
-        polygon = [vertices[index] for index in face]
-        poly3d = [[vertices[index] for index in face]]
-        ax.add_collection3d(Poly3DCollection(poly3d, facecolors='cyan', linewidths=1, edgecolors='r', alpha=.25))
+    # Отсечение считается для ортографического вида без растяжения осей
+    ax.set_proj_type('ortho')
+    ax.set_box_aspect((1, 1, 1))
+    collection = Poly3DCollection([], facecolors='cyan', linewidths=1, edgecolors='r', alpha=.25)
+    ax.add_collection3d(collection)
+
+    # Масштаб копится в матрице преобразования, вершины пересчитываются в готовый буфер
+    transform = TransformStack()
+    transformed = np.array(vertices, dtype=np.float64)
+
+    def update_culling(event=None):
+        """
+        Отбрасывает нелицевые грани для текущего вида и сортирует оставшиеся по глубине.
+        """
+        view_dir = view_basis(ax.elev, ax.azim)[2]
+        order, culled = cull_back_faces(transformed, faces, view_dir)
+        collection.set_verts(transformed[faces[order]])
+        ax.set_title(f'3D Dodecahedron with Culling (culled: {culled}/{len(faces)})')
+        if event is not None:
+            fig.canvas.draw_idle()
+
+    def on_key(event):
+        if event.key == '+':
+            transform.scale(1.1)  # Увеличиваем масштаб
+        elif event.key == '-':
+            transform.scale(1 / 1.1)  # Уменьшаем масштаб
+        else:
+            return
+        transform.apply(vertices, out=transformed)
+        update_culling(event)
+
+    fig.canvas.mpl_connect('key_press_event', on_key)
+
+    # Пересчитываем отсечение при вращении мышью
+    fig.canvas.mpl_connect('motion_notify_event', lambda event: event.button and update_culling(event))
+    fig.canvas.mpl_connect('button_release_event', update_culling)
 
     # Настройка параметров отображения
     ax.set_xlabel('X')
@@ -128,7 +119,7 @@ def draw_dodecahedron_3d_with_culling(vertices, faces):
     ax.set_xlim([-2, 2])
     ax.set_ylim([-2, 2])
     ax.set_zlim([-2, 2])
-    ax.set_title('3D Dodecahedron with Culling')
+    update_culling()
 
     plt.show()
 
@@ -145,9 +136,10 @@ def isometric_projection(vertices):
     # Вращаем вокруг оси X и Z для получения изометрической проекции
     alpha = np.arctan(1/np.sqrt(2))  # Примерно 35.264 градусов
     gamma = np.radians(45)  # 45 градусов
-    rotated_vertices = vertices @ rotation_matrix(alpha, 0, gamma)
-    # Применяем ортографическую проекцию
-    return orthographic_projection(rotated_vertices)
+    # Поворот и ортографическая проекция собираются в одну матрицу 4x4.
+    # Умножение строк вершин на матрицу справа равносильно применению транспонированной матрицы
+    transform = TransformStack().then(rotation_matrix(alpha, 0, gamma).T).project()
+    return orthographic_projection(transform.apply(vertices))
 
 def draw_2d_projection(vertices, faces, title='Projection'):
     """
@@ -170,36 +162,25 @@ def draw_2d_projection(vertices, faces, title='Projection'):
 
     plt.show()
 
-# Пример использования функций вращения и масштабирования
-rotated_vertices = vertices @ rotation_matrix(np.radians(30), np.radians(30), np.radians(30))
-scaled_vertices = scale_vertices(rotated_vertices, 1.5)
-
-scale_factor = 1.0
+def main():
+    # Пример использования функций вращения и масштабирования: поворот и масштаб в одной матрице
+    transform = TransformStack().then(rotation_matrix(np.radians(30), np.radians(30), np.radians(30)).T).scale(1.5)
+    scaled_vertices = transform.apply(vertices)
 
-def redraw_figure(scale):
-    plt.clf()  # Очищаем текущую фигуру
-    scaled_vertices = scale_vertices(vertices, scale)
-    draw_dodecahedron_3d_with_culling(scaled_vertices, faces)
-    plt.draw()
+    #база
+    draw_dodecahedron_3d(scaled_vertices, faces)
 
-def on_key(event):
-    global scale_factor
-    if event.key == '+':
-        scale_factor *= 1.1  # Увеличиваем масштаб
-    elif event.key == '-':
-        scale_factor /= 1.1  # Уменьшаем масштаб
-    redraw_figure(scale_factor)
+    # Рисуем додекаэдр в 3D с удалением невидимых линий
+    draw_dodecahedron_3d_with_culling(vertices, faces)
 
-#база
-draw_dodecahedron_3d(scaled_vertices, faces)
+    # Рисуем ортографическую проекцию
+    orthographic_vertices = orthographic_projection(vertices)
+    draw_2d_projection(orthographic_vertices, faces, title='Orthographic Projection')
 
-# Рисуем додекаэдр в 3D с удалением невидимых линий
-draw_dodecahedron_3d_with_culling(vertices, faces)
+    # Рисуем изометрическую проекцию
+    isometric_vertices = isometric_projection(vertices)
+    draw_2d_projection(isometric_vertices, faces, title='Isometric Projection')
 
-# Рисуем ортографическую проекцию
-orthographic_vertices = orthographic_projection(vertices)
-draw_2d_projection(orthographic_vertices, faces, title='Orthographic Projection')
 
-# Рисуем изометрическую проекцию
-isometric_vertices = isometric_projection(vertices)
-draw_2d_projection(isometric_vertices, faces, title='Isometric Projection')
+if __name__ == "__main__":
+    main()
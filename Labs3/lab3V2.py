@@ -1,84 +1,120 @@
 import matplotlib.pyplot as plt
-import numpy as np
 from matplotlib.widgets import Slider
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
-from matplotlib.colors import LightSource
 
-# Функция для создания круга вершин с заданным радиусом и количеством сегментов
-def get_circle(r, segments, height):
-    return [[r * np.cos(2 * np.pi * i / segments), r * np.sin(2 * np.pi * i / segments), height] for i in range(segments + 1)]
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cglib.frame_writer import encode_png
+from cglib.indexed_mesh import weld_vertices
+from cglib.meshgen import generate_ring_faces, generate_ring_vertices
+from cglib.mesh_cache import MeshCache
+from cglib.mesh_io import write_mesh
+from cglib.mpl_incremental import CoalescingUpdater, MeshArtist
+from cglib.raster import render_mesh
+from cglib.shading import ShadingEngine, face_normals
 
 # Функция для создания вершин цилиндра с использованием круглых слоев
 def generate_cylinder_vertices(h, r, n_segments):
-    vertices = []
-    for i in range(n_segments + 1):
-        z = h * i / n_segments
-        vertices += get_circle(r, n_segments, z)
-    return np.array(vertices)
+    return generate_ring_vertices(r, h, n_segments, n_segments)
 
 # Функция для создания граней цилиндра
 def generate_cylinder_faces(n_segments):
-    faces = []
-    for i in range(n_segments):
-        for j in range(n_segments):
-            current = i * (n_segments + 1) + j
-            next = current + (n_segments + 1)
-            faces += [
-                [current, current + 1, next],
-                [current + 1, next + 1, next]
-            ]
-    return faces
-
-# Функция для рисования барреля с использованием освещения от LightSource
-def draw_barrel(vertices, faces, ax, light_azimuth, light_altitude):
-    ax.clear()
-    ls = LightSource(azdeg=light_azimuth, altdeg=light_altitude)
-    shaded = np.zeros((len(faces), 3))
-    for i, face in enumerate(faces):
-        normals = np.cross(vertices[face[1]] - vertices[face[0]],
-                           vertices[face[2]] - vertices[face[0]])
-        normals /= np.linalg.norm(normals)
-        shaded[i] = ls.shade_normals(normals)
-    collection = Poly3DCollection(vertices[faces], facecolors=shaded, linewidths=0.5, edgecolors=(0, 0, 0, 0.3))
-    ax.add_collection3d(collection)
-    ax.auto_scale_xyz([-r, r], [-r, r], [0, h])
-    plt.draw()
-
-# Обновление визуализации барреля на основе ползунков
-def update(val):
-    global n_segments, light_azimuth, light_altitude
-    n_segments = int(slider_segments.val)
-    light_azimuth = slider_light.val
-    light_altitude = 90 - abs(slider_light.val - 180)  # Корректировка высоты освещения на основе азимута
-    vertices = generate_cylinder_vertices(h, r, n_segments)
-    faces = generate_cylinder_faces(n_segments)
-    draw_barrel(vertices, faces, ax, light_azimuth, light_altitude)
+    return generate_ring_faces(n_segments, n_segments)
+
+# Функция для построения сетки барреля вместе с нормалями граней; повтор первой точки
+# кольца на шве сливается, поэтому в кэше и затенении на n_segments + 1 вершин меньше
+def build_mesh(n_segments):
+    vertices, faces, _ = weld_vertices(generate_cylinder_vertices(h, r, n_segments), generate_cylinder_faces(n_segments))
+    return vertices, faces, face_normals(vertices, faces)
 
 # Параметры барреля
 h, r = 15, 3  # Высота и радиус цилиндрического барреля
 
-# Начальные параметры источника света
-light_azimuth = 45
-light_altitude = 30
+# Движок затенения с кэшем нормалей граней
+shading = ShadingEngine()
+
+def main():
+    # Функция для получения сетки: повторное посещение разрешения — просто поиск в кэше
+    def get_mesh(n_segments):
+        return mesh_cache.get(('cylinder', h, (r,), n_segments), lambda: build_mesh(n_segments))
+
+    # Функция для рисования барреля с освещением по Ламберту
+    def draw_barrel(vertices, faces, light_azimuth, light_altitude, normals=None):
+        # Вершины коллекции заменяются только при смене сетки, при смене света — только цвета граней
+        barrel.set_mesh(vertices, faces)
+        # Нормали пересчитываются только при смене геометрии, свет — одно умножение матрицы на вектор
+        shading.set_geometry(vertices, faces, normals)
+        barrel.set_colors(shading.shade(light_azimuth, light_altitude))
+
+    # Сохранение текущего вида программным растеризатором, без matplotlib 3D
+    def save_raster_image(path, width=800, height=800):
+        vertices, faces, normals = get_mesh(n_segments)
+        shading.set_geometry(vertices, faces, normals)
+        image = render_mesh(vertices, faces, shading.shade(light_azimuth, light_altitude), width, height, ax.elev, ax.azim)
+        with open(path, 'wb') as file:
+            file.write(encode_png(image))
+
+    # Клавиша I сохраняет изображение текущего вида, E — текущую сетку в STL, PLY и OBJ
+    def on_key(event):
+        if event.key == 'i':
+            save_raster_image(f'barrel_{n_segments}.png')
+        elif event.key == 'e':
+            for extension in ('stl', 'ply', 'obj'):
+                write_mesh(f'barrel_{n_segments}.{extension}', *get_mesh(n_segments))
+
+    # Обновление визуализации барреля на основе ползунков; вызывается не чаще раза за кадр
+    def update():
+        nonlocal n_segments, light_azimuth, light_altitude
+        n_segments = int(slider_segments.val)
+        light_azimuth = slider_light.val
+        light_altitude = 90 - abs(slider_light.val - 180)  # Корректировка высоты освещения на основе азимута
+        vertices, faces, normals = get_mesh(n_segments)
+        draw_barrel(vertices, faces, light_azimuth, light_altitude, normals)
+
+    # Вывод статистики при закрытии окна
+    def on_close(event):
+        print('Кэш сеток:', mesh_cache.stats())
+        print('Кадры:', updater.stats())
+
+    # Начальные параметры источника света
+    light_azimuth = 45
+    light_altitude = 30
+
+    # Кэш сеток по параметрам тесселяции; каталог CGLIB_MESH_DIR включает общие для процессов контейнеры на диске
+    mesh_cache = MeshCache(directory=os.environ.get('CGLIB_MESH_DIR'))
+
+    # Настройка графика
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+    ax.auto_scale_xyz([-r, r], [-r, r], [0, h])
+
+    # Постоянная коллекция граней и объединение событий ползунков в одну перерисовку за кадр
+    barrel = MeshArtist(ax, linewidths=0.5, edgecolors=(0, 0, 0, 0.3))
+    updater = CoalescingUpdater(fig.canvas, update)
+
+    # Начальное количество сегментов
+    n_segments = 20
+
+    # Ползунок для количества сегментов
+    ax_slider_segments = plt.axes([0.25, 0.01, 0.65, 0.03], facecolor='lightgoldenrodyellow')
+    slider_segments = Slider(ax_slider_segments, 'Сегменты', 4, 40, valinit=n_segments, valstep=1)
+    slider_segments.on_changed(updater.request)
+
+    # Объединенный ползунок для азимута и высоты освещения
+    ax_slider_light = plt.axes([0.25, 0.05, 0.65, 0.03], facecolor='lightgoldenrodyellow')
+    slider_light = Slider(ax_slider_light, 'Азимут и высота освещения', 0, 360, valinit=light_azimuth, valstep=1)
+    slider_light.on_changed(updater.request)
 
-# Настройка графика
-fig = plt.figure()
-ax = fig.add_subplot(111, projection='3d')
+    fig.canvas.mpl_connect('key_press_event', on_key)
 
-# Начальное количество сегментов
-n_segments = 20
+    fig.canvas.mpl_connect('close_event', on_close)
 
-# Ползунок для количества сегментов
-ax_slider_segments = plt.axes([0.25, 0.01, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-slider_segments = Slider(ax_slider_segments, 'Сегменты', 4, 40, valinit=n_segments, valstep=1)
-slider_segments.on_changed(update)
+    # Начальная отрисовка
+    update()
 
-# Объединенный ползунок для азимута и высоты освещения
-ax_slider_light = plt.axes([0.25, 0.05, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-slider_light = Slider(ax_slider_light, 'Азимут и высота освещения', 0, 360, valinit=light_azimuth, valstep=1)
-slider_light.on_changed(update)
+    plt.show()
 
-# Начальная отрисовка
-update(0)
 
-plt.show()
+if __name__ == "__main__":
+    main()
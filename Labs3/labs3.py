@@ -1,90 +1,94 @@
 import matplotlib.pyplot as plt
-import numpy as np
 from matplotlib.widgets import Slider
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
-from matplotlib.colors import LightSource
 
-# Функция для создания круга вершин с заданным радиусом и количеством сегментов
-def get_circle(r, segments, height):
-    return [[r * np.cos(2 * np.pi * i / segments), r * np.sin(2 * np.pi * i / segments), height] for i in range(segments + 1)]
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cglib.indexed_mesh import weld_vertices
+from cglib.meshgen import barrel_profile, generate_ring_faces, generate_ring_vertices
+from cglib.mesh_cache import MeshCache
+from cglib.shading import ShadingEngine, face_normals
 
 # Функция для создания вершин бочки, используя круглые слои
 def generate_barrel_vertices(h, r_top, r_bottom, r_max, n_segments):
-    vertices = []
-    for i in range(n_segments + 1):
-        z = h * i / n_segments
-        # Радиус меняется в зависимости от высоты для формирования формы бочки
-        # Простая синусоидальная функция для создания плавной формы бочки
-        r = r_bottom + (r_max - r_bottom) * np.sin(np.pi * z / h)
-        vertices += get_circle(r, n_segments, z)
-    return np.array(vertices)
+    # Радиус меняется по синусоидальному профилю, сетка строится одним броадкастом
+    return generate_ring_vertices(barrel_profile(h, r_bottom, r_max), h, n_segments, n_segments)
 
 # Функция для создания граней бочки
 def generate_barrel_faces(n_segments):
-    faces = []
-    for i in range(n_segments):
-        for j in range(n_segments):
-            current = i * (n_segments + 1) + j
-            next = current + (n_segments + 1)
-            faces += [
-                [current, current + 1, next],
-                [current + 1, next + 1, next]
-            ]
-    return faces
-
-# Функция для отрисовки бочки с использованием освещения от LightSource
-def draw_barrel(vertices, faces, ax, azimuth, altitude):
+    return generate_ring_faces(n_segments, n_segments)
+
+# Функция для построения сетки бочки вместе с нормалями граней; повтор первой точки
+# кольца на шве сливается, поэтому в кэше и затенении на n_segments + 1 вершин меньше
+def build_mesh(n_segments):
+    vertices, faces, _ = weld_vertices(generate_barrel_vertices(h, r_top, r_bottom, r_max, n_segments),
+                                       generate_barrel_faces(n_segments))
+    return vertices, faces, face_normals(vertices, faces)
+
+# Функция для отрисовки бочки с освещением по Ламберту
+def draw_barrel(vertices, faces, ax, azimuth, altitude, normals=None):
     ax.clear()
-    ls = LightSource(azdeg=azimuth, altdeg=altitude)
-    shaded = np.zeros((len(faces), 3))
-    for i, face in enumerate(faces):
-        normals = np.cross(vertices[face[1]] - vertices[face[0]],
-                           vertices[face[2]] - vertices[face[0]])
-        normals /= np.linalg.norm(normals)
-        shaded[i] = ls.shade_normals(normals)
+    # Нормали пересчитываются только при смене геометрии, свет — одно умножение матрицы на вектор
+    shading.set_geometry(vertices, faces, normals)
+    shaded = shading.shade(azimuth, altitude)
     collection = Poly3DCollection(vertices[faces], facecolors=shaded, linewidths=0.5, edgecolors=(0, 0, 0, 0.3))
     ax.add_collection3d(collection)
     max_radius = max(r_top, r_bottom, r_max)
     ax.auto_scale_xyz([-max_radius, max_radius], [-max_radius, max_radius], [0, h])
     plt.draw()
 
-# Обновление визуализации бочки на основе ползунка
-def update(val):
-    global n_segments, light_azimuth, light_altitude
-    n_segments = int(slider_segments.val)
-    light_azimuth = slider_light.val
-    # Автоматически корректируем высоту освещения на основе азимута для динамического эффекта
-    light_altitude = 90 - abs(light_azimuth - 180)
-    vertices = generate_barrel_vertices(h, r_top, r_bottom, r_max, n_segments)
-    faces = generate_barrel_faces(n_segments)
-    draw_barrel(vertices, faces, ax, light_azimuth, light_altitude)
-
 # Параметры бочки
 h, r_top, r_bottom, r_max = 15, 2, 2, 5
 
-# Параметры источника света
-light_azimuth = 45
-light_altitude = 30
-lightsource = [light_azimuth, light_altitude]
+# Движок затенения с кэшем нормалей граней
+shading = ShadingEngine()
+
+def main():
+    # Параметры источника света
+    light_azimuth = 45
+    light_altitude = 30
+
+    # Кэш сеток по параметрам тесселяции; каталог CGLIB_MESH_DIR включает общие для процессов контейнеры на диске
+    mesh_cache = MeshCache(directory=os.environ.get('CGLIB_MESH_DIR'))
+
+    # Настройка графика
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+
+    # Начальное количество сегментов
+    n_segments = 20
+
+    # Обновление визуализации бочки на основе ползунка
+    def update(val):
+        nonlocal n_segments, light_azimuth, light_altitude
+        n_segments = int(slider_segments.val)
+        light_azimuth = slider_light.val
+        # Автоматически корректируем высоту освещения на основе азимута для динамического эффекта
+        light_altitude = 90 - abs(light_azimuth - 180)
+        # Сетка берется из кэша: повторное посещение разрешения — просто поиск
+        vertices, faces, normals = mesh_cache.get(('barrel', h, (r_top, r_bottom, r_max), n_segments), lambda: build_mesh(n_segments))
+        draw_barrel(vertices, faces, ax, light_azimuth, light_altitude, normals)
+
+    # Ползунок для количества сегментов
+    ax_slider_segments = plt.axes([0.25, 0.02, 0.65, 0.03], facecolor='lightgoldenrodyellow')
+    slider_segments = Slider(ax_slider_segments, 'Сегменты', 4, 40, valinit=n_segments, valstep=1)
+    slider_segments.on_changed(update)
 
-# Настройка графика
-fig = plt.figure()
-ax = fig.add_subplot(111, projection='3d')
+    # Ползунок для управления азимутом и высотой освещения
+    ax_slider_light = plt.axes([0.25, 0.07, 0.65, 0.03], facecolor='lightgoldenrodyellow')
+    slider_light = Slider(ax_slider_light, 'Азимут освещения', 0, 360, valinit=light_azimuth, valstep=1)
+    slider_light.on_changed(update)
 
-# Начальное количество сегментов
-n_segments = 20
+    # Счетчики кэша сеток выводятся при закрытии окна
+    fig.canvas.mpl_connect('close_event', lambda event: print('Кэш сеток:', mesh_cache.stats()))
 
-# Ползунок для количества сегментов
-ax_slider_segments = plt.axes([0.25, 0.02, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-slider_segments = Slider(ax_slider_segments, 'Сегменты', 4, 40, valinit=n_segments, valstep=1)
-slider_segments.on_changed(update)
+    # Начальная отрисовка
+    update(0)
 
-# Ползунок для управления азимутом и высотой освещения
-ax_slider_light = plt.axes([0.25, 0.07, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-slider_light = Slider(ax_slider_light, 'Азимут освещения', 0, 360, valinit=light_azimuth, valstep=1)
-slider_light.on_changed(update)
+    plt.show()
 
-# Начальная отрисовка
-update(0)
 
-plt.show()
+if __name__ == "__main__":
+    main()
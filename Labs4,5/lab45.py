@@ -3,51 +3,53 @@ from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
 import numpy as np
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cglib.gl_renderer import MeshRenderer
+from cglib.indexed_mesh import IndexedMesh
+from cglib.lod import LODManager, clip_matrix, projected_radius
+from cglib.mesh_cache import MeshCache
+from cglib.meshgen import generate_ring_faces, generate_ring_vertices
+from cglib.profiler import FrameLimiter, FrameProfiler
+from cglib.shading import face_normals
 
 # Глобальная переменная для задания точности цилиндра
 accurance = 10
 
-# Функция для создания круга вершин
-def get_circle(r, segments, height):
-    # Возвращает круг вершин с радиусом r, количеством сегментов segments и высотой height
-    return [[r * np.cos(2 * np.pi * i / segments), height, r * np.sin(2 * np.pi * i / segments)] for i in range(segments)]
-
 # Функция для генерации вершин цилиндра
 def generate_cylinder_vertices(h, r, n_segments):
     # Генерирует вершины для цилиндра с высотой h, радиусом r и количеством сегментов n_segments
-    vertices = []
-    for i in range(2):  # Два круга: верхний и нижний
-        y = h * (i % 2)  # 0 для нижнего круга, h для верхнего
-        vertices += get_circle(r, n_segments, y)
-    return np.array(vertices)
+    # Два круга (нижний и верхний) строятся одним броадкастом в общем генераторе
+    return generate_ring_vertices(r, h, n_segments, 1, up='y', seam=False)
 
 # Функция для генерации граней цилиндра
 def generate_cylinder_faces(n_segments):
     # Генерирует грани для цилиндра на основе количества сегментов
-    faces = []
-    for i in range(n_segments):
-        current_bottom = i
-        current_top = i + n_segments
-        next_bottom = (i + 1) % n_segments
-        next_top = (i + 1) % n_segments + n_segments
-
-        # Боковые стороны
-        faces.append([current_bottom, next_bottom, next_top])
-        faces.append([current_bottom, next_top, current_top])
-    return np.array(faces)
+    return generate_ring_faces(n_segments, 1, seam=False)
 
 # Функция для расчета нормалей
 def calculate_normals(vertices, faces):
-    # Вычисляет нормали для каждой грани, используя вершины
-    norms = []
-    for face in faces:
-        v1 = np.array(vertices[face[0]]) - np.array(vertices[face[1]])
-        v2 = np.array(vertices[face[0]]) - np.array(vertices[face[2]])
-        norm = np.cross(v1, v2)
-        if np.linalg.norm(norm) != 0:
-            norm = norm / np.linalg.norm(norm)
-        norms.append(norm)
-    return np.array(norms)
+    # Вычисляет нормали для каждой грани, используя вершины (все грани одним векторизованным проходом)
+    return face_normals(vertices, faces)
+
+# Кэш сеток цилиндра по параметрам тесселяции
+mesh_cache = MeshCache()
+
+# Функция для получения сетки цилиндра через кэш
+def get_cylinder_mesh(h, r, n_segments, smooth=False):
+    # Возвращает вершины, грани и нормали; уже встречавшиеся разрешения берутся из кэша.
+    # smooth=True — слитые вершины и нормали вершин для гладкого затенения, иначе нормали граней
+    def build():
+        vertices = generate_cylinder_vertices(h, r, n_segments)
+        faces = generate_cylinder_faces(n_segments)
+        if smooth:
+            return IndexedMesh.from_arrays(vertices, faces).arrays()
+        return vertices, faces, calculate_normals(vertices, faces)
+    kind = 'cylinder_smooth' if smooth else 'cylinder'
+    return mesh_cache.get((kind, h, (r,), n_segments), build)
 
 def draw(verts, faces, norms):
     # Рисует цилиндр с заданными вершинами, гранями и нормалями
@@ -58,7 +60,17 @@ def draw(verts, faces, norms):
             glVertex3fv(verts[vertex])
     glEnd()
 
-def main():
+def set_camera(display, angle, lift, distance):
+    # Заново строит матрицу проекции: перспектива, отодвигание на distance, подъем lift и поворот angle
+    # (то же, что накопленные glTranslatef/glRotatef, но расстояние до камеры можно менять колесом мыши)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    gluPerspective(45, (display[0] / display[1]), 0.1, 50.0)
+    glTranslatef(0.0, -1.65 + lift, -distance)
+    glRotatef(angle, 0, 1, 0)
+
+def main(fps=25, profile=None):
+    # fps — целевая частота кадров; profile — путь для Chrome-trace JSON (None — без профилирования)
     global accurance
 
     pygame.init()
@@ -82,9 +94,8 @@ def main():
     glEnable(GL_DEPTH_TEST)
 
     # Настройка матрицы проекции
-    glMatrixMode(GL_PROJECTION)
-    gluPerspective(45, (display[0] / display[1]), 0.1, 50.0)
-    glTranslatef(0.0, -1.65, -5)
+    angle, lift, distance = 0.0, 0.0, 5.0
+    set_camera(display, angle, lift, distance)
 
     # Параметры цилиндра
     r = 1  # Радиус
@@ -92,15 +103,30 @@ def main():
     n_segments = accurance
 
     # Генерация цилиндра
-    vertices = generate_cylinder_vertices(h, r, n_segments)
-    faces = generate_cylinder_faces(n_segments)
-    norms = calculate_normals(vertices, faces)
+    vertices, faces, norms = get_cylinder_mesh(h, r, n_segments)
+
+    # Сетка рисуется из буферов вершин; немедленный режим draw() остается запасным путем
+    renderer = MeshRenderer(fallback=draw)
+
+    # Автоматический уровень детализации по радиусу цилиндра на экране (по умолчанию выключен,
+    # L — вкл/выкл, UP/DOWN переключают на ручную точность); сетки всех уровней строятся заранее
+    # для плоского и гладкого затенения (N — переключение)
+    smooth = False
+    lods = {flag: LODManager(lambda n, flag=flag: get_cylinder_mesh(h, r, n, flag), range(4, 37, 2),
+                             pixels_per_segment=32)
+            for flag in (False, True)}
+    auto_lod = False
 
     draging = False
     last_m = [0, 0]
 
+    # Профилирование включается только по запросу; частоту кадров держит ограничитель
+    profiler = FrameProfiler(enabled=profile is not None)
+    limiter = FrameLimiter(fps)
+
     run = True
     while run:
+        profiler.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 run = False
@@ -120,21 +146,35 @@ def main():
                     rot = np.array([0, 0])
                     rot[0] = last_m[0] - mouse_x
                     last_m = [mouse_x, mouse_y]
-                    glRotatef(-360 * (rot[0]/display[0]), 0, 1, 0)
+                    angle -= 360 * (rot[0]/display[0])
+
+            elif event.type == pygame.MOUSEWHEEL:
+                distance = min(max(distance - 0.5 * event.y, 2.0), 45.0)
 
             # Управление точностью и отражающей способностью
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_UP and accurance < 35:
+                    auto_lod = False
                     accurance += 2
-                    vertices = generate_cylinder_vertices(h, r, accurance)
-                    faces = generate_cylinder_faces(accurance)
-                    norms = calculate_normals(vertices, faces)
+                    with profiler.section('mesh'):
+                        vertices, faces, norms = get_cylinder_mesh(h, r, accurance, smooth)
 
                 elif event.key == pygame.K_DOWN and accurance > 4:
+                    auto_lod = False
                     accurance -= 2
-                    vertices = generate_cylinder_vertices(h, r, accurance)
-                    faces = generate_cylinder_faces(accurance)
-                    norms = calculate_normals(vertices, faces)
+                    with profiler.section('mesh'):
+                        vertices, faces, norms = get_cylinder_mesh(h, r, accurance, smooth)
+
+                elif event.key == pygame.K_n:
+                    smooth = not smooth
+                    vertices, faces, norms = get_cylinder_mesh(h, r, accurance, smooth)
+
+                elif event.key == pygame.K_l:
+                    auto_lod = not auto_lod
+
+                elif event.key == pygame.K_v:
+                    # Переключение между буферами вершин и немедленным режимом
+                    renderer.use_vbo = not renderer.use_vbo
 
                 elif event.key == pygame.K_LEFT and reflect_lvl > 0.1:
                     reflect_lvl -= 0.1
@@ -154,18 +194,42 @@ def main():
 
         keypress = pygame.key.get_pressed()
         if keypress[pygame.K_w]:
-            glTranslatef(0, 0.1, 0.0)
+            lift += 0.1
         if keypress[pygame.K_s]:
-            glTranslatef(0, -0.1, 0.0)
+            lift -= 0.1
+        set_camera(display, angle, lift, distance)
+
+        if auto_lod:
+            with profiler.section('mesh'):
+                matrix = clip_matrix(glGetDoublev(GL_PROJECTION_MATRIX), glGetDoublev(GL_MODELVIEW_MATRIX))
+                lod = lods[smooth]
+                level = lod.select(projected_radius([0, h / 2, 0], r, matrix, display[1]))[0]
+                accurance = int(lod.levels[level])
+                vertices, faces, norms = lod.mesh(level)
+        profiler.lap('events')
 
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
-        draw(vertices, faces, norms)
+        renderer.set_mesh(vertices, faces, norms, smooth)
+        renderer.draw()
+        profiler.lap('draw')
         
         pygame.display.flip()
-        pygame.time.wait(40)
+        profiler.lap('flip')
+        limiter.wait()
+        profiler.lap('wait')
+        profiler.end_frame()
 
+    renderer.release()
     pygame.quit()
+    print('Кэш сеток:', mesh_cache.stats())
+    if profile:
+        print('Кадры:', profiler.summary())
+        profiler.write_chrome_trace(profile)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Цилиндр с освещением')
+    parser.add_argument('--fps', type=float, default=25, help='Целевая частота кадров')
+    parser.add_argument('--profile', metavar='TRACE_JSON', help='Профилировать кадры и сохранить Chrome-trace')
+    args = parser.parse_args()
+    main(args.fps, args.profile)
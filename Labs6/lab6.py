@@ -1,24 +1,34 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+# Без дисплея платформа PyOpenGL (EGL) должна быть выбрана до импорта OpenGL, поэтому --headless
+# разбирается заранее тем же argparse: формы --headless N, --headless=N и сокращения
+_headless_parser = argparse.ArgumentParser(add_help=False)
+_headless_parser.add_argument('--headless', type=int)
+if __name__ == "__main__" and _headless_parser.parse_known_args()[0].headless:
+    import cglib.gl_context
+
 import pygame
 from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
 import numpy as np
 import math
+from cglib.gl_renderer import MeshRenderer
+from cglib.indexed_mesh import IndexedMesh
+from cglib.instancing import InstancedRenderer, make_instances
+from cglib.mesh_cache import MeshCache
+from cglib.mesh_io import write_mesh
+from cglib.meshgen import generate_ring_faces, generate_ring_vertices
+from cglib.profiler import FrameLimiter, FrameProfiler
+from cglib.shaders import COLOR_FRAGMENT_SHADER, ShaderProgram, try_create_program
+from cglib.shading import face_normals
 
 # Глобальная переменная для точности цилиндра
 accurance = 10
 
-# Функция для создания круга вершин
-def get_circle(r, segments, height):
-    """
-    Создает круг вершин для цилиндра.
-    :param r: Радиус круга.
-    :param segments: Количество сегментов (вершин) круга.
-    :param height: Высота круга по оси Y.
-    :return: Список вершин круга.
-    """
-    return [[r * np.cos(2 * np.pi * i / segments), height, r * np.sin(2 * np.pi * i / segments)] for i in range(segments)]
-
 # Функция для генерации вершин цилиндра
 def generate_cylinder_vertices(h, r, n_segments):
     """
@@ -28,11 +38,7 @@ def generate_cylinder_vertices(h, r, n_segments):
     :param n_segments: Количество сегментов (вершин) на круге.
     :return: Массив вершин цилиндра.
     """
-    vertices = []
-    for i in range(2):  # Два круга: верхний и нижний
-        y = h * (i % 2)  # 0 для нижнего круга, h для верхнего
-        vertices += get_circle(r, n_segments, y)
-    return np.array(vertices)
+    return generate_ring_vertices(r, h, n_segments, 1, up='y', seam=False)
 
 # Функция для генерации граней цилиндра
 def generate_cylinder_faces(n_segments):
@@ -41,17 +47,7 @@ def generate_cylinder_faces(n_segments):
     :param n_segments: Количество сегментов (вершин) на круге.
     :return: Массив граней цилиндра.
     """
-    faces = []
-    for i in range(n_segments):
-        current_bottom = i
-        current_top = i + n_segments
-        next_bottom = (i + 1) % n_segments
-        next_top = (i + 1) % n_segments + n_segments
-
-        # Боковые стороны
-        faces.append([current_bottom, next_bottom, next_top])
-        faces.append([current_bottom, next_top, current_top])
-    return np.array(faces)
+    return generate_ring_faces(n_segments, 1, seam=False)
 
 # Функция для расчета нормалей
 def calculate_normals(vertices, faces):
@@ -61,15 +57,28 @@ def calculate_normals(vertices, faces):
     :param faces: Массив граней цилиндра.
     :return: Массив нормалей для каждой грани.
     """
-    norms = []
-    for face in faces:
-        v1 = np.array(vertices[face[0]]) - np.array(vertices[face[1]])
-        v2 = np.array(vertices[face[0]]) - np.array(vertices[face[2]])
-        norm = np.cross(v1, v2)
-        if np.linalg.norm(norm) != 0:
-            norm = norm / np.linalg.norm(norm)
-        norms.append(norm)
-    return np.array(norms)
+    return face_normals(vertices, faces)
+
+# Кэш сеток цилиндра по параметрам тесселяции
+mesh_cache = MeshCache()
+
+def get_cylinder_mesh(h, r, n_segments, smooth=False):
+    """
+    Возвращает сетку цилиндра; уже встречавшиеся разрешения берутся из кэша.
+    :param h: Высота цилиндра.
+    :param r: Радиус основания цилиндра.
+    :param n_segments: Количество сегментов (вершин) на круге.
+    :param smooth: Слитые вершины и нормали вершин для гладкого затенения вместо нормалей граней.
+    :return: Кортеж (вершины, грани, нормали).
+    """
+    def build():
+        vertices = generate_cylinder_vertices(h, r, n_segments)
+        faces = generate_cylinder_faces(n_segments)
+        if smooth:
+            return IndexedMesh.from_arrays(vertices, faces).arrays()
+        return vertices, faces, calculate_normals(vertices, faces)
+    kind = 'cylinder_smooth' if smooth else 'cylinder'
+    return mesh_cache.get((kind, h, (r,), n_segments), build)
 
 def draw(verts, faces, norms):
     """
@@ -85,16 +94,41 @@ def draw(verts, faces, norms):
             glVertex3fv(verts[vertex])
     glEnd()
 
-def main():
-    global accurance
+# Шейдеры анимации цвета: GLSL 1.20 читает состояние освещения и материала фиксированного
+# конвейера (gl_LightSource, gl_FrontMaterial), поэтому клавиши LEFT/RIGHT работают и здесь;
+# фрагментный шейдер общий с инстансингом (cglib.shaders)
+COLOR_VERTEX_SHADER = """
+#version 120
+varying vec3 position;
+varying vec3 normal;
+varying float color_phase;
 
-    pygame.init()
-    display = (1280, 780)
-    pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
+void main() {
+    position = vec3(gl_ModelViewMatrix * gl_Vertex);
+    normal = gl_NormalMatrix * gl_Normal;
+    color_phase = 0.0;
+    gl_Position = gl_ModelViewProjectionMatrix * gl_Vertex;
+}
+"""
 
+def create_color_shader():
+    """
+    Собирает шейдер анимации цвета.
+    :return: ShaderProgram или None, если шейдеры недоступны (тогда цвет задает glMaterialfv).
+    """
+    program, reason = try_create_program(COLOR_VERTEX_SHADER, COLOR_FRAGMENT_SHADER)
+    if program is None:
+        print('Шейдеры недоступны, используется фиксированный конвейер:', reason)
+    return program
+
+def setup_scene(display, reflect_lvl):
+    """
+    Настраивает освещение, материал и перспективу сцены.
+    :param display: Размер области вывода (ширина, высота).
+    :param reflect_lvl: Начальный уровень отражения.
+    """
     # Настройка освещения
     glEnable(GL_LIGHTING)
-    reflect_lvl = 0.0
     glLightfv(GL_LIGHT0, GL_POSITION, [0.5, 5, -10, 1])
     glLightfv(GL_LIGHT0, GL_AMBIENT, [reflect_lvl, reflect_lvl, reflect_lvl, 1])
     glLightfv(GL_LIGHT0, GL_DIFFUSE, [1, 0.3, 0.6, reflect_lvl])
@@ -113,20 +147,86 @@ def main():
     gluPerspective(45, (display[0] / display[1]), 0.1, 50.0)
     glTranslatef(0.0, -1.65, -5)
 
+def set_animated_color(time_passed, reflect_lvl):
+    """
+    Устанавливает цвет материала, изменяющийся по синусоидальному закону.
+    :param time_passed: Время анимации.
+    :param reflect_lvl: Уровень отражения (альфа-компонента).
+    """
+    # Рассчитываем значения цветов с помощью синусоидальной функции
+    color_change_red = (math.sin(time_passed) + 1) / 2
+    color_change_green = (math.sin(time_passed + math.pi / 2) + 1) / 2
+    color_change_blue = (math.sin(time_passed + math.pi) + 1) / 2
+
+    # Устанавливаем новые значения цветов для материала
+    glMaterialfv(GL_FRONT_AND_BACK, GL_DIFFUSE, [color_change_red, color_change_green, color_change_blue, reflect_lvl])
+    glMaterialfv(GL_FRONT_AND_BACK, GL_SPECULAR, [color_change_red, color_change_green, color_change_blue, reflect_lvl])
+
+def cylinder_field(count, seed=0):
+    """
+    Поле цилиндров на квадратной сетке перед камерой со случайными сдвигами фазы цвета.
+    :param count: Количество цилиндров.
+    :param seed: Зерно генератора фаз.
+    :return: Массив экземпляров INSTANCE_DTYPE.
+    """
+    side = int(np.ceil(np.sqrt(count)))
+    spacing = 4.0 / side
+    scale = 0.4 * spacing
+    i, j = np.divmod(np.arange(count), side)
+    # Сетка 4x4 в плоскости xy с центром на высоте камеры; основание цилиндра ниже центра ячейки
+    positions = np.column_stack([(j - (side - 1) / 2) * spacing,
+                                 1.65 + (i - (side - 1) / 2) * spacing - scale,
+                                 np.zeros(count)])
+    phases = np.random.default_rng(seed).uniform(0, 2 * np.pi, count)
+    return make_instances(positions, phases, scale=scale)
+
+def main(fps=50, profile=None, use_shaders=True, instances=0, smooth=False):
+    """
+    Интерактивная анимация в окне.
+    :param fps: Целевая частота кадров.
+    :param profile: Путь для Chrome-trace JSON; None — без профилирования.
+    :param use_shaders: Анимировать цвет шейдером (G переключает на фиксированный конвейер и обратно).
+    :param instances: Количество цилиндров поля; 0 — один цилиндр.
+    :param smooth: Гладкое затенение по нормалям вершин (N — переключение).
+    """
+    global accurance
+
+    pygame.init()
+    display = (1280, 780)
+    pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
+
+    reflect_lvl = 0.0
+    setup_scene(display, reflect_lvl)
+
     # Генерация цилиндра
     r = 1  # Радиус
     h = 2  # Высота цилиндра
     n_segments = accurance
-    vertices = generate_cylinder_vertices(h, r, n_segments)
-    faces = generate_cylinder_faces(n_segments)
-    norms = calculate_normals(vertices, faces)
+    vertices, faces, norms = get_cylinder_mesh(h, r, n_segments, smooth)
+
+    # Сетка рисуется из буферов вершин; немедленный режим draw() остается запасным путем
+    renderer = MeshRenderer(fallback=draw)
+
+    # Поле цилиндров рисуется одним вызовом на кадр; у каждого своя матрица и фаза цвета
+    field = InstancedRenderer(vertices, faces, norms, cylinder_field(instances), smooth) if instances else None
+
+    # Цвет и освещение считаются на GPU; из Python каждый кадр передается только время
+    program = create_color_shader() if use_shaders and field is None else None
+    shading = program is not None
+    if shading:
+        program.use()
 
     draging = False
     last_m = [0, 0]
     time_passed = 0.0
 
+    # Профилирование включается только по запросу; частоту кадров держит ограничитель
+    profiler = FrameProfiler(enabled=profile is not None)
+    limiter = FrameLimiter(fps)
+
     run = True
     while run:
+        profiler.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 run = False
@@ -153,15 +253,30 @@ def main():
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_UP and accurance < 35:
                     accurance += 2
-                    vertices = generate_cylinder_vertices(h, r, accurance)
-                    faces = generate_cylinder_faces(accurance)
-                    norms = calculate_normals(vertices, faces)
+                    with profiler.section('mesh'):
+                        vertices, faces, norms = get_cylinder_mesh(h, r, accurance, smooth)
 
                 elif event.key == pygame.K_DOWN and accurance > 4:
                     accurance -= 2
-                    vertices = generate_cylinder_vertices(h, r, accurance)
-                    faces = generate_cylinder_faces(accurance)
-                    norms = calculate_normals(vertices, faces)
+                    with profiler.section('mesh'):
+                        vertices, faces, norms = get_cylinder_mesh(h, r, accurance, smooth)
+
+                elif event.key == pygame.K_n:
+                    # Переключение между плоским и гладким затенением
+                    smooth = not smooth
+                    vertices, faces, norms = get_cylinder_mesh(h, r, accurance, smooth)
+
+                elif event.key == pygame.K_v:
+                    # Переключение между буферами вершин и немедленным режимом
+                    renderer.use_vbo = not renderer.use_vbo
+
+                elif event.key == pygame.K_g and program is not None:
+                    # Переключение между шейдером и фиксированным конвейером
+                    shading = not shading
+                    if shading:
+                        program.use()
+                    else:
+                        ShaderProgram.unuse()
 
                 elif event.key == pygame.K_LEFT and reflect_lvl > 0.1:
                     reflect_lvl -= 0.1
@@ -185,27 +300,122 @@ def main():
             glTranslatef(0, 0.1, 0.0)  # Движение камеры вверх
         if keypress[pygame.K_s]:
             glTranslatef(0, -0.1, 0.0)  # Движение камеры вниз
+        profiler.lap('events')
 
         time_passed += 0.1  # Увеличиваем время для анимации цвета
 
-        # Рассчитываем значения цветов с помощью синусоидальной функции
-        color_change_red = (math.sin(time_passed) + 1) / 2
-        color_change_green = (math.sin(time_passed + math.pi / 2) + 1) / 2
-        color_change_blue = (math.sin(time_passed + math.pi) + 1) / 2
-
-        # Устанавливаем новые значения цветов для материала
-        glMaterialfv(GL_FRONT_AND_BACK, GL_DIFFUSE, [color_change_red, color_change_green, color_change_blue, reflect_lvl])
-        glMaterialfv(GL_FRONT_AND_BACK, GL_SPECULAR, [color_change_red, color_change_green, color_change_blue, reflect_lvl])
+        if shading:
+            program.set_uniform('time', time_passed)
+        elif field is None:
+            set_animated_color(time_passed, reflect_lvl)
 
         # Очищаем буферы цвета и глубины и затем рисуем объект
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        draw(vertices, faces, norms)
+        if field is not None:
+            field.set_mesh(vertices, faces, norms, smooth)
+            field.draw(time_passed)
+        else:
+            renderer.set_mesh(vertices, faces, norms, smooth)
+            renderer.draw()
+        profiler.lap('draw')
         
         pygame.display.flip()  # Обновляем содержимое окна
-        pygame.time.wait(20)  # Делаем небольшую задержку
+        profiler.lap('flip')
+        limiter.wait()  # Ждем до срока следующего кадра
+        profiler.lap('wait')
+        profiler.end_frame()
 
+    renderer.release()
+    if program is not None:
+        program.release()
+    if field is not None:
+        field.release()
     pygame.quit()
+    print('Кэш сеток:', mesh_cache.stats())
+    if profile:
+        print('Кадры:', profiler.summary())
+        profiler.write_chrome_trace(profile)
+
+def render_headless(n_frames, out_dir, fmt='png', display=(1280, 780), workers=4, time_step=0.1,
+                    use_shaders=True, instances=0, smooth=False):
+    """
+    Рендерит анимацию цвета во внеэкранный буфер без окна и сохраняет кадры.
+    Время анимации идет фиксированным шагом, без ожиданий по реальному времени;
+    сжатие и запись кадров выполняются фоновым пулом и не блокируют рендеринг.
+    :param n_frames: Количество кадров.
+    :param out_dir: Каталог для кадров.
+    :param fmt: 'png' или 'raw'.
+    :param display: Размер кадра (ширина, высота).
+    :param workers: Количество потоков записи.
+    :param time_step: Шаг времени анимации на кадр.
+    :param use_shaders: Анимировать цвет шейдером, если он доступен.
+    :param instances: Количество цилиндров поля; 0 — один цилиндр.
+    :param smooth: Гладкое затенение по нормалям вершин.
+    """
+    from cglib.frame_writer import FrameWriter
+    from cglib.gl_context import HeadlessContext
+    from cglib.offscreen import Framebuffer
+
+    width, height = display
+    with HeadlessContext(width, height):
+        framebuffer = Framebuffer(width, height)
+        framebuffer.bind()
+        reflect_lvl = 0.0
+        setup_scene(display, reflect_lvl)
+
+        vertices, faces, norms = get_cylinder_mesh(2, 1, accurance, smooth)
+        renderer = MeshRenderer(fallback=draw)
+        renderer.set_mesh(vertices, faces, norms, smooth)
+
+        field = InstancedRenderer(vertices, faces, norms, cylinder_field(instances), smooth) if instances else None
+        program = create_color_shader() if use_shaders and field is None else None
+        if program is not None:
+            program.use()
+
+        with FrameWriter(out_dir, width, height, fmt=fmt, workers=workers) as writer:
+            time_passed = 0.0
+            for frame in range(n_frames):
+                time_passed += time_step
+                if program is not None:
+                    program.set_uniform('time', time_passed)
+                elif field is None:
+                    set_animated_color(time_passed, reflect_lvl)
+                glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+                if field is not None:
+                    field.draw(time_passed)
+                else:
+                    renderer.draw()
+                buffer = writer.acquire()
+                framebuffer.read_into(buffer)
+                writer.submit(frame, buffer)
+
+        renderer.release()
+        if program is not None:
+            program.release()
+        if field is not None:
+            field.release()
+        framebuffer.release()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Анимация цвета цилиндра')
+    parser.add_argument('--headless', type=int, metavar='N', help='Отрендерить N кадров без окна')
+    parser.add_argument('--out', default='frames', help='Каталог для кадров')
+    parser.add_argument('--format', choices=['png', 'raw'], default='png', help='Формат кадров')
+    parser.add_argument('--size', type=int, nargs=2, default=[1280, 780], metavar=('W', 'H'))
+    parser.add_argument('--workers', type=int, default=4, help='Потоки записи кадров')
+    parser.add_argument('--fps', type=float, default=50, help='Целевая частота кадров')
+    parser.add_argument('--profile', metavar='TRACE_JSON', help='Профилировать кадры и сохранить Chrome-trace')
+    parser.add_argument('--no-shaders', action='store_true', help='Анимировать цвет через glMaterialfv без шейдеров')
+    parser.add_argument('--instances', type=int, default=0, metavar='N', help='Поле из N цилиндров (инстансинг)')
+    parser.add_argument('--smooth', action='store_true', help='Гладкое затенение по нормалям вершин')
+    parser.add_argument('--export', metavar='PATH', help='Сохранить сетку цилиндра в .stl, .ply или .obj и выйти')
+    parser.add_argument('--segments', type=int, default=accurance, help='Количество сегментов для --export')
+    args = parser.parse_args()
+    if args.export:
+        write_mesh(args.export, *get_cylinder_mesh(2, 1, args.segments))
+    elif args.headless:
+        render_headless(args.headless, args.out, args.format, tuple(args.size), args.workers,
+                        use_shaders=not args.no_shaders, instances=args.instances, smooth=args.smooth)
+    else:
+        main(args.fps, args.profile, not args.no_shaders, args.instances, args.smooth)
 
@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+
+# Корень репозитория, чтобы импортировать cglib при запуске скрипта напрямую
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+def best_time(func, repeat=3):
+    """
+    Лучшее время выполнения func из нескольких запусков.
+    :param func: Функция без аргументов.
+    :param repeat: Количество запусков.
+    :return: Время в секундах.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_table(rows, columns):
+    """
+    Печатает результаты замеров в виде простой таблицы.
+    :param rows: Список словарей с результатами.
+    :param columns: Имена выводимых столбцов.
+    """
+    print('  '.join(f'{name:>14}' for name in columns))
+    for row in rows:
+        cells = []
+        for name in columns:
+            value = row.get(name)
+            if value is None:
+                cells.append(f'{"-":>14}')
+            elif isinstance(value, float):
+                cells.append(f'{value:>14.6f}')
+            else:
+                cells.append(f'{value:>14}')
+        print('  '.join(cells))
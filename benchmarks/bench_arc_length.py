@@ -0,0 +1,47 @@
+"""
+Замер таблиц длины дуги сплайна Lab 7: построение таблицы квадратурой Гаусса–Лежандра
+и массовый обратный поиск s -> (сегмент, t) через np.searchsorted и шаги Ньютона.
+
+Запуск: python benchmarks/bench_arc_length.py [--points 1000] [--queries 10000 1000000 4000000]
+"""
+import argparse
+
+import numpy as np
+
+from _bench import best_time, print_table
+from cglib.splines import ArcLengthTable, InterpolatingSpline
+
+
+def run(points, queries, seed=0, repeat=3):
+    """
+    :return: Список словарей с результатами для каждого количества запросов.
+    """
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.uniform(0.5, 1.5, points))
+    spline = InterpolatingSpline(x, rng.normal(size=points), 1.0, -1.0)
+    curve = spline.as_curve()
+    table = ArcLengthTable(curve)
+    build_s = best_time(lambda: ArcLengthTable(curve), repeat)
+    # Погрешность длины — по сравнению с заведомо более точной таблицей
+    error = abs(table.total_length - ArcLengthTable(curve, subdivisions=32, order=10).total_length)
+
+    rows = []
+    for n in queries:
+        s = rng.uniform(0, table.total_length, n)
+        locate_s = best_time(lambda: table.locate(s), 1 if n > 100000 else repeat)
+        rows.append({'segments': len(curve), 'queries': n, 'build_s': build_s, 'locate_s': locate_s,
+                     'queries_per_s': n / locate_s, 'length_error': error})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--points', type=int, default=1000)
+    parser.add_argument('--queries', type=int, nargs='+', default=[10000, 1000000, 4000000])
+    args = parser.parse_args()
+    print_table(run(args.points, args.queries),
+                ['segments', 'queries', 'build_s', 'locate_s', 'queries_per_s', 'length_error'])
+
+
+if __name__ == '__main__':
+    main()
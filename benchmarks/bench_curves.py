@@ -0,0 +1,53 @@
+"""
+Замер адаптивной дискретизации кривых: сколько точек нужно для заданной
+погрешности в пикселях по сравнению с равномерной сеткой той же точности.
+
+Запуск: python benchmarks/bench_curves.py [--pixels 500] [--errors 1 0.5 0.25 0.1]
+"""
+import argparse
+
+import numpy as np
+
+from _bench import best_time, print_table
+from cglib.curves import adaptive_sample, polar_curve, sampling_report
+
+
+def curves():
+    """
+    Тестовые кривые: роза из Labs1, спираль и узкий пик, масштабированные в единичную область.
+    """
+    return {
+        'rose k=6': (polar_curve(lambda p: np.sin(6 * p)), 0, 2 * np.pi),
+        'spiral': (polar_curve(lambda p: p / (6 * np.pi)), 0, 6 * np.pi),
+        'peak': (lambda t: (t, np.exp(-50 * t * t)), -1, 1),
+    }
+
+
+def run(pixels, errors, repeat=5):
+    """
+    Для каждой кривой и погрешности сравнивает адаптивную выборку с равномерной.
+    :param pixels: Сколько пикселей занимает единица длины на экране.
+    :return: Список словарей с результатами.
+    """
+    rows = []
+    for name, (curve, t0, t1) in curves().items():
+        for error in errors:
+            t = adaptive_sample(curve, t0, t1, error, scale=pixels)[0]
+            row = {'curve': name, 'pixel_error': error}
+            row.update(sampling_report(curve, t, error, scale=pixels))
+            row['sample_s'] = best_time(lambda: adaptive_sample(curve, t0, t1, error, scale=pixels), repeat)
+            rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pixels', type=float, default=500)
+    parser.add_argument('--errors', type=float, nargs='+', default=[1, 0.5, 0.25, 0.1])
+    args = parser.parse_args()
+    print_table(run(args.pixels, args.errors),
+                ['curve', 'pixel_error', 'adaptive_points', 'uniform_points', 'reduction', 'max_error', 'sample_s'])
+
+
+if __name__ == '__main__':
+    main()
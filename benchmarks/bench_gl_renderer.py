@@ -0,0 +1,70 @@
+"""
+Замер времени кадра цилиндра: немедленный режим против буферов вершин.
+Рендеринг идет во внеэкранный контекст EGL, дисплей не нужен.
+
+Запуск: python benchmarks/bench_gl_renderer.py [--segments 10 35 200 1000]
+"""
+import argparse
+
+from _bench import best_time, print_table
+from cglib.gl_context import HeadlessContext
+
+from OpenGL.GL import *
+
+from cglib.gl_renderer import MeshRenderer
+from cglib.meshgen import generate_cylinder_mesh
+from cglib.shading import face_normals
+
+
+# Немедленный режим в том виде, в каком он написан в Labs4,5 и Labs6
+def draw_immediate(verts, faces, norms):
+    glBegin(GL_TRIANGLES)
+    for i, face in enumerate(faces):
+        glNormal3fv(norms[i])
+        for vertex in face:
+            glVertex3fv(verts[vertex])
+    glEnd()
+
+
+def run(segments, frames=20):
+    """
+    Выполняет замеры для каждого количества сегментов.
+    :return: Список словарей с результатами (время одного кадра в секундах).
+    """
+    rows = []
+    with HeadlessContext(256, 256):
+        glEnable(GL_LIGHTING)
+        glEnable(GL_LIGHT0)
+        glEnable(GL_DEPTH_TEST)
+        renderer = MeshRenderer(fallback=draw_immediate)
+        for n in segments:
+            vertices, faces = generate_cylinder_mesh(2, 1, n)
+            renderer.set_mesh(vertices, faces, face_normals(vertices, faces))
+            row = {'segments': n, 'triangles': len(faces)}
+            for name, use_vbo in (('immediate_s', False), ('vbo_s', True)):
+                renderer.use_vbo = use_vbo
+                renderer.draw()  # Прогрев и загрузка буферов
+
+                def frames_loop():
+                    for _ in range(frames):
+                        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+                        renderer.draw()
+                    glFinish()
+                row[name] = best_time(frames_loop) / frames
+            row['speedup'] = row['immediate_s'] / row['vbo_s']
+            rows.append(row)
+        renderer.release()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--segments', type=int, nargs='+', default=[10, 35, 200, 1000])
+    parser.add_argument('--frames', type=int, default=20)
+    args = parser.parse_args()
+    rows = run(args.segments, args.frames)
+    print_table(rows, ['segments', 'triangles', 'immediate_s', 'vbo_s', 'speedup'])
+
+
+if __name__ == '__main__':
+    main()
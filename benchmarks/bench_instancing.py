@@ -0,0 +1,80 @@
+"""
+Замер отрисовки поля цилиндров: один вызов glDrawElementsInstanced против
+отдельного вызова на каждый экземпляр (запасной путь InstancedRenderer).
+Рендеринг идет во внеэкранный контекст EGL, дисплей не нужен.
+
+Запуск: python benchmarks/bench_instancing.py [--instances 100 1000 10000 100000] [--max-loop 10000]
+"""
+import argparse
+
+import numpy as np
+
+from _bench import best_time, print_table
+from cglib.gl_context import HeadlessContext
+
+from OpenGL.GL import *
+
+from cglib.instancing import InstancedRenderer, make_instances
+from cglib.meshgen import generate_cylinder_mesh
+from cglib.shading import face_normals
+
+
+def field(count, seed=0):
+    # Квадратная сетка цилиндров в поле зрения единичной камеры
+    side = int(np.ceil(np.sqrt(count)))
+    i, j = np.divmod(np.arange(count), side)
+    positions = np.column_stack([(j / side - 0.5) * 1.6, (i / side - 0.5) * 1.6, np.zeros(count)])
+    phases = np.random.default_rng(seed).uniform(0, 2 * np.pi, count)
+    return make_instances(positions, phases, scale=0.3 / side)
+
+
+def run(counts, segments=10, frames=10, max_loop=10000):
+    """
+    :return: Список словарей с результатами (время одного кадра в секундах).
+    """
+    rows = []
+    with HeadlessContext(512, 512):
+        glEnable(GL_LIGHTING)
+        glEnable(GL_LIGHT0)
+        glEnable(GL_DEPTH_TEST)
+        vertices, faces = generate_cylinder_mesh(2, 1, segments)
+        renderer = InstancedRenderer(vertices, faces, face_normals(vertices, faces))
+        program = renderer.program
+        for n in counts:
+            renderer.set_instances(field(n))
+            row = {'instances': n, 'triangles': n * len(faces)}
+            modes = [('instanced_s', program)]
+            if n <= max_loop:
+                modes.append(('per_instance_s', None))
+            for name, mode in modes:
+                renderer.program = mode
+                renderer.draw(0.0)  # Прогрев и загрузка буферов
+
+                def frames_loop():
+                    for frame in range(frames):
+                        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+                        renderer.draw(0.1 * frame)
+                    glFinish()
+                row[name] = best_time(frames_loop) / frames
+            renderer.program = program
+            row['instances_per_s'] = n / row['instanced_s']
+            if 'per_instance_s' in row:
+                row['speedup'] = row['per_instance_s'] / row['instanced_s']
+            rows.append(row)
+        renderer.release()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--instances', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--segments', type=int, default=10)
+    parser.add_argument('--frames', type=int, default=10)
+    parser.add_argument('--max-loop', type=int, default=10000, help='Не замерять запасной путь выше этого количества')
+    args = parser.parse_args()
+    rows = run(args.instances, args.segments, args.frames, args.max_loop)
+    print_table(rows, ['instances', 'triangles', 'instanced_s', 'per_instance_s', 'instances_per_s', 'speedup'])
+
+
+if __name__ == '__main__':
+    main()
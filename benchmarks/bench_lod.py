@@ -0,0 +1,70 @@
+"""
+Замер выбора уровня детализации для сцены из многих цилиндров (как в Labs4,5):
+суммарное количество треугольников при фиксированной точности, при выборе уровня
+по экранному радиусу и с бюджетом треугольников, а также время выбора на кадр.
+
+Запуск: python benchmarks/bench_lod.py [--objects 100 10000 100000] [--budget 200000]
+"""
+import argparse
+
+import numpy as np
+
+from _bench import best_time, print_table
+from cglib.lod import LODManager, projected_radius
+from cglib.meshgen import generate_cylinder_mesh
+
+
+def perspective(fovy, aspect, near, far):
+    # Матрица gluPerspective для точек-столбцов
+    f = 1 / np.tan(np.radians(fovy) / 2)
+    return np.array([[f / aspect, 0, 0, 0],
+                     [0, f, 0, 0],
+                     [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+                     [0, 0, -1, 0]])
+
+
+def run(counts, budget, seed=0, repeat=3):
+    """
+    :return: Список словарей с результатами для каждого количества цилиндров.
+    """
+    rng = np.random.default_rng(seed)
+    display = (1280, 780)
+    matrix = perspective(45, display[0] / display[1], 0.1, 50.0)
+    levels = range(4, 37, 2)
+    rows = []
+    for n in counts:
+        # Цилиндры радиуса 1 на расстоянии от 3 до 45 перед камерой
+        centers = np.column_stack([rng.uniform(-10, 10, n), rng.uniform(-5, 5, n), -rng.uniform(3, 45, n)])
+        pixels = projected_radius(centers, 1.0, matrix, display[1])
+
+        lod = LODManager(lambda k: generate_cylinder_mesh(2, 1, k), levels, pixels_per_segment=32)
+        budgeted = LODManager(lambda k: generate_cylinder_mesh(2, 1, k), levels, pixels_per_segment=32,
+                              triangle_budget=budget)
+        fixed = lod.triangles[-1] * n
+        chosen = lod.triangles[lod.select(pixels)].sum()
+        limited = budgeted.triangles[budgeted.select(pixels)].sum()
+
+        # Покачивание камеры: меньше 1% изменения размера не должно менять уровни
+        lod.switches = 0
+        for step in range(10):
+            lod.select(pixels * (1 + 0.005 * (-1) ** step))
+
+        rows.append({'objects': n, 'fixed_tris': int(fixed), 'lod_tris': int(chosen),
+                     'budget_tris': int(limited), 'jitter_switches': lod.switches,
+                     'select_s': best_time(lambda: lod.select(pixels), repeat),
+                     'budget_select_s': best_time(lambda: budgeted.select(pixels), repeat)})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--objects', type=int, nargs='+', default=[100, 10000, 100000])
+    parser.add_argument('--budget', type=int, default=200000)
+    args = parser.parse_args()
+    print_table(run(args.objects, args.budget),
+                ['objects', 'fixed_tris', 'lod_tris', 'budget_tris', 'jitter_switches', 'select_s',
+                 'budget_select_s'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Замер экспорта сетки бочки: бинарный STL построчной упаковкой struct.pack против
+структурированных массивов и tofile, бинарный PLY и текстовый OBJ, а также пиковая
+память при записи порциями и одним куском (по tracemalloc).
+
+Запуск: python benchmarks/bench_mesh_io.py [--segments 100 500 2000] [--max-naive 200000] [--dir DIR]
+"""
+import argparse
+import os
+import struct
+import tempfile
+import tracemalloc
+
+from _bench import best_time, print_table
+from cglib.mesh_io import write_obj, write_ply, write_stl
+from cglib.meshgen import generate_barrel_mesh
+from cglib.shading import face_normals
+
+
+# Построчная запись, как ее пишут без numpy: одна упаковка struct на треугольник
+def write_stl_naive(path, vertices, faces, normals):
+    with open(path, 'wb') as file:
+        file.write(b'\0' * 80)
+        file.write(struct.pack('<I', len(faces)))
+        for face, normal in zip(faces, normals):
+            a, b, c = vertices[face[0]], vertices[face[1]], vertices[face[2]]
+            file.write(struct.pack('<12fH', *normal, *a, *b, *c, 0))
+
+
+def peak_memory(func):
+    """
+    Пиковый объем памяти, выделенной во время func, в мегабайтах.
+    """
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def run(segments, directory, max_naive=200000, repeat=3):
+    """
+    :return: Список словарей с результатами для каждого разрешения бочки.
+    """
+    rows = []
+    for n in segments:
+        vertices, faces = generate_barrel_mesh(15, 2, 5, n, n)
+        normals = face_normals(vertices, faces)
+        path = os.path.join(directory, 'barrel')
+        row = {'triangles': len(faces)}
+        if len(faces) <= max_naive:
+            row['naive_stl_s'] = best_time(lambda: write_stl_naive(path + '.stl', vertices, faces, normals), 1)
+        row['stl_s'] = best_time(lambda: write_stl(path + '.stl', vertices, faces, normals), repeat)
+        row['stl_mb_s'] = os.path.getsize(path + '.stl') / 2 ** 20 / row['stl_s']
+        row['ply_s'] = best_time(lambda: write_ply(path + '.ply', vertices, faces, face_normals=normals), repeat)
+        row['obj_s'] = best_time(lambda: write_obj(path + '.obj', vertices, faces, face_normals=normals), 1)
+        row['chunk_peak_mb'] = peak_memory(lambda: write_stl(path + '.stl', vertices, faces, normals))
+        row['whole_peak_mb'] = peak_memory(lambda: write_stl(path + '.stl', vertices, faces, normals,
+                                                              chunk=len(faces)))
+        if 'naive_stl_s' in row:
+            row['speedup'] = row['naive_stl_s'] / row['stl_s']
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--segments', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--max-naive', type=int, default=200000, help='Не замерять построчную запись выше этого')
+    parser.add_argument('--dir', help='Каталог для файлов (по умолчанию временный)')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        rows = run(args.segments, args.dir or directory, args.max_naive)
+    print_table(rows, ['triangles', 'naive_stl_s', 'stl_s', 'stl_mb_s', 'ply_s', 'obj_s', 'chunk_peak_mb',
+                       'whole_peak_mb', 'speedup'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Замер контейнера сеток для np.memmap: построение плотной бочки против открытия
+сохраненного файла, а также память рабочих процессов, читающих один файл.
+Отображенные страницы учитываются как файловые (RssFile) и делятся через кэш ОС,
+копия в памяти процесса — как анонимные (RssAnon); счетчики читаются из /proc (Linux).
+
+Запуск: python benchmarks/bench_mesh_store.py [--segments 200 1000 2000] [--workers 4]
+"""
+import argparse
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from _bench import best_time, print_table
+from cglib.mesh_io import load_mesh, save_mesh
+from cglib.meshgen import generate_barrel_mesh
+from cglib.shading import face_normals
+
+
+def build(n):
+    vertices, faces = generate_barrel_mesh(15, 2, 5, n, n)
+    return vertices, faces, face_normals(vertices, faces)
+
+
+def rss_mb():
+    """
+    Анонимная и файловая части резидентной памяти процесса в мегабайтах или (None, None).
+    """
+    try:
+        with open('/proc/self/status') as status:
+            fields = dict(line.split(':', 1) for line in status)
+    except OSError:
+        return None, None
+    return tuple(int(fields[name].split()[0]) / 1024 for name in ('RssAnon', 'RssFile'))
+
+
+def touch(path, copy):
+    """
+    Рабочий процесс: открывает сетку, читает все треугольники и возвращает прирост памяти.
+    """
+    anon, file = rss_mb()
+    vertices, faces, normals = load_mesh(path)
+    if copy:
+        vertices, faces, normals = np.array(vertices), np.array(faces), np.array(normals)
+    checksum = float(vertices.sum() + faces.sum(dtype=np.uint64) + normals.sum())
+    after_anon, after_file = rss_mb()
+    if anon is None:
+        return checksum, None, None
+    return checksum, after_anon - anon, after_file - file
+
+
+def run(segments, workers, directory, repeat=3):
+    """
+    :return: Список словарей с результатами для каждого разрешения бочки.
+    """
+    rows = []
+    with ProcessPoolExecutor(workers) as pool:
+        for n in segments:
+            path = os.path.join(directory, f'barrel_{n}.cgmesh')
+            mesh = build(n)
+            row = {'triangles': len(mesh[1]), 'file_mb': 0.0,
+                   'build_s': best_time(lambda: build(n), 1),
+                   'save_s': best_time(lambda: save_mesh(path, *mesh), 1),
+                   'open_s': best_time(lambda: load_mesh(path), repeat)}
+            row['file_mb'] = os.path.getsize(path) / 2 ** 20
+            for name, copy in (('mmap', False), ('copy', True)):
+                results = list(pool.map(touch, [path] * workers, [copy] * workers))
+                if results[0][1] is not None:
+                    row[name + '_anon_mb'] = float(np.mean([result[1] for result in results]))
+                    row[name + '_file_mb'] = float(np.mean([result[2] for result in results]))
+            rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--segments', type=int, nargs='+', default=[200, 1000, 2000])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--dir', help='Каталог для контейнеров (по умолчанию временный)')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        rows = run(args.segments, args.workers, args.dir or directory)
+    print_table(rows, ['triangles', 'file_mb', 'build_s', 'save_s', 'open_s', 'mmap_anon_mb', 'mmap_file_mb',
+                       'copy_anon_mb', 'copy_file_mb'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Замер времени генерации сетки бочки: исходные циклы Labs3 против cglib.meshgen.
+
+Запуск: python benchmarks/bench_meshgen.py [--sizes 40 400 4000] [--legacy-max 400]
+"""
+import argparse
+
+import numpy as np
+
+from _bench import best_time, print_table
+from cglib.meshgen import generate_barrel_mesh
+
+H, R_BOTTOM, R_MAX = 15, 2, 5
+
+
+# Исходная реализация из Labs3/labs3.py — эталон для сравнения
+def legacy_get_circle(r, segments, height):
+    return [[r * np.cos(2 * np.pi * i / segments), r * np.sin(2 * np.pi * i / segments), height] for i in range(segments + 1)]
+
+
+def legacy_barrel_vertices(h, r_bottom, r_max, n_segments):
+    vertices = []
+    for i in range(n_segments + 1):
+        z = h * i / n_segments
+        r = r_bottom + (r_max - r_bottom) * np.sin(np.pi * z / h)
+        vertices += legacy_get_circle(r, n_segments, z)
+    return np.array(vertices)
+
+
+def legacy_barrel_faces(n_segments):
+    faces = []
+    for i in range(n_segments):
+        for j in range(n_segments):
+            current = i * (n_segments + 1) + j
+            next = current + (n_segments + 1)
+            faces += [
+                [current, current + 1, next],
+                [current + 1, next + 1, next]
+            ]
+    return faces
+
+
+def run(sizes, legacy_max=400, repeat=3):
+    """
+    Выполняет замеры для каждого количества сегментов.
+    :return: Список словарей с результатами.
+    """
+    rows = []
+    for n in sizes:
+        row = {'segments': n, 'triangles': 2 * n * n}
+        row['vectorized_s'] = best_time(lambda: generate_barrel_mesh(H, R_BOTTOM, R_MAX, n), repeat)
+        if n <= legacy_max:
+            row['legacy_s'] = best_time(
+                lambda: (legacy_barrel_vertices(H, R_BOTTOM, R_MAX, n), legacy_barrel_faces(n)), 1)
+            row['speedup'] = row['legacy_s'] / row['vectorized_s']
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[40, 400, 4000])
+    parser.add_argument('--legacy-max', type=int, default=400,
+                        help='Наибольшее число сегментов, для которого запускается исходная реализация')
+    args = parser.parse_args()
+    rows = run(args.sizes, args.legacy_max)
+    print_table(rows, ['segments', 'triangles', 'vectorized_s', 'legacy_s', 'speedup'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Замер нормалей и слияния вершин для бочки Labs3 (кольца с дублированной точкой шва):
+исходный цикл calculate_normals из Labs4,5/Labs6 против векторизованных нормалей граней,
+нормали вершин одним np.bincount против np.add.at и размер буфера вершин до и после слияния.
+
+Запуск: python benchmarks/bench_normals.py [--sizes 40 400 2000] [--legacy-max 100000]
+"""
+import argparse
+
+import numpy as np
+
+from _bench import best_time, print_table
+from cglib.gl_renderer import interleave_flat, interleave_smooth
+from cglib.indexed_mesh import IndexedMesh, vertex_normals, weld_vertices
+from cglib.meshgen import generate_barrel_mesh
+from cglib.shading import face_normals
+
+
+# Исходная реализация из Labs4,5/lab45.py — эталон для сравнения
+def legacy_calculate_normals(vertices, faces):
+    norms = []
+    for face in faces:
+        v1 = np.array(vertices[face[0]]) - np.array(vertices[face[1]])
+        v2 = np.array(vertices[face[0]]) - np.array(vertices[face[2]])
+        norm = np.cross(v1, v2)
+        if np.linalg.norm(norm) != 0:
+            norm = norm / np.linalg.norm(norm)
+        norms.append(norm)
+    return np.array(norms)
+
+
+# Та же нормаль вершин через np.add.at — проще, но заметно медленнее bincount
+def vertex_normals_add_at(vertices, faces):
+    tris = vertices[faces]
+    weighted = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    normals = np.zeros_like(vertices)
+    for corner in range(3):
+        np.add.at(normals, faces[:, corner], weighted)
+    return normals / np.linalg.norm(normals, axis=1, keepdims=True)
+
+
+def run(sizes, legacy_max=100000, repeat=3):
+    """
+    :return: Список словарей с результатами для каждого разрешения бочки.
+    """
+    rows = []
+    for n in sizes:
+        vertices, faces = generate_barrel_mesh(15, 2, 5, n, n)
+        welded, welded_faces, _ = weld_vertices(vertices, faces)
+        row = {'triangles': len(faces), 'vertices': len(vertices), 'welded': len(welded)}
+        if len(faces) <= legacy_max:
+            row['legacy_s'] = best_time(lambda: legacy_calculate_normals(vertices, faces), 1)
+        row['face_s'] = best_time(lambda: face_normals(vertices, faces), repeat)
+        row['weld_s'] = best_time(lambda: weld_vertices(vertices, faces), repeat)
+        row['bincount_s'] = best_time(lambda: vertex_normals(welded, welded_faces), repeat)
+        row['add_at_s'] = best_time(lambda: vertex_normals_add_at(welded, welded_faces), repeat)
+        mesh = IndexedMesh(welded, welded_faces)
+        flat_bytes = interleave_flat(vertices, faces, face_normals(vertices, faces))[0].nbytes
+        row['buffer_ratio'] = flat_bytes / interleave_smooth(*mesh.arrays())[0].nbytes
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[40, 400, 2000])
+    parser.add_argument('--legacy-max', type=int, default=100000, help='Не замерять исходный цикл выше этого')
+    args = parser.parse_args()
+    print_table(run(args.sizes, args.legacy_max),
+                ['triangles', 'vertices', 'welded', 'legacy_s', 'face_s', 'weld_s', 'bincount_s', 'add_at_s',
+                 'buffer_ratio'])
+
+
+if __name__ == '__main__':
+    main()
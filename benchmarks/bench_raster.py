@@ -0,0 +1,45 @@
+"""
+Замер программного растеризатора cglib.raster на бочке разного разрешения.
+
+Запуск: python benchmarks/bench_raster.py [--segments 20 100 224] [--size 800] [--save out.png]
+"""
+import argparse
+
+from _bench import best_time, print_table
+from cglib.frame_writer import encode_png
+from cglib.meshgen import generate_barrel_mesh
+from cglib.raster import render_mesh
+from cglib.shading import ShadingEngine
+
+
+def run(segments, size=800, save=None):
+    """
+    Выполняет замеры для каждого количества сегментов.
+    :return: Список словарей с результатами.
+    """
+    rows = []
+    shading = ShadingEngine()
+    for n in segments:
+        vertices, faces = generate_barrel_mesh(15, 2, 5, n)
+        shading.set_geometry(vertices, faces)
+        colors = shading.shade(45, 30)
+        seconds = best_time(lambda: render_mesh(vertices, faces, colors, size, size))
+        rows.append({'segments': n, 'triangles': len(faces), 'frame_s': seconds, 'fps': 1 / seconds})
+    if save:
+        with open(save, 'wb') as file:
+            file.write(encode_png(render_mesh(vertices, faces, colors, size, size)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--segments', type=int, nargs='+', default=[20, 100, 224])
+    parser.add_argument('--size', type=int, default=800)
+    parser.add_argument('--save', help='Сохранить последний кадр в PNG')
+    args = parser.parse_args()
+    rows = run(args.segments, args.size, args.save)
+    print_table(rows, ['segments', 'triangles', 'frame_s', 'fps'])
+
+
+if __name__ == '__main__':
+    main()
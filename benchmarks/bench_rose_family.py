@@ -0,0 +1,87 @@
+"""
+Замер семейства роз ρ = a·sin(kφ) для перебора параметров (бэкенд Agg, без окна):
+вычисление по одной кривой в цикле против одного broadcast cglib.curves.rose_family
+и отрисовка N вызовами plot против одной LineCollection (CurveFamilyArtist).
+
+Запуск: python benchmarks/bench_rose_family.py [--curves 10 100 1000] [--save family.png]
+"""
+import argparse
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from _bench import best_time, print_table
+from cglib.curves import rose_family
+from cglib.mpl_incremental import CurveFamilyArtist
+
+
+def parameters(n):
+    """
+    Сетка параметров: амплитуды от 1 до 10 и количество лепестков от 2 до 8.
+    """
+    return np.linspace(1, 10, n), 2 + np.arange(n) % 7
+
+
+def evaluate_loop(amplitudes, petals, phi):
+    curves = []
+    for a, k in zip(amplitudes, petals):
+        rho = a * np.sin(k * phi)
+        curves.append(np.column_stack([rho * np.cos(phi), rho * np.sin(phi)]))
+    return curves
+
+
+def render_plots(curves):
+    fig, ax = plt.subplots(figsize=(6, 6))
+    for curve in curves:
+        ax.plot(curve[:, 0], curve[:, 1], linewidth=0.5)
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def render_collection(curves, values, save=None):
+    fig, ax = plt.subplots(figsize=(6, 6))
+    artist = CurveFamilyArtist(ax, linewidths=0.5, cmap='viridis')
+    artist.set_curves(curves, values, autoscale=True)
+    ax.set_aspect('equal')
+    fig.canvas.draw()
+    if save:
+        fig.savefig(save)
+    plt.close(fig)
+
+
+def run(counts, samples=1000, save=None, repeat=3):
+    """
+    :return: Список словарей с результатами для каждого размера семейства.
+    """
+    phi = np.linspace(0, 2 * np.pi, samples)
+    rows = []
+    for n in counts:
+        amplitudes, petals = parameters(n)
+        out = np.empty((n, samples, 2))
+        row = {'curves': n, 'samples': samples}
+        row['eval_loop_s'] = best_time(lambda: evaluate_loop(amplitudes, petals, phi), repeat)
+        row['eval_batch_s'] = best_time(lambda: rose_family(amplitudes, petals, phi, out), repeat)
+        curves = rose_family(amplitudes, petals, phi, out)
+        row['plot_calls_s'] = best_time(lambda: render_plots(curves), 1)
+        row['collection_s'] = best_time(lambda: render_collection(curves, amplitudes), 1)
+        row['speedup'] = (row['eval_loop_s'] + row['plot_calls_s']) / (row['eval_batch_s'] + row['collection_s'])
+        rows.append(row)
+    if save:
+        render_collection(curves, amplitudes, save)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--curves', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--samples', type=int, default=1000)
+    parser.add_argument('--save', help='Сохранить изображение последнего семейства в PNG')
+    args = parser.parse_args()
+    rows = run(args.curves, args.samples, args.save)
+    print_table(rows, ['curves', 'samples', 'eval_loop_s', 'eval_batch_s', 'plot_calls_s', 'collection_s', 'speedup'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Время кадра при перетаскивании ползунков Labs3 (бэкенд Agg, без окна):
+полная перестройка (ax.clear() и новая Poly3DCollection) против
+инкрементального обновления cglib.mpl_incremental.MeshArtist.
+
+Запуск: python benchmarks/bench_slider_updates.py
+"""
+import argparse
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+from _bench import print_table
+from cglib.meshgen import generate_barrel_mesh
+from cglib.mpl_incremental import FrameTimes, MeshArtist
+from cglib.shading import ShadingEngine
+
+H, R = 15, 5
+
+
+def drag_frames(segment_steps, light_steps):
+    """
+    Последовательность состояний перетаскивания: сегменты 4 → 40, затем свет 0 → 360.
+    """
+    frames = [(n, 45) for n in segment_steps]
+    frames += [(segment_steps[-1], azimuth) for azimuth in light_steps]
+    return frames
+
+
+def run_full(frames, meshes):
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+    shading = ShadingEngine()
+    times = FrameTimes()
+    for n, azimuth in frames:
+        start = time.perf_counter()
+        vertices, faces = meshes[n]
+        ax.clear()
+        shading.set_geometry(vertices, faces)
+        collection = Poly3DCollection(vertices[faces], facecolors=shading.shade(azimuth, 30),
+                                      linewidths=0.5, edgecolors=(0, 0, 0, 0.3))
+        ax.add_collection3d(collection)
+        ax.auto_scale_xyz([-R, R], [-R, R], [0, H])
+        fig.canvas.draw()
+        times.record(time.perf_counter() - start)
+    plt.close(fig)
+    return times
+
+
+def run_incremental(frames, meshes):
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+    ax.auto_scale_xyz([-R, R], [-R, R], [0, H])
+    artist = MeshArtist(ax, linewidths=0.5, edgecolors=(0, 0, 0, 0.3))
+    shading = ShadingEngine()
+    times = FrameTimes()
+    for n, azimuth in frames:
+        start = time.perf_counter()
+        vertices, faces = meshes[n]
+        artist.set_mesh(vertices, faces)
+        shading.set_geometry(vertices, faces)
+        artist.set_colors(shading.shade(azimuth, 30))
+        fig.canvas.draw()
+        times.record(time.perf_counter() - start)
+    plt.close(fig)
+    return times
+
+
+def run(min_segments=4, max_segments=40):
+    """
+    :return: Список словарей с перцентилями времени кадра для обоих способов.
+    """
+    segment_steps = list(range(min_segments, max_segments + 1))
+    meshes = {n: generate_barrel_mesh(H, 2, R, n) for n in segment_steps}
+    frames = drag_frames(segment_steps, list(range(0, 361, 10)))
+    rows = []
+    for name, func in (('full_rebuild', run_full), ('incremental', run_incremental)):
+        rows.append({'mode': name, **func(frames, meshes).summary()})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--min-segments', type=int, default=4)
+    parser.add_argument('--max-segments', type=int, default=40)
+    args = parser.parse_args()
+    rows = run(args.min_segments, args.max_segments)
+    print_table(rows, ['mode', 'frames', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Замер перестройки сплайна Lab 7 при перетаскивании одной точки:
+полное построение InterpolatingSpline против InterpolatingSpline.move_point,
+который поправляет наклоны локальной прогонкой и пересчитывает только затронутые сегменты.
+
+Запуск: python benchmarks/bench_spline_refit.py [--points 100 1000 10000] [--moves 200]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from _bench import best_time, print_table
+from cglib.splines import InterpolatingSpline
+
+
+def run(counts, moves, seed=0):
+    """
+    :return: Список словарей с результатами для каждого количества точек.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for n in counts:
+        x, y = np.arange(n, dtype=np.float64), rng.normal(size=n)
+        spline = InterpolatingSpline(x, y, 1.0, -1.0)
+        row = {'points': n, 'full_s': best_time(lambda: InterpolatingSpline(spline.x, spline.y, 1.0, -1.0))}
+
+        index = rng.integers(1, n - 1, moves)
+        widths = []
+        start = time.perf_counter()
+        for i, value in zip(index, rng.normal(size=moves)):
+            affected = spline.move_point(i, y=value)
+            widths.append(affected.stop - affected.start)
+        row['move_y_s'] = (time.perf_counter() - start) / moves
+
+        start = time.perf_counter()
+        for i, shift in zip(index, rng.uniform(-0.4, 0.4, moves)):
+            affected = spline.move_point(i, x=i + shift)
+            widths.append(affected.stop - affected.start)
+        row['move_x_s'] = (time.perf_counter() - start) / moves
+
+        row['segments'] = float(np.mean(widths))
+        reference = InterpolatingSpline(spline.x, spline.y, 1.0, -1.0)
+        row['max_error'] = float(np.abs(reference.segments.coefficients - spline.segments.coefficients).max())
+        row['speedup'] = row['full_s'] / row['move_y_s']
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--points', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--moves', type=int, default=200)
+    args = parser.parse_args()
+    print_table(run(args.points, args.moves),
+                ['points', 'full_s', 'move_y_s', 'move_x_s', 'segments', 'max_error', 'speedup'])
+
+
+if __name__ == '__main__':
+    main()
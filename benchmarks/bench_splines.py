@@ -0,0 +1,68 @@
+"""
+Замер вычисления кубических сегментов Эрмита: цикл по сегментам против
+одного матричного произведения cglib.splines.HermiteSegments, а также время
+импорта cglib.splines по сравнению с scipy.interpolate (если SciPy установлен).
+
+Запуск: python benchmarks/bench_splines.py [--segments 10 1000 10000] [--samples 100]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from _bench import best_time, print_table
+from cglib.splines import HermiteSegments
+
+
+def evaluate_loop(p0, p1, m0, m1, t):
+    # Формулы базисных функций Эрмита для каждого сегмента по отдельности
+    h00, h10 = 2 * t ** 3 - 3 * t ** 2 + 1, t ** 3 - 2 * t ** 2 + t
+    h01, h11 = -2 * t ** 3 + 3 * t ** 2, t ** 3 - t ** 2
+    return [np.outer(h00, a) + np.outer(h10, c) + np.outer(h01, b) + np.outer(h11, d)
+            for a, b, c, d in zip(p0, p1, m0, m1)]
+
+
+def import_time(module):
+    """
+    Время импорта модуля в отдельном интерпретаторе (без учета запуска самого Python).
+    """
+    code = f'import time; s = time.perf_counter(); import {module}; print(time.perf_counter() - s)'
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=root)
+    return float(result.stdout) if result.returncode == 0 else None
+
+
+def run(segments, samples, dims=3, seed=0, repeat=3):
+    """
+    :return: Список словарей с результатами для каждого количества сегментов.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, 1, samples)
+    rows = []
+    for n in segments:
+        p0, p1, m0, m1 = rng.normal(size=(4, n, dims))
+        batch = HermiteSegments(p0, p1, m0, m1)
+        row = {'segments': n, 'samples': samples}
+        row['loop_s'] = best_time(lambda: evaluate_loop(p0, p1, m0, m1, t), repeat)
+        row['build_s'] = best_time(lambda: HermiteSegments(p0, p1, m0, m1), repeat)
+        row['batch_s'] = best_time(lambda: batch.evaluate(t), repeat)
+        row['speedup'] = row['loop_s'] / row['batch_s']
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--segments', type=int, nargs='+', default=[10, 1000, 10000])
+    parser.add_argument('--samples', type=int, default=100)
+    args = parser.parse_args()
+    print_table(run(args.segments, args.samples), ['segments', 'samples', 'loop_s', 'build_s', 'batch_s', 'speedup'])
+    print()
+    print_table([{'module': module, 'import_s': import_time(module)}
+                 for module in ('cglib.splines', 'scipy.interpolate')], ['module', 'import_s'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""
+Набор замеров горячих участков всех лабораторных с записью результатов в JSON:
+генерация сеток (Labs3, Labs4,5, Labs6), нормали, затенение, преобразования и проекции (Labs2),
+выборка кривой (Labs1) и вычисление сплайнов (Labs7), каждый замер на нескольких размерах задачи.
+Скрипты лабораторных импортируются по пути файла; лабораторные на pygame/PyOpenGL без этих
+пакетов пропускаются. С --compare времена сравниваются с прошлым файлом результатов,
+а при замедлении больше порога скрипт завершается с кодом 1.
+
+Запуск: python benchmarks/bench_suite.py [--out results.json] [--compare old.json] [--quick] [--only normals shading]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from _bench import print_table
+from cglib.indexed_mesh import vertex_normals, weld_vertices
+from cglib.instancing import instance_colors
+from cglib.meshgen import generate_barrel_mesh
+from cglib.raster import render_mesh
+from cglib.shading import ShadingEngine, face_normals
+from cglib.splines import HermiteSegments, InterpolatingSpline
+from cglib.transforms import TransformStack
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Приветствие pygame при импорте Labs4,5 и Labs6 не должно попадать в вывод замеров
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+# Формат файла результатов; меняется при несовместимых изменениях набора
+SUITE_VERSION = 1
+
+
+def load_lab(path):
+    """
+    Импортирует скрипт лабораторной по пути относительно корня репозитория.
+    :return: Модуль или None, если не хватает зависимостей (pygame, PyOpenGL).
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, path))
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except ImportError:
+        return None
+    return module
+
+
+def measure(func, repeat):
+    """
+    Один прогрев и repeat замеров.
+    :return: Список времен в секундах.
+    """
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def barrel(n):
+    return generate_barrel_mesh(15, 2, 5, n, n)
+
+
+def cases():
+    """
+    Замеры набора: имя -> (размеры задачи, функция размера, возвращающая замеряемую функцию без аргументов).
+    Входные данные строятся вне замеряемой функции; случайные данные — с фиксированным зерном.
+    """
+    labs1 = load_lab('Labs1/labs1.py')
+    labs2 = load_lab('Labs2/labs2.py')
+    labs3 = load_lab('Labs3/labs3.py')
+    lab45 = load_lab('Labs4,5/lab45.py')
+    lab6 = load_lab('Labs6/lab6.py')
+    points = lambda n: np.random.default_rng(0).standard_normal((n, 3))
+
+    def labs3_mesh(n):
+        return lambda: (labs3.generate_barrel_vertices(labs3.h, labs3.r_top, labs3.r_bottom, labs3.r_max, n),
+                        labs3.generate_barrel_faces(n))
+
+    def cylinder_mesh(lab):
+        return lambda n: lambda: (lab.generate_cylinder_vertices(2, 1, n), lab.generate_cylinder_faces(n))
+
+    def lab_normals(lab):
+        def case(n):
+            vertices, faces = lab.generate_cylinder_vertices(2, 1, n), lab.generate_cylinder_faces(n)
+            return lambda: lab.calculate_normals(vertices, faces)
+        return case
+
+    def face_normals_case(n):
+        vertices, faces = barrel(n)
+        return lambda: face_normals(vertices, faces)
+
+    def vertex_normals_case(n):
+        vertices, faces, _ = weld_vertices(*barrel(n))
+        return lambda: vertex_normals(vertices, faces)
+
+    def lambert(n):
+        vertices, faces = barrel(n)
+        shading = ShadingEngine()
+        shading.set_geometry(vertices, faces)
+        return lambda: shading.shade(45, 30)
+
+    def instance_colors_case(n):
+        phases = np.random.default_rng(0).uniform(0, 2 * np.pi, n)
+        return lambda: instance_colors(phases, 1.5)
+
+    def raster(n):
+        vertices, faces = barrel(n)
+        shading = ShadingEngine()
+        shading.set_geometry(vertices, faces)
+        colors = shading.shade(45, 30)
+        return lambda: render_mesh(vertices, faces, colors, 400, 400)
+
+    def rotate_scale(n):
+        vertices = points(n)
+        rotation = labs2.rotation_matrix(np.radians(30), np.radians(30), np.radians(30)).T
+        return lambda: TransformStack().then(rotation).scale(1.5).apply(vertices)
+
+    def isometric(n):
+        vertices = points(n)
+        return lambda: labs2.isometric_projection(vertices)
+
+    def rose(pixels_per_unit):
+        return lambda: labs1.rose_basis(pixels_per_unit)
+
+    def hermite(n):
+        rng = np.random.default_rng(0)
+        segments = HermiteSegments.from_points(rng.standard_normal((n + 1, 3)), rng.standard_normal((n + 1, 3)))
+        t = np.linspace(0, 1, 100)
+        return lambda: segments.evaluate(t)
+
+    def spline_fit(n):
+        x = np.arange(n, dtype=np.float64)
+        y = np.sin(x / 7)
+        return lambda: InterpolatingSpline(x, y)
+
+    def spline_eval(n):
+        spline = InterpolatingSpline(np.arange(100, dtype=np.float64), np.sin(np.arange(100) / 7))
+        x = np.random.default_rng(0).uniform(0, 99, n)
+        return lambda: spline(x)
+
+    mesh_sizes = [20, 200, 1000]
+    cylinder_sizes = [64, 4096, 262144]
+    point_sizes = [1000, 100000, 1000000]
+    return {
+        'meshgen/labs3_barrel': (mesh_sizes, labs3_mesh if labs3 else None),
+        'meshgen/lab45_cylinder': (cylinder_sizes, cylinder_mesh(lab45) if lab45 else None),
+        'meshgen/lab6_cylinder': (cylinder_sizes, cylinder_mesh(lab6) if lab6 else None),
+        'normals/face': (mesh_sizes, face_normals_case),
+        'normals/vertex': (mesh_sizes, vertex_normals_case),
+        'normals/lab45_calculate_normals': (cylinder_sizes, lab_normals(lab45) if lab45 else None),
+        'shading/lambert': (mesh_sizes, lambert),
+        'shading/lab6_instance_colors': ([100, 10000, 1000000], instance_colors_case),
+        'shading/raster': ([20, 100, 400], raster),
+        'transforms/labs2_rotate_scale': (point_sizes, rotate_scale if labs2 else None),
+        'transforms/labs2_isometric': (point_sizes, isometric if labs2 else None),
+        'curves/labs1_rose': ([100, 1000, 10000], rose if labs1 else None),
+        'splines/hermite_evaluate': ([10, 1000, 10000], hermite),
+        'splines/interpolating_fit': ([10, 1000, 100000], spline_fit),
+        'splines/interpolating_eval': ([100, 10000, 1000000], spline_eval),
+    }
+
+
+def environment():
+    """
+    Сведения о машине и версии кода, чтобы результаты разных запусков можно было сопоставить.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, cwd=ROOT).stdout.strip()
+    except OSError:
+        commit = ''
+    return {'suite_version': SUITE_VERSION, 'commit': commit or None,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'python': platform.python_version(),
+            'numpy': np.__version__, 'platform': platform.platform(), 'machine': platform.machine(),
+            'cpu_count': os.cpu_count()}
+
+
+def run(only=None, quick=False, repeat=5):
+    """
+    :param only: Префиксы имен замеров (например 'normals') или None — все.
+    :param quick: Только два меньших размера каждой задачи.
+    :return: Список словарей с результатами; пропущенные замеры имеют skipped=True.
+    """
+    rows = []
+    for name, (sizes, case) in cases().items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        if case is None:
+            rows.append({'case': name, 'skipped': True})
+            continue
+        for size in sizes[:2] if quick else sizes:
+            times = measure(case(size), repeat)
+            rows.append({'case': name, 'size': size, 'best_s': min(times), 'median_s': statistics.median(times),
+                         'repeat': repeat})
+    return rows
+
+
+def compare(rows, baseline, threshold):
+    """
+    Дописывает в строки отношение лучшего времени к базовому и отметку регрессии.
+    :return: Количество регрессий.
+    """
+    previous = {(row['case'], row.get('size')): row for row in baseline['results'] if not row.get('skipped')}
+    regressions = 0
+    for row in rows:
+        old = previous.get((row['case'], row.get('size')))
+        if row.get('skipped') or old is None:
+            continue
+        row['ratio'] = row['best_s'] / old['best_s']
+        row['regression'] = 'yes' if row['ratio'] > threshold else ''
+        regressions += bool(row['regression'])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--out', help='Файл JSON для результатов')
+    parser.add_argument('--compare', help='Прошлый файл результатов для сравнения')
+    parser.add_argument('--threshold', type=float, default=1.25, help='Отношение времен, считающееся регрессией')
+    parser.add_argument('--only', nargs='+', help='Префиксы имен замеров')
+    parser.add_argument('--quick', action='store_true', help='Только два меньших размера каждой задачи')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = run(args.only, args.quick, args.repeat)
+    regressions = 0
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(rows, json.load(file), args.threshold)
+    print_table([row for row in rows if not row.get('skipped')],
+                ['case', 'size', 'best_s', 'median_s'] + (['ratio', 'regression'] if args.compare else []))
+    skipped = [row['case'] for row in rows if row.get('skipped')]
+    if skipped:
+        print('Пропущены (нет зависимостей):', ', '.join(skipped))
+    if args.out:
+        with open(args.out, 'w') as file:
+            json.dump({'environment': environment(), 'results': rows}, file, indent=1)
+    if regressions:
+        print(f'Регрессий: {regressions} (порог x{args.threshold})')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
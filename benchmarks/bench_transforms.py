@@ -0,0 +1,57 @@
+"""
+Замер преобразования множества экземпляров многогранника:
+поочередное применение матриц в цикле против одного пакетного matmul.
+
+Запуск: python benchmarks/bench_transforms.py [--instances 10 1000 10000]
+"""
+import argparse
+
+import numpy as np
+
+from _bench import best_time, print_table
+from cglib.transforms import rotation, scaling, transform_points
+
+# Вершины додекаэдра, как в Labs2
+PHI = (1 + np.sqrt(5)) / 2
+VERTICES = np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+                    + [[0, s / PHI, t * PHI] for s in (-1, 1) for t in (-1, 1)]
+                    + [[s / PHI, t * PHI, 0] for s in (-1, 1) for t in (-1, 1)]
+                    + [[s * PHI, 0, t / PHI] for s in (-1, 1) for t in (-1, 1)], dtype=np.float64)
+
+
+def run(instances, seed=0):
+    """
+    Выполняет замеры для каждого количества экземпляров.
+    :return: Список словарей с результатами.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for n in instances:
+        angles = rng.uniform(0, 2 * np.pi, (n, 3))
+        scales = rng.uniform(0.5, 2, n)
+        matrices = np.stack([scaling(s) @ rotation(*a) for s, a in zip(scales, angles)])
+        batch = np.broadcast_to(VERTICES, (n,) + VERTICES.shape)
+        out = np.empty(batch.shape)
+
+        def loop():
+            # Те же готовые матрицы, но по одному объекту за вызов
+            for matrix in matrices:
+                VERTICES @ matrix[:3, :3].T + matrix[:3, 3]
+
+        row = {'instances': n}
+        row['loop_s'] = best_time(loop)
+        row['batched_s'] = best_time(lambda: transform_points(matrices, batch, out=out))
+        row['speedup'] = row['loop_s'] / row['batched_s']
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--instances', type=int, nargs='+', default=[10, 1000, 10000])
+    args = parser.parse_args()
+    print_table(run(args.instances), ['instances', 'loop_s', 'batched_s', 'speedup'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Микро-замер построения колец: тригонометрия для каждой точки каждого кольца
+(как get_circle в Labs3) против таблицы единичной окружности cglib.meshgen.unit_circle.
+
+Запуск: python benchmarks/bench_unit_circle.py [--segments 20 40 400]
+"""
+import argparse
+
+import numpy as np
+
+from _bench import best_time, print_table
+from cglib.meshgen import unit_circle
+
+
+# Исходная функция из Labs3: sin и cos заново для каждой точки
+def legacy_get_circle(r, segments, height):
+    return [[r * np.cos(2 * np.pi * i / segments), r * np.sin(2 * np.pi * i / segments), height] for i in range(segments + 1)]
+
+
+def run(segments, repeat=5):
+    """
+    Строит n_segments + 1 колец обоими способами.
+    :return: Список словарей с результатами.
+    """
+    rows = []
+    for n in segments:
+        radii = 2 + 3 * np.sin(np.pi * np.arange(n + 1) / n)
+
+        def per_point():
+            return [legacy_get_circle(r, n, z) for z, r in enumerate(radii)]
+
+        def vectorized_trig():
+            angles = 2 * np.pi * np.arange(n + 1) / n
+            return radii[:, None] * np.cos(angles), radii[:, None] * np.sin(angles)
+
+        def table():
+            ring_x, ring_y = unit_circle(n)
+            return radii[:, None] * ring_x, radii[:, None] * ring_y
+
+        row = {'segments': n, 'trig_calls': 2 * (n + 1) ** 2}
+        row['per_point_s'] = best_time(per_point, 1 if n > 100 else repeat)
+        row['vector_trig_s'] = best_time(vectorized_trig, repeat)
+        row['table_s'] = best_time(table, repeat)
+        row['speedup'] = row['per_point_s'] / row['table_s']
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--segments', type=int, nargs='+', default=[20, 40, 400])
+    args = parser.parse_args()
+    print_table(run(args.segments), ['segments', 'trig_calls', 'per_point_s', 'vector_trig_s', 'table_s', 'speedup'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+"""
+Общие модули для лабораторных работ по компьютерной графике.
+
+Скрипты лабораторных подключают пакет, добавляя корень репозитория в sys.path.
+"""
@@ -0,0 +1,44 @@
+import numpy as np
+
+
+def polygon_normals(vertices, faces):
+    """
+    Нормали плоских многоугольников по формуле Ньюэлла, одним пакетным вычислением.
+    Для треугольников совпадает с векторным произведением ребер.
+    :param vertices: Массив вершин формы (N, 3).
+    :param faces: Массив граней формы (F, k).
+    :return: Ненормированные нормали формы (F, 3), направление задает обход вершин.
+    """
+    polygons = vertices[np.asarray(faces)]
+    return np.cross(polygons, np.roll(polygons, -1, axis=1)).sum(axis=1)
+
+
+def orient_outward(vertices, faces):
+    """
+    Согласует обход граней выпуклого многогранника так, чтобы все нормали смотрели наружу.
+    :param vertices: Массив вершин формы (N, 3).
+    :param faces: Массив граней формы (F, k).
+    :return: Новый массив граней с развернутыми при необходимости гранями.
+    """
+    faces = np.array(faces)
+    centers = vertices[faces].mean(axis=1)
+    inward = np.einsum('ij,ij->i', polygon_normals(vertices, faces), centers - vertices.mean(axis=0)) < 0
+    faces[inward] = faces[inward, ::-1]
+    return faces
+
+
+def cull_back_faces(vertices, faces, view_dir):
+    """
+    Отбрасывает нелицевые грани и сортирует оставшиеся от дальних к ближним.
+    Вид ортографический: грань видна, если ее нормаль направлена к зрителю.
+    :param vertices: Массив вершин формы (N, 3).
+    :param faces: Массив граней формы (F, k) с согласованным обходом (нормали наружу).
+    :param view_dir: Вектор направления на зрителя.
+    :return: Кортеж (индексы видимых граней в порядке отрисовки, количество отброшенных граней).
+    """
+    faces = np.asarray(faces)
+    facing = polygon_normals(vertices, faces) @ view_dir
+    visible = np.flatnonzero(facing > 0)
+    # Глубина — проекция центра грани на направление к зрителю: меньше — дальше
+    depth = vertices[faces[visible]].mean(axis=1) @ view_dir
+    return visible[np.argsort(depth)], len(faces) - len(visible)
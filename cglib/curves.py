@@ -0,0 +1,200 @@
+import numpy as np
+
+
+def polar_curve(rho):
+    """
+    Превращает полярную кривую ρ(φ) в параметрическую (x(φ), y(φ)).
+    :param rho: Векторизованная функция ρ(φ).
+    :return: Функция, возвращающая пару массивов (x, y).
+    """
+    def curve(phi):
+        r = rho(phi)
+        return r * np.cos(phi), r * np.sin(phi)
+    return curve
+
+
+def rose_family(amplitudes, petals, phi, out=None):
+    """
+    Семейство роз ρ = a·sin(kφ) для многих пар (a, k) одним broadcast (n_params, n_samples)
+    с переводом в декартовы координаты в том же проходе.
+    :param amplitudes: Амплитуды a формы (P,) или число.
+    :param petals: Коэффициенты k формы (P,) или число (согласуются с amplitudes по broadcast).
+    :param phi: Углы формы (S,), общие для всех кривых.
+    :param out: Необязательный буфер формы (P, S, 2) для повторного использования.
+    :return: Точки формы (P, S, 2); подходит как сегменты LineCollection.
+    """
+    amplitudes, petals = np.broadcast_arrays(np.atleast_1d(amplitudes), np.atleast_1d(petals))
+    phi = np.asarray(phi, dtype=np.float64)
+    if out is None:
+        out = np.empty((amplitudes.size, phi.size, 2))
+    # ρ считается прямо в слое x, затем из него же получаются обе координаты
+    rho = out[..., 0]
+    np.multiply(petals.reshape(-1, 1), phi, out=rho)
+    np.sin(rho, out=rho)
+    rho *= amplitudes.reshape(-1, 1)
+    np.multiply(rho, np.sin(phi), out=out[..., 1])
+    rho *= np.cos(phi)
+    return out
+
+
+def _evaluate(curve, t, scale):
+    """
+    Точки кривой формы (2, n) в масштабированных (экранных) координатах.
+    """
+    x, y = np.broadcast_arrays(*curve(t), t)[:2]
+    points = np.array([x, y], dtype=np.float64)
+    points *= np.reshape(scale, (-1, 1))
+    return points
+
+
+def _chord_error(start, end, middle):
+    """
+    Расстояние от точек middle до отрезков [start, end]; все массивы формы (2, n).
+    """
+    chord = end - start
+    length2 = np.einsum('ij,ij->j', chord, chord)
+    offset = middle - start
+    u = np.einsum('ij,ij->j', offset, chord) / np.where(length2 > 0, length2, 1)
+    np.clip(u, 0, 1, out=u)
+    return np.hypot(*(offset - u * chord))
+
+
+def _refine(curve, t, points, active, tolerance, scale, max_depth):
+    """
+    Делит пополам интервалы с индексами active, пока отклонение середины дуги от хорды
+    больше tolerance. Все интервалы одного уровня проверяются одним вызовом curve.
+    """
+    for _ in range(max_depth):
+        if not len(active):
+            break
+        middle_t = (t[active] + t[active + 1]) / 2
+        middle = _evaluate(curve, middle_t, scale)
+        split = _chord_error(points[:, active], points[:, active + 1], middle) > tolerance
+        if not split.any():
+            break
+
+        # Середины вставляются после левых концов; active упорядочен,
+        # поэтому каждая вставка сдвигает индексы всех следующих интервалов на один
+        left = active[split]
+        t = np.insert(t, left + 1, middle_t[split])
+        points = np.insert(points, left + 1, middle[:, split], axis=1)
+        left += np.arange(len(left))
+        active = np.sort(np.concatenate([left, left + 1]))
+    return t, points
+
+
+def _equidistribute(curve, t, points, tolerance, scale):
+    """
+    Переставляет точки так, чтобы погрешность всех интервалов была примерно одинаковой.
+    Отклонение от хорды растет как квадрат длины интервала, поэтому интервалу с
+    погрешностью e нужно sqrt(e / tolerance) отрезков; точки ставятся на равных уровнях
+    накопленной суммы этих долей.
+    """
+    middle = _evaluate(curve, (t[:-1] + t[1:]) / 2, scale)
+    error = _chord_error(points[:, :-1], points[:, 1:], middle)
+    # Небольшой пол для прямых участков, чтобы накопленная сумма строго возрастала
+    need = np.sqrt(np.maximum(error, 1e-6 * tolerance) / tolerance)
+    cumulative = np.concatenate([[0], np.cumsum(need)])
+    count = max(int(np.ceil(cumulative[-1])), 1)
+    new_t = np.interp(np.linspace(0, cumulative[-1], count + 1), cumulative, t)
+    new_t[[0, -1]] = t[[0, -1]]
+    return new_t, _evaluate(curve, new_t, scale)
+
+
+def adaptive_sample(curve, t0, t1, tolerance=0.5, scale=1.0, initial=32, max_depth=20):
+    """
+    Адаптивная дискретизация кривой по допустимому отклонению дуги от хорды.
+    Сначала интервалы делятся пополам, пока середина дуги отстоит от хорды дальше чем на
+    tolerance; затем по найденным погрешностям точки перераспределяются равномерно по
+    ошибке, оставшиеся превышения снова делятся, а лишние точки выбрасываются.
+    Начальная равномерная сетка из initial интервалов нужна, чтобы не пропустить
+    мелкие детали, середина которых случайно легла на хорду.
+    :param curve: Векторизованная функция t -> (x(t), y(t)), например polar_curve(rho).
+    :param t0: Начало интервала параметра.
+    :param t1: Конец интервала параметра.
+    :param tolerance: Допустимое отклонение от хорды; при scale в пикселях на единицу — в пикселях.
+    :param scale: Масштаб осей (число или пара sx, sy), переводящий данные в экранные координаты.
+    :param initial: Количество интервалов начальной сетки.
+    :param max_depth: Максимальное количество делений.
+    :return: Кортеж (t, x, y) — значения параметра и точки кривой в координатах данных.
+    """
+    t = np.linspace(t0, t1, initial + 1)
+    points = _evaluate(curve, t, scale)
+    t, points = _refine(curve, t, points, np.arange(initial), tolerance, scale, max_depth)
+
+    # Равные доли немного недооценивают ошибку, поэтому перераспределение идет с запасом
+    new_t, new_points = _equidistribute(curve, t, points, 0.8 * tolerance, scale)
+    new_t, new_points = _refine(curve, new_t, new_points, np.arange(len(new_t) - 1), tolerance, scale, max_depth)
+    if len(new_t) < len(t):
+        t, points = new_t, new_points
+
+    t, points = _prune(curve, t, points, tolerance, scale)
+    points /= np.reshape(scale, (-1, 1))
+    return t, points[0], points[1]
+
+
+def _prune(curve, t, points, tolerance, scale, max_passes=8):
+    """
+    Убирает лишние точки после деления пополам: точка i выбрасывается, если дуга
+    [t[i - 1], t[i + 1]] остается в пределах tolerance от хорды между соседями.
+    Дуга проверяется в самой точке, в серединах двух половин и в середине всего интервала.
+    За один проход рассматриваются только точки одной четности, чтобы не убрать соседние.
+    """
+    for n in range(max_passes):
+        candidates = np.arange(1 + n % 2, len(t) - 1, 2)
+        if not len(candidates):
+            break
+        left, right = t[candidates - 1], t[candidates + 1]
+        probe_t = np.concatenate([(left + t[candidates]) / 2, (t[candidates] + right) / 2, (left + right) / 2])
+        probes = np.concatenate([points[:, candidates], _evaluate(curve, probe_t, scale)], axis=1)
+        count = len(candidates)
+        error = _chord_error(np.tile(points[:, candidates - 1], 4), np.tile(points[:, candidates + 1], 4), probes)
+        removable = candidates[error.reshape(4, count).max(axis=0) <= tolerance]
+        if not len(removable) and n % 2:
+            break
+        t = np.delete(t, removable)
+        points = np.delete(points, removable, axis=1)
+    return t, points
+
+
+def max_chord_error(curve, t, scale=1.0):
+    """
+    Наибольшее отклонение кривой от ломаной по точкам t, измеренное в серединах интервалов.
+    """
+    points = _evaluate(curve, t, scale)
+    middle = _evaluate(curve, (t[:-1] + t[1:]) / 2, scale)
+    return float(_chord_error(points[:, :-1], points[:, 1:], middle).max())
+
+
+def uniform_points_needed(curve, t0, t1, tolerance=0.5, scale=1.0, start=32, limit=1 << 20):
+    """
+    Наименьшее число равномерно расставленных точек с той же погрешностью хорды.
+    Граница ищется удвоением от start интервалов (на более грубой сетке погрешность
+    в серединах может оказаться случайно нулевой), затем уточняется двоичным поиском.
+    :return: Количество точек (не больше limit + 1).
+    """
+    def fits(n):
+        return max_chord_error(curve, np.linspace(t0, t1, n + 1), scale) <= tolerance
+
+    high = start
+    while high < limit and not fits(high):
+        high *= 2
+    low = high // 2 if high > start else high
+    while high - low > 1:
+        middle = (low + high) // 2
+        if fits(middle):
+            high = middle
+        else:
+            low = middle
+    return high + 1
+
+
+def sampling_report(curve, t, tolerance=0.5, scale=1.0):
+    """
+    Сравнивает адаптивную выборку с равномерной той же точности.
+    :param t: Значения параметра, полученные adaptive_sample.
+    :return: Словарь с количеством точек, фактической погрешностью и выигрышем.
+    """
+    uniform = uniform_points_needed(curve, t[0], t[-1], tolerance, scale)
+    return {'adaptive_points': len(t), 'uniform_points': uniform, 'reduction': uniform / len(t),
+            'max_error': max_chord_error(curve, t, scale)}
@@ -0,0 +1,110 @@
+import os
+import queue
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def encode_png(image, level=6):
+    """
+    Кодирует RGB-изображение в PNG средствами стандартной библиотеки.
+    :param image: Массив uint8 формы (H, W, 3), первая строка — верхняя.
+    :param level: Уровень сжатия zlib (0–9).
+    :return: Байты PNG-файла.
+    """
+    height, width, _ = image.shape
+    # Каждая строка предваряется байтом фильтра 0 (без фильтрации)
+    rows = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 0] = 0
+    rows[:, 1:] = image.reshape(height, -1)
+
+    def chunk(tag, data):
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(rows.tobytes(), level)) + chunk(b'IEND', b''))
+
+
+class FrameWriter:
+    """
+    Запись кадров на диск фоновым пулом потоков.
+    Кадры читаются в заранее выделенные буферы; буфер возвращается в пул после
+    записи, поэтому цикл рендеринга ждет только если все буферы еще в работе.
+    """
+
+    def __init__(self, out_dir, width, height, fmt='png', workers=4, buffers=None, level=6):
+        """
+        :param out_dir: Каталог для кадров.
+        :param width: Ширина кадра.
+        :param height: Высота кадра.
+        :param fmt: 'png' или 'raw' (сырые RGB-байты, файлы .rgb).
+        :param workers: Количество потоков записи.
+        :param buffers: Количество буферов кадров (по умолчанию 2 * workers).
+        :param level: Уровень сжатия PNG.
+        """
+        if fmt not in ('png', 'raw'):
+            raise ValueError(f'Неизвестный формат кадров: {fmt}')
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.level = level
+        self.frames_submitted = 0
+        self._free = queue.Queue()
+        for _ in range(buffers or 2 * workers):
+            self._free.put(np.empty((height, width, 3), dtype=np.uint8))
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._futures = []
+
+    def acquire(self):
+        """
+        Возвращает свободный буфер кадра (H, W, 3), при необходимости ожидая его освобождения.
+        """
+        return self._free.get()
+
+    def submit(self, index, buffer):
+        """
+        Ставит заполненный буфер в очередь на запись.
+        :param index: Номер кадра, определяет имя файла.
+        :param buffer: Буфер, полученный из acquire(); строки идут снизу вверх, как в OpenGL.
+        """
+        # Завершенные записи убираем из списка, пробрасывая их ошибки
+        pending = []
+        for future in self._futures:
+            if future.done():
+                future.result()
+            else:
+                pending.append(future)
+        self._futures = pending
+        self._futures.append(self._pool.submit(self._write, index, buffer))
+        self.frames_submitted += 1
+
+    def _write(self, index, buffer):
+        try:
+            # OpenGL отдает строки снизу вверх, в файл пишем сверху вниз
+            image = buffer[::-1]
+            ext = 'png' if self.fmt == 'png' else 'rgb'
+            path = os.path.join(self.out_dir, f'frame_{index:06d}.{ext}')
+            with open(path, 'wb') as file:
+                if self.fmt == 'png':
+                    file.write(encode_png(image, self.level))
+                else:
+                    np.ascontiguousarray(image).tofile(file)
+        finally:
+            self._free.put(buffer)
+
+    def close(self):
+        """
+        Дожидается записи всех кадров и останавливает пул.
+        """
+        self._pool.shutdown(wait=True)
+        for future in self._futures:
+            future.result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,71 @@
+"""
+Внеэкранный OpenGL-контекст через EGL (без окна и дисплея).
+
+Модуль нужно импортировать до первого импорта OpenGL.GL: платформа PyOpenGL
+выбирается один раз при загрузке пакета.
+"""
+import ctypes
+import os
+
+os.environ.setdefault('PYOPENGL_PLATFORM', 'egl')
+os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+from OpenGL import EGL
+
+
+class HeadlessContext:
+    """
+    Контекст OpenGL (compatibility profile) на pbuffer-поверхности EGL.
+    Подходит для программного рендеринга Mesa (llvmpipe) на серверах без дисплея.
+    """
+
+    def __init__(self, width, height):
+        """
+        :param width: Ширина поверхности в пикселях.
+        :param height: Высота поверхности в пикселях.
+        """
+        self.width = width
+        self.height = height
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(self.display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError('Не удалось инициализировать EGL')
+
+        config_attribs = [
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8,
+            EGL.EGL_GREEN_SIZE, 8,
+            EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE,
+        ]
+        config = EGL.EGLConfig()
+        n_configs = EGL.EGLint()
+        EGL.eglChooseConfig(self.display, (EGL.EGLint * len(config_attribs))(*config_attribs),
+                            ctypes.pointer(config), 1, ctypes.pointer(n_configs))
+        if n_configs.value == 0:
+            raise RuntimeError('EGL не предоставляет подходящей конфигурации')
+
+        surface_attribs = [EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE]
+        self.surface = EGL.eglCreatePbufferSurface(
+            self.display, config, (EGL.EGLint * len(surface_attribs))(*surface_attribs))
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, None)
+        if not EGL.eglMakeCurrent(self.display, self.surface, self.surface, self.context):
+            raise RuntimeError('Не удалось сделать контекст EGL текущим')
+
+    def release(self):
+        """
+        Освобождает контекст и поверхность.
+        """
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+        EGL.eglDestroyContext(self.display, self.context)
+        EGL.eglDestroySurface(self.display, self.surface)
+        EGL.eglTerminate(self.display)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
@@ -0,0 +1,157 @@
+import ctypes
+
+import numpy as np
+from OpenGL import error
+from OpenGL.GL import *
+
+
+def interleave_flat(vertices, faces, normals):
+    """
+    Собирает чередующийся массив позиция/нормаль для плоского затенения.
+    Каждая вершина треугольника получает нормаль своей грани.
+    :param vertices: Массив вершин формы (N, 3).
+    :param faces: Массив треугольников формы (F, 3).
+    :param normals: Нормали граней формы (F, 3).
+    :return: Кортеж (данные float32 формы (3F, 6), индексы uint32 формы (3F,)).
+    """
+    faces = np.asarray(faces)
+    data = np.empty((len(faces), 3, 6), dtype=np.float32)
+    data[:, :, :3] = vertices[faces]
+    data[:, :, 3:] = np.asarray(normals)[:, None, :]
+    indices = np.arange(data.shape[0] * 3, dtype=np.uint32)
+    return data.reshape(-1, 6), indices
+
+
+def interleave_smooth(vertices, faces, normals):
+    """
+    Собирает чередующийся массив позиция/нормаль для гладкого затенения.
+    Каждая вершина попадает в буфер один раз, треугольники ссылаются на нее индексами.
+    :param vertices: Массив вершин формы (N, 3).
+    :param faces: Массив треугольников формы (F, 3).
+    :param normals: Нормали вершин формы (N, 3).
+    :return: Кортеж (данные float32 формы (N, 6), индексы uint32 формы (3F,)).
+    """
+    data = np.empty((len(vertices), 6), dtype=np.float32)
+    data[:, :3] = vertices
+    data[:, 3:] = normals
+    return data, np.asarray(faces, dtype=np.uint32).ravel()
+
+
+def draw_smooth_immediate(verts, faces, norms):
+    """
+    Немедленный режим для нормалей вершин: своя нормаль перед каждой вершиной.
+    """
+    glBegin(GL_TRIANGLES)
+    for face in faces:
+        for vertex in face:
+            glNormal3fv(norms[vertex])
+            glVertex3fv(verts[vertex])
+    glEnd()
+
+
+class MeshRenderer:
+    """
+    Отрисовка сетки из буферов вершин и индексов одним вызовом glDrawElements.
+    Данные загружаются в видеопамять только при смене сетки; если буферы
+    недоступны, используется функция немедленного режима fallback(verts, faces, norms).
+    Нормали бывают граней (плоское затенение) или вершин (smooth=True в set_mesh).
+    """
+
+    STRIDE = 6 * 4  # Три float32 позиции и три float32 нормали
+
+    def __init__(self, fallback=None, use_vbo=True):
+        """
+        :param fallback: Функция отрисовки в немедленном режиме.
+        :param use_vbo: Использовать ли буферы вершин, если они поддерживаются.
+        """
+        self.fallback = fallback
+        self.use_vbo = use_vbo
+        self.uploads = 0
+        self._vbo = None
+        self._ibo = None
+        self._count = 0
+        self._mesh = None
+        self._uploaded = None
+        self.smooth = False
+
+    def set_mesh(self, vertices, faces, normals, smooth=False):
+        """
+        Задает сетку; загрузка в буферы произойдет при первой отрисовке новой сетки.
+        :param smooth: normals — нормали вершин (N, 3), а не граней (F, 3).
+        """
+        if (self._mesh is not None and smooth == self.smooth
+                and all(a is b for a, b in zip(self._mesh, (vertices, faces, normals)))):
+            return
+        self._mesh = (vertices, faces, normals)
+        self.smooth = smooth
+
+    def _vbo_supported(self):
+        try:
+            return bool(glGenBuffers) and bool(glDrawElements)
+        except error.Error:
+            return False
+
+    def _upload(self):
+        data, indices = (interleave_smooth if self.smooth else interleave_flat)(*self._mesh)
+        if self._vbo is None:
+            self._vbo, self._ibo = glGenBuffers(2)
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._ibo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        self._count = indices.size
+        self._uploaded = self._mesh
+        self.uploads += 1
+
+    def draw(self):
+        """
+        Отрисовывает текущую сетку.
+        """
+        if self._mesh is None:
+            return
+        if self.use_vbo and not self._vbo_supported():
+            self.use_vbo = False
+        if not self.use_vbo:
+            if self.smooth:
+                draw_smooth_immediate(*self._mesh)
+                return
+            if self.fallback is None:
+                raise RuntimeError('Буферы вершин недоступны, а функция немедленного режима не задана')
+            self.fallback(*self._mesh)
+            return
+
+        count = self.bind()
+        glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, ctypes.c_void_p(0))
+        self.unbind()
+
+    def bind(self):
+        """
+        Загружает сетку при необходимости и подключает ее буферы как массивы вершин и нормалей.
+        :return: Количество индексов для glDrawElements*.
+        """
+        if self._uploaded is not self._mesh:
+            self._upload()
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._ibo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glVertexPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(0))
+        glNormalPointer(GL_FLOAT, self.STRIDE, ctypes.c_void_p(12))
+        return self._count
+
+    def unbind(self):
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def release(self):
+        """
+        Удаляет буферы из видеопамяти.
+        """
+        if self._vbo is not None:
+            glDeleteBuffers(2, [self._vbo, self._ibo])
+            self._vbo = self._ibo = None
+            self._uploaded = None
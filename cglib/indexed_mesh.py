@@ -0,0 +1,85 @@
+import numpy as np
+
+
+def weld_vertices(vertices, faces, tolerance=1e-9):
+    """
+    Сливает совпадающие вершины (например, повтор первой точки кольца на шве).
+    Координаты округляются до сетки с шагом tolerance, дубликаты находятся одним
+    np.unique по строкам, а индексы граней переписываются через обратное отображение.
+    :param vertices: Массив вершин формы (N, 3).
+    :param faces: Массив треугольников формы (F, 3).
+    :param tolerance: Расстояние по каждой координате, ближе которого вершины считаются одной.
+    :return: Кортеж (вершины (M, 3), грани (F', 3) int32, отображение старых индексов в новые (N,)).
+        Грани, выродившиеся после слияния (два одинаковых индекса), удаляются.
+    """
+    vertices = np.asarray(vertices)
+    keys = np.round(vertices / tolerance).astype(np.int64)
+    _, first, remap = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    remap = remap.reshape(-1)
+    # Новые вершины упорядочены по первому вхождению, чтобы сетка сохраняла исходный порядок колец
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    remap = rank[remap].astype(np.int32)
+
+    welded = remap[np.asarray(faces)]
+    keep = (welded[:, 0] != welded[:, 1]) & (welded[:, 1] != welded[:, 2]) & (welded[:, 0] != welded[:, 2])
+    return vertices[first[order]], welded[keep], remap
+
+
+def vertex_normals(vertices, faces):
+    """
+    Нормали вершин, взвешенные по площади граней.
+    Векторное произведение ребер грани равно удвоенной площади, умноженной на нормаль,
+    поэтому сумма этих векторов по граням вершины — взвешенная по площади нормаль.
+    Суммирование по всем вершинам и осям — один np.bincount.
+    :param vertices: Массив вершин формы (N, 3).
+    :param faces: Массив треугольников формы (F, 3).
+    :return: Единичные нормали формы (N, 3); у вершин без граней — нулевые.
+    """
+    faces = np.asarray(faces)
+    tris = vertices[faces]
+    weighted = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    # Ячейка 3 * вершина + ось; каждая грань добавляет свой вектор трем своим вершинам
+    index = (3 * faces[:, :, None] + np.arange(3)).ravel()
+    weights = np.broadcast_to(weighted[:, None, :], (len(faces), 3, 3)).ravel()
+    normals = np.bincount(index, weights, minlength=3 * len(vertices)).reshape(-1, 3)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths != 0)
+    return normals
+
+
+class IndexedMesh:
+    """
+    Индексированная сетка со слитыми вершинами и гладкими нормалями вершин.
+    Буфер вершин содержит каждую точку один раз, а нормали интерполируются по граням,
+    поэтому сетка выглядит гладкой без увеличения тесселяции.
+    """
+
+    def __init__(self, vertices, faces, normals=None):
+        """
+        :param vertices: Массив вершин формы (N, 3) без дубликатов.
+        :param faces: Массив треугольников формы (F, 3).
+        :param normals: Нормали вершин формы (N, 3) или None — вычислить.
+        """
+        self.vertices = np.asarray(vertices)
+        self.faces = np.asarray(faces)
+        self.normals = vertex_normals(self.vertices, self.faces) if normals is None else normals
+
+    @classmethod
+    def from_arrays(cls, vertices, faces, tolerance=1e-9):
+        """
+        Строит сетку из массивов генератора, сливая дубликаты вершин.
+        """
+        welded, welded_faces, _ = weld_vertices(vertices, faces, tolerance)
+        return cls(welded, welded_faces)
+
+    def arrays(self):
+        """
+        :return: Кортеж (вершины, грани, нормали вершин) в том виде, в каком его хранит кэш сеток.
+        """
+        return self.vertices, self.faces, self.normals
+
+    @property
+    def nbytes(self):
+        return self.vertices.nbytes + self.faces.nbytes + self.normals.nbytes
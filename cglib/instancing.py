@@ -0,0 +1,200 @@
+import ctypes
+
+import numpy as np
+from OpenGL import error
+from OpenGL.GL import *
+
+from cglib.gl_renderer import MeshRenderer
+from cglib.shaders import COLOR_FRAGMENT_SHADER, ShaderProgram, try_create_program
+
+# Данные одного экземпляра: матрица модели в порядке OpenGL (по столбцам) и сдвиг фазы цвета
+INSTANCE_DTYPE = np.dtype([('model', np.float32, (4, 4)), ('phase', np.float32)])
+
+# Номера атрибутов экземпляра: mat4 занимает четыре подряд; начинаем с 4, чтобы не пересекаться
+# с атрибутами фиксированного конвейера (gl_Vertex, gl_Normal) на драйверах, где они совмещены
+MODEL_LOCATION = 4
+PHASE_LOCATION = 8
+
+INSTANCED_VERTEX_SHADER = """
+#version 120
+attribute mat4 model;
+attribute float phase;
+varying vec3 position;
+varying vec3 normal;
+varying float color_phase;
+
+void main() {
+    vec4 world = model * gl_Vertex;
+    position = vec3(gl_ModelViewMatrix * world);
+    normal = gl_NormalMatrix * (mat3(model[0].xyz, model[1].xyz, model[2].xyz) * gl_Normal);
+    color_phase = phase;
+    gl_Position = gl_ModelViewProjectionMatrix * world;
+}
+"""
+
+
+def make_instances(positions, phases, angles=None, scale=1.0):
+    """
+    Заполняет массив экземпляров: перенос, поворот вокруг оси y и равномерный масштаб.
+    :param positions: Положения экземпляров формы (N, 3).
+    :param phases: Сдвиги фазы цвета формы (N,).
+    :param angles: Углы поворота вокруг y в радианах (N,) или None.
+    :param scale: Масштаб (число или (N,)).
+    :return: Структурированный массив INSTANCE_DTYPE формы (N,).
+    """
+    positions = np.asarray(positions, dtype=np.float32)
+    count = len(positions)
+    angles = np.zeros(count) if angles is None else np.asarray(angles)
+    scale = np.broadcast_to(np.asarray(scale, dtype=np.float32), (count,))
+    cos, sin = np.cos(angles) * scale, np.sin(angles) * scale
+
+    instances = np.zeros(count, dtype=INSTANCE_DTYPE)
+    # model[i][j] — столбец i, строка j: так OpenGL читает mat4 из памяти
+    model = instances['model']
+    model[:, 0, 0], model[:, 0, 2] = cos, -sin
+    model[:, 1, 1] = scale
+    model[:, 2, 0], model[:, 2, 2] = sin, cos
+    model[:, 3, :3] = positions
+    model[:, 3, 3] = 1
+    instances['phase'] = phases
+    return instances
+
+
+def instance_colors(phases, time):
+    """
+    Цвета экземпляров в момент time (те же синусоиды, что во фрагментном шейдере).
+    :return: Массив формы (N, 3).
+    """
+    return (np.sin(time + np.asarray(phases)[:, None] + np.array([0, np.pi / 2, np.pi])) + 1) / 2
+
+
+class InstancedRenderer:
+    """
+    Отрисовка множества копий одной сетки одним вызовом glDrawElementsInstanced.
+    Сетка и массив экземпляров лежат в буферах видеопамяти; матрицы и фазы читаются
+    вершинным шейдером как атрибуты с делителем 1. Если инстансинг или шейдеры
+    недоступны, экземпляры рисуются по одному через glMultMatrixf и glMaterialfv.
+    """
+
+    def __init__(self, vertices, faces, normals, instances=None, smooth=False):
+        """
+        :param vertices: Вершины сетки (N, 3).
+        :param faces: Треугольники сетки (F, 3).
+        :param normals: Нормали граней (F, 3) или вершин (N, 3) при smooth=True.
+        :param instances: Массив INSTANCE_DTYPE или None.
+        :param smooth: Нормали заданы для вершин.
+        """
+        self.mesh = MeshRenderer()
+        self.program, self.reason = None, None
+        if self._instancing_supported():
+            self.program, self.reason = try_create_program(
+                INSTANCED_VERTEX_SHADER, COLOR_FRAGMENT_SHADER,
+                {'model': MODEL_LOCATION, 'phase': PHASE_LOCATION})
+        else:
+            self.reason = 'glDrawElementsInstanced недоступна'
+        self.draw_calls = 0
+        self.instances = np.zeros(0, dtype=INSTANCE_DTYPE)
+        self._buffer = None
+        self._capacity = 0
+        self.set_mesh(vertices, faces, normals, smooth)
+        if instances is not None:
+            self.set_instances(instances)
+
+    @staticmethod
+    def _instancing_supported():
+        try:
+            return bool(glDrawElementsInstanced) and bool(glVertexAttribDivisor)
+        except error.Error:
+            return False
+
+    @property
+    def instanced(self):
+        return self.program is not None
+
+    def set_mesh(self, vertices, faces, normals, smooth=False):
+        self.mesh.set_mesh(vertices, faces, normals, smooth)
+
+    def set_instances(self, instances):
+        """
+        Загружает массив экземпляров; буфер пересоздается только при росте количества.
+        """
+        self.instances = np.ascontiguousarray(instances, dtype=INSTANCE_DTYPE)
+        if not self.instanced:
+            return
+        if self._buffer is None:
+            self._buffer = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self._buffer)
+        if len(self.instances) > self._capacity:
+            glBufferData(GL_ARRAY_BUFFER, self.instances.nbytes, self.instances, GL_DYNAMIC_DRAW)
+            self._capacity = len(self.instances)
+        elif len(self.instances):
+            glBufferSubData(GL_ARRAY_BUFFER, 0, self.instances.nbytes, self.instances)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def _bind_instances(self):
+        stride = INSTANCE_DTYPE.itemsize
+        glBindBuffer(GL_ARRAY_BUFFER, self._buffer)
+        for column in range(4):
+            location = MODEL_LOCATION + column
+            glEnableVertexAttribArray(location)
+            glVertexAttribPointer(location, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(16 * column))
+            glVertexAttribDivisor(location, 1)
+        glEnableVertexAttribArray(PHASE_LOCATION)
+        glVertexAttribPointer(PHASE_LOCATION, 1, GL_FLOAT, GL_FALSE, stride,
+                              ctypes.c_void_p(INSTANCE_DTYPE.fields['phase'][1]))
+        glVertexAttribDivisor(PHASE_LOCATION, 1)
+
+    def _unbind_instances(self):
+        for location in range(MODEL_LOCATION, PHASE_LOCATION + 1):
+            glVertexAttribDivisor(location, 0)
+            glDisableVertexAttribArray(location)
+
+    def draw(self, time):
+        """
+        Отрисовывает все экземпляры.
+        :param time: Время анимации цвета.
+        """
+        if not len(self.instances):
+            return
+        if not self.instanced:
+            self._draw_each(time)
+            return
+
+        self.program.use()
+        self.program.set_uniform('time', time)
+        self._bind_instances()
+        count = self.mesh.bind()
+        glDrawElementsInstanced(GL_TRIANGLES, count, GL_UNSIGNED_INT, ctypes.c_void_p(0), len(self.instances))
+        self.draw_calls += 1
+        self.mesh.unbind()
+        self._unbind_instances()
+        ShaderProgram.unuse()
+
+    def _draw_each(self, time):
+        # Запасной путь: отдельный вызов отрисовки на каждый экземпляр
+        colors = instance_colors(self.instances['phase'], time)
+        # Альфа берется из текущего материала, как gl_FrontMaterial.diffuse.a в шейдере
+        alpha = glGetMaterialfv(GL_FRONT, GL_DIFFUSE)[3]
+        glMatrixMode(GL_MODELVIEW)
+        # Матрицы экземпляров масштабируют нормали; фиксированный конвейер нормирует их только по просьбе
+        glEnable(GL_NORMALIZE)
+        for model, color in zip(self.instances['model'], colors):
+            glPushMatrix()
+            glMultMatrixf(model)
+            material = [color[0], color[1], color[2], alpha]
+            glMaterialfv(GL_FRONT_AND_BACK, GL_DIFFUSE, material)
+            glMaterialfv(GL_FRONT_AND_BACK, GL_SPECULAR, material)
+            self.mesh.draw()
+            self.draw_calls += 1
+            glPopMatrix()
+        glDisable(GL_NORMALIZE)
+
+    def release(self):
+        self.mesh.release()
+        if self._buffer is not None:
+            glDeleteBuffers(1, [self._buffer])
+            self._buffer = None
+            self._capacity = 0
+        if self.program is not None:
+            self.program.release()
+            self.program = None
@@ -0,0 +1,109 @@
+import numpy as np
+
+
+def clip_matrix(projection, modelview):
+    """
+    Полная матрица в пространство отсечения по матрицам OpenGL.
+    :param projection: GL_PROJECTION_MATRIX в порядке OpenGL (как возвращает glGetDoublev, по столбцам).
+    :param modelview: GL_MODELVIEW_MATRIX в том же порядке.
+    :return: Матрица 4x4 для точек-столбцов (clip = M @ [x, y, z, 1]).
+    """
+    return np.asarray(projection, dtype=np.float64).T @ np.asarray(modelview, dtype=np.float64).T
+
+
+def projected_radius(center, radius, matrix, viewport_height):
+    """
+    Радиус ограничивающей сферы на экране в пикселях для перспективной проекции.
+    Если между перспективой и объектом стоят только повороты, переносы и равномерный
+    масштаб, длина строки y матрицы равна f = ctg(fovy / 2) (с учетом масштаба),
+    а w в пространстве отсечения — расстояние до камеры вдоль взгляда.
+    :param center: Центр сферы (3,) или центры (N, 3) в координатах объекта.
+    :param radius: Радиус сферы (число или (N,)).
+    :param matrix: Матрица clip_matrix.
+    :param viewport_height: Высота области вывода в пикселях.
+    :return: Радиусы в пикселях (бесконечность для сфер, задевающих плоскость камеры).
+    """
+    center = np.asarray(center, dtype=np.float64)
+    w = center @ matrix[3, :3] + matrix[3, 3]
+    f = np.linalg.norm(matrix[1, :3])
+    with np.errstate(divide='ignore'):
+        pixels = np.asarray(radius) * f / w * viewport_height / 2
+    return np.where(w > radius, pixels, np.inf)
+
+
+class LODManager:
+    """
+    Выбор уровня детализации по размеру объекта на экране.
+    Сетки всех уровней строятся заранее. Идеальное число сегментов — длина окружности
+    на экране, деленная на желаемую длину сегмента в пикселях; берется ближайший
+    уровень не меньше идеального. Гистерезис удерживает текущий уровень, пока идеальное
+    значение не выйдет за его границы с запасом hysteresis, чтобы уровни не мигали
+    на границе. При заданном бюджете треугольников все идеальные значения уменьшаются
+    одним общим множителем, пока сумма не войдет в бюджет.
+    """
+
+    def __init__(self, build, levels, pixels_per_segment=8.0, hysteresis=0.2, triangle_budget=None):
+        """
+        :param build: Функция n_segments -> (вершины, грани, ...), например через кэш сеток.
+        :param levels: Доступные количества сегментов.
+        :param pixels_per_segment: Желаемая длина сегмента окружности на экране.
+        :param hysteresis: Относительный запас перед сменой уровня.
+        :param triangle_budget: Предел суммарного количества треугольников или None.
+        """
+        self.levels = np.array(sorted(levels))
+        self.meshes = [build(n) for n in self.levels]
+        self.triangles = np.array([len(mesh[1]) for mesh in self.meshes])
+        self.pixels_per_segment = pixels_per_segment
+        self.hysteresis = hysteresis
+        self.triangle_budget = triangle_budget
+        self.current = None
+        self.switches = 0
+
+    def ideal_segments(self, pixel_radius):
+        return 2 * np.pi * np.asarray(pixel_radius, dtype=np.float64) / self.pixels_per_segment
+
+    def _level(self, ideal):
+        return np.minimum(np.searchsorted(self.levels, ideal), len(self.levels) - 1)
+
+    def select(self, pixel_radius):
+        """
+        Выбирает уровни для объектов с заданными экранными радиусами.
+        Гистерезис работает, пока количество объектов не меняется.
+        :param pixel_radius: Радиусы в пикселях (число или (N,)).
+        :return: Номера уровней формы (N,).
+        """
+        ideal = np.atleast_1d(self.ideal_segments(pixel_radius))
+        target = self._level(ideal)
+
+        current = self.current
+        if current is not None and len(current) == len(target):
+            upper = self.levels[current] * (1 + self.hysteresis)
+            lower = np.where(current > 0, self.levels[current - 1] * (1 - self.hysteresis), -np.inf)
+            target = np.where((ideal >= lower) & (ideal <= upper), current, target)
+
+        if self.triangle_budget is not None and self.triangles[target].sum() > self.triangle_budget:
+            target = self._fit_budget(ideal)
+
+        if current is not None and len(current) == len(target):
+            self.switches += int(np.count_nonzero(current != target))
+        self.current = target
+        return target
+
+    def _fit_budget(self, ideal, steps=30):
+        """
+        Наибольший общий множитель идеальных значений, при котором сумма треугольников в бюджете.
+        """
+        low, high = 0.0, 1.0
+        for _ in range(steps):
+            middle = (low + high) / 2
+            if self.triangles[self._level(ideal * middle)].sum() <= self.triangle_budget:
+                low = middle
+            else:
+                high = middle
+        return self._level(ideal * low)
+
+    def mesh(self, level):
+        """
+        Заранее построенная сетка уровня level.
+        """
+        return self.meshes[level]
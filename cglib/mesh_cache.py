@@ -0,0 +1,110 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+from cglib.mesh_io import MESH_VERSION, load_or_build
+from cglib.meshgen import GENERATOR_VERSION
+
+
+def _entry_bytes(entry):
+    # У контейнера без нормалей на их месте None
+    return sum(array.nbytes for array in entry if array is not None)
+
+
+class MeshCache:
+    """
+    Кэш сеток с ограниченным объемом памяти и вытеснением по LRU.
+    Ключ — кортеж параметров тесселяции, например ('barrel', h, (r_bottom, r_max), n_segments).
+    Значение — кортеж NumPy-массивов (вершины, грани, нормали ...).
+    С каталогом directory промахи идут через контейнеры сеток на диске: сетка строится
+    один раз на все процессы, а массивы отображаются на файл через np.memmap.
+    Отображенные сетки учитываются в том же бюджете: вытесненная запись освобождает
+    отображение файла, как только на ее массивы не остается ссылок.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, directory=None):
+        """
+        :param max_bytes: Максимальный суммарный объем массивов в кэше в байтах.
+        :param directory: Каталог контейнеров сеток или None — только память процесса.
+            Сетки в каталоге хранятся как (вершины, грани, нормали) в float32/uint32.
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def get(self, key, build):
+        """
+        Возвращает сетку из кэша или строит ее функцией build и запоминает.
+        :param key: Хэшируемый ключ параметров тесселяции.
+        :param build: Функция без аргументов, возвращающая кортеж массивов.
+        :return: Кортеж массивов; массивы из кэша доступны только для чтения.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        if self.directory is not None:
+            # Массивы только для чтения отображены на контейнер в каталоге
+            entry = load_or_build(self.path(key), build)
+        else:
+            entry = tuple(build())
+            for array in entry:
+                array.setflags(write=False)
+        size = _entry_bytes(entry)
+        # Сетку больше всего бюджета не кэшируем, чтобы не вытеснить ради нее все остальное
+        if size > self.max_bytes:
+            return entry
+
+        self._entries[key] = entry
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= _entry_bytes(evicted)
+            self.evictions += 1
+        return entry
+
+    def path(self, key):
+        """
+        Путь контейнера сетки для ключа: вид сетки и хэш параметров тесселяции.
+        """
+        # Версии формата и генераторов входят в хэш: после их смены старые файлы не подхватываются
+        digest = hashlib.sha1(repr((MESH_VERSION, GENERATOR_VERSION, key)).encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f'{key[0]}_{digest}.cgmesh')
+
+    def clear(self):
+        """
+        Очищает кэш, счетчики попаданий сохраняются.
+        """
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def stats(self):
+        """
+        Счетчики кэша для проверки под интерактивной нагрузкой.
+        :return: Словарь со счетчиками и занятым объемом.
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self._entries),
+            'nbytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,274 @@
+import os
+import struct
+
+import numpy as np
+
+# Запись треугольника бинарного STL: нормаль, три вершины и 16-битный атрибут (50 байт без выравнивания)
+STL_DTYPE = np.dtype([('normal', '<f4', 3), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+
+# Грань бинарного PLY: длина списка (всегда 3) и индексы вершин (13 байт без выравнивания)
+PLY_FACE_DTYPE = np.dtype([('count', 'u1'), ('indices', '<u4', 3)])
+
+# Заголовок контейнера сетки для np.memmap (64 байта); смещения массивов кратны MESH_ALIGNMENT
+MESH_MAGIC = b'CGMESH\0\1'
+MESH_VERSION = 1
+MESH_HEADER_DTYPE = np.dtype([('magic', 'S8'), ('version', '<u4'), ('reserved', '<u4'),
+                              ('vertex_count', '<u8'), ('face_count', '<u8'), ('normal_count', '<u8'),
+                              ('vertex_offset', '<u8'), ('face_offset', '<u8'), ('normal_offset', '<u8')])
+MESH_ALIGNMENT = 64
+
+
+def _ranges(count, chunk):
+    for start in range(0, count, chunk):
+        yield start, min(start + chunk, count)
+
+
+def triangle_normals(triangles):
+    """
+    Единичные нормали треугольников (вырожденные получают нулевую нормаль).
+    :param triangles: Массив формы (F, 3, 3).
+    :return: Массив формы (F, 3).
+    """
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, length, out=np.zeros_like(normals), where=length > 0)
+
+
+class StlWriter:
+    """
+    Потоковая запись бинарного STL порциями треугольников.
+    Количество треугольников неизвестно заранее и дописывается в заголовок при закрытии,
+    поэтому сетку можно генерировать и записывать по частям в ограниченной памяти.
+    """
+
+    def __init__(self, path, header=b'cglib binary STL'):
+        """
+        :param path: Путь к файлу.
+        :param header: Текст 80-байтного заголовка.
+        """
+        self.file = open(path, 'wb')
+        self.file.write(header[:80].ljust(80, b'\0'))
+        self.file.write(struct.pack('<I', 0))
+        self.count = 0
+
+    def write(self, triangles, normals=None):
+        """
+        :param triangles: Координаты вершин треугольников формы (n, 3, 3).
+        :param normals: Нормали формы (n, 3) или None — вычислить по вершинам.
+        """
+        records = np.empty(len(triangles), dtype=STL_DTYPE)
+        records['vertices'] = triangles
+        records['normal'] = triangle_normals(records['vertices']) if normals is None else normals
+        records['attribute'] = 0
+        records.tofile(self.file)
+        self.count += len(records)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.seek(80)
+        self.file.write(struct.pack('<I', self.count))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_stl(path, vertices, faces, normals=None, chunk=1 << 18):
+    """
+    Записывает индексированную сетку в бинарный STL.
+    :param path: Путь к файлу.
+    :param vertices: Вершины формы (N, 3).
+    :param faces: Треугольники формы (F, 3).
+    :param normals: Нормали граней формы (F, 3) или None.
+    :param chunk: Количество треугольников в одной порции записи.
+    :return: Количество записанных треугольников.
+    """
+    vertices, faces = np.asarray(vertices), np.asarray(faces)
+    with StlWriter(path) as writer:
+        for start, stop in _ranges(len(faces), chunk):
+            writer.write(vertices[faces[start:stop]], None if normals is None else normals[start:stop])
+    return writer.count
+
+
+def write_ply(path, vertices, faces, vertex_normals=None, face_normals=None, chunk=1 << 18):
+    """
+    Записывает сетку в бинарный PLY (little endian).
+    :param path: Путь к файлу.
+    :param vertices: Вершины формы (N, 3).
+    :param faces: Треугольники формы (F, 3).
+    :param vertex_normals: Нормали вершин формы (N, 3) или None.
+    :param face_normals: Нормали граней формы (F, 3) или None (свойства элемента face).
+    :param chunk: Количество элементов в одной порции записи.
+    """
+    vertices, faces = np.asarray(vertices), np.asarray(faces)
+    vertex_fields = [('position', '<f4', 3)] + ([('normal', '<f4', 3)] if vertex_normals is not None else [])
+    face_fields = PLY_FACE_DTYPE.descr + ([('normal', '<f4', 3)] if face_normals is not None else [])
+    normal_properties = ['property float nx', 'property float ny', 'property float nz']
+
+    lines = ['ply', 'format binary_little_endian 1.0', 'comment cglib',
+             f'element vertex {len(vertices)}', 'property float x', 'property float y', 'property float z']
+    if vertex_normals is not None:
+        lines += normal_properties
+    lines += [f'element face {len(faces)}', 'property list uchar uint vertex_indices']
+    if face_normals is not None:
+        lines += normal_properties
+    lines.append('end_header\n')
+
+    with open(path, 'wb') as file:
+        file.write('\n'.join(lines).encode('ascii'))
+        for start, stop in _ranges(len(vertices), chunk):
+            records = np.empty(stop - start, dtype=vertex_fields)
+            records['position'] = vertices[start:stop]
+            if vertex_normals is not None:
+                records['normal'] = vertex_normals[start:stop]
+            records.tofile(file)
+        for start, stop in _ranges(len(faces), chunk):
+            records = np.empty(stop - start, dtype=face_fields)
+            records['count'] = 3
+            records['indices'] = faces[start:stop]
+            if face_normals is not None:
+                records['normal'] = face_normals[start:stop]
+            records.tofile(file)
+
+
+def write_obj(path, vertices, faces, vertex_normals=None, face_normals=None, chunk=1 << 16):
+    """
+    Записывает сетку в Wavefront OBJ. Формат текстовый, поэтому каждая порция
+    форматируется одной операцией % над повторенным шаблоном строки, без цикла по граням.
+    :param path: Путь к файлу.
+    :param vertices: Вершины формы (N, 3).
+    :param faces: Треугольники формы (F, 3).
+    :param vertex_normals: Нормали вершин формы (N, 3) или None.
+    :param face_normals: Нормали граней формы (F, 3) или None (одна vn на грань).
+    :param chunk: Количество строк в одной порции записи.
+    """
+    vertices, faces = np.asarray(vertices), np.asarray(faces)
+
+    def write_rows(file, template, count, rows):
+        # rows(start, stop) строит только текущую порцию строк
+        for start, stop in _ranges(count, chunk):
+            file.write((template * (stop - start)) % tuple(rows(start, stop).ravel().tolist()))
+
+    def face_rows(start, stop):
+        # Индексы OBJ начинаются с единицы; у каждой вершины грани — пара v//vn
+        indices = faces[start:stop].astype(np.int64) + 1
+        if vertex_normals is not None:
+            return np.repeat(indices, 2, axis=1)
+        if face_normals is not None:
+            pairs = np.empty((stop - start, 3, 2), dtype=np.int64)
+            pairs[:, :, 0] = indices
+            pairs[:, :, 1] = np.arange(start + 1, stop + 1)[:, None]
+            return pairs
+        return indices
+
+    with open(path, 'w', newline='\n') as file:
+        file.write('# cglib\n')
+        write_rows(file, 'v %.7g %.7g %.7g\n', len(vertices), lambda start, stop: vertices[start:stop])
+        normals = vertex_normals if vertex_normals is not None else face_normals
+        if normals is not None:
+            normals = np.asarray(normals)
+            write_rows(file, 'vn %.7g %.7g %.7g\n', len(normals), lambda start, stop: normals[start:stop])
+            write_rows(file, 'f %d//%d %d//%d %d//%d\n', len(faces), face_rows)
+        else:
+            write_rows(file, 'f %d %d %d\n', len(faces), face_rows)
+
+
+def write_mesh(path, vertices, faces, normals=None, **kwargs):
+    """
+    Записывает сетку в формат по расширению файла: .stl, .ply или .obj.
+    :param normals: Нормали граней формы (F, 3) или None.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.stl':
+        write_stl(path, vertices, faces, normals, **kwargs)
+    elif extension == '.ply':
+        write_ply(path, vertices, faces, face_normals=normals, **kwargs)
+    elif extension == '.obj':
+        write_obj(path, vertices, faces, face_normals=normals, **kwargs)
+    else:
+        raise ValueError(f'Неизвестный формат сетки: {extension}')
+
+
+def _align(offset):
+    return -(-offset // MESH_ALIGNMENT) * MESH_ALIGNMENT
+
+
+def save_mesh(path, vertices, faces, normals=None, chunk=1 << 18):
+    """
+    Сохраняет сетку в контейнер для отображения в память: заголовок, затем выровненные
+    массивы float32 вершин, uint32 индексов и float32 нормалей (граней или вершин).
+    :param path: Путь к файлу.
+    :param vertices: Вершины формы (N, 3).
+    :param faces: Треугольники формы (F, 3).
+    :param normals: Нормали формы (F, 3) или (N, 3), или None.
+    :param chunk: Количество строк в одной порции записи.
+    """
+    arrays = [(np.asarray(vertices), '<f4'), (np.asarray(faces), '<u4')]
+    if normals is not None:
+        arrays.append((np.asarray(normals), '<f4'))
+
+    header = np.zeros(1, dtype=MESH_HEADER_DTYPE)
+    header['magic'] = MESH_MAGIC
+    header['version'] = MESH_VERSION
+    offset = MESH_HEADER_DTYPE.itemsize
+    for (array, dtype), name in zip(arrays, ('vertex', 'face', 'normal')):
+        offset = _align(offset)
+        header[name + '_count'] = len(array)
+        header[name + '_offset'] = offset
+        offset += array.shape[0] * 3 * np.dtype(dtype).itemsize
+
+    with open(path, 'wb') as file:
+        header.tofile(file)
+        for (array, dtype), name in zip(arrays, ('vertex', 'face', 'normal')):
+            file.seek(int(header[name + '_offset'][0]))
+            for start, stop in _ranges(len(array), chunk):
+                np.ascontiguousarray(array[start:stop], dtype=dtype).tofile(file)
+        file.truncate(offset)
+
+
+def load_mesh(path, mode='r'):
+    """
+    Открывает контейнер сетки без копирования: массивы отображаются на файл через np.memmap,
+    поэтому несколько процессов, открывших один файл, делят его страницы в кэше ОС.
+    :param path: Путь к файлу save_mesh.
+    :param mode: Режим np.memmap: 'r' — только чтение, 'c' — копирование при записи.
+    :return: Кортеж (вершины (N, 3) float32, грани (F, 3) uint32, нормали (·, 3) float32 или None).
+    """
+    header = np.fromfile(path, dtype=MESH_HEADER_DTYPE, count=1)
+    if len(header) != 1 or header['magic'][0] != MESH_MAGIC:
+        raise ValueError(f'Файл не является контейнером сетки: {path}')
+    if header['version'][0] != MESH_VERSION:
+        raise ValueError(f'Неподдерживаемая версия контейнера сетки: {header["version"][0]}')
+
+    def mapped(name, dtype):
+        count = int(header[name + '_count'][0])
+        if count == 0:
+            return np.zeros((0, 3), dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode=mode, offset=int(header[name + '_offset'][0]), shape=(count, 3))
+
+    normals = mapped('normal', '<f4') if header['normal_offset'][0] else None
+    return mapped('vertex', '<f4'), mapped('face', '<u4'), normals
+
+
+def load_or_build(path, build):
+    """
+    Отображает готовый контейнер сетки или строит сетку, сохраняет и отображает ее.
+    Запись идет во временный файл с атомарной заменой, так что параллельные процессы
+    не увидят недописанный контейнер; при ошибке построения или записи временный файл удаляется.
+    :param path: Путь к контейнеру.
+    :param build: Функция без аргументов, возвращающая (вершины, грани, нормали).
+    :return: Результат load_mesh.
+    """
+    if not os.path.exists(path):
+        temporary = f'{path}.{os.getpid()}.tmp'
+        try:
+            save_mesh(temporary, *build())
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+    return load_mesh(path)
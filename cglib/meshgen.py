@@ -0,0 +1,174 @@
+from functools import lru_cache
+
+import numpy as np
+
+from cglib.culling import orient_outward
+
+# Версия генераторов сеток: увеличивается при любом изменении их результата или сеток,
+# которые лабораторные из них строят, чтобы кэш сеток на диске (cglib.mesh_cache)
+# не отдавал сетки, построенные старым кодом; 2 — слитый шов сеток Labs3
+GENERATOR_VERSION = 2
+
+
+@lru_cache(maxsize=64)
+def unit_circle(n_radial, seam=True):
+    """
+    Таблица косинусов и синусов единичной окружности для заданного числа сегментов.
+    Вычисляется один раз на количество сегментов и переиспользуется всеми кольцами.
+    :param n_radial: Количество сегментов по окружности.
+    :param seam: Добавить ли в конец повтор первой точки (шов).
+    :return: Массив формы (2, n_radial + seam) только для чтения: строки cos и sin.
+    """
+    angles = 2 * np.pi * np.arange(n_radial + (1 if seam else 0)) / n_radial
+    table = np.stack((np.cos(angles), np.sin(angles)))
+    table.setflags(write=False)
+    return table
+
+
+def _profile_radii(profile, z):
+    """
+    Вычисляет радиусы колец для заданного профиля.
+    :param profile: Число (постоянный радиус) или векторизованная функция r(z).
+    :param z: Массив высот колец.
+    :return: Массив радиусов той же длины, что и z.
+    """
+    if callable(profile):
+        radii = profile(z)
+    else:
+        radii = profile
+    return np.broadcast_to(np.asarray(radii, dtype=np.float64), z.shape)
+
+
+def generate_ring_vertices(profile, h, n_radial, n_axial, up='z', seam=True):
+    """
+    Строит сетку вершин тела вращения одним броадкастом.
+    :param profile: Радиус (число) или векторизованная функция r(z) на отрезке [0, h].
+    :param h: Высота тела.
+    :param n_radial: Количество сегментов по окружности.
+    :param n_axial: Количество сегментов по высоте (колец будет n_axial + 1).
+    :param up: Ось высоты: 'z' (Labs3) или 'y' (OpenGL-лабораторные).
+    :param seam: Дублировать ли первую точку кольца в конце (шов, как в Labs3).
+    :return: Массив вершин формы ((n_axial + 1) * ring, 3), ring = n_radial + seam.
+    """
+    z = h * np.arange(n_axial + 1) / n_axial
+    radii = _profile_radii(profile, z)
+    ring_x, ring_y = unit_circle(n_radial, seam)
+
+    # Кольца — это таблица единичной окружности, масштабированная радиусом кольца
+    vertices = np.empty((n_axial + 1, ring_x.size, 3))
+    height_axis = 2 if up == 'z' else 1
+    depth_axis = 1 if up == 'z' else 2
+    np.multiply(radii[:, None], ring_x[None, :], out=vertices[:, :, 0])
+    np.multiply(radii[:, None], ring_y[None, :], out=vertices[:, :, depth_axis])
+    vertices[:, :, height_axis] = z[:, None]
+    return vertices.reshape(-1, 3)
+
+
+def generate_ring_faces(n_radial, n_axial, seam=True):
+    """
+    Строит индексный буфер треугольников для сетки колец.
+    Порядок обхода совпадает с исходными лабораторными: при seam=True
+    квадрат делится как в Labs3, при seam=False — как в Labs4,5 и Labs6.
+    :param n_radial: Количество сегментов по окружности.
+    :param n_axial: Количество сегментов по высоте.
+    :param seam: Сетка построена с дублированной точкой шва.
+    :return: Массив граней формы (2 * n_radial * n_axial, 3) типа int32.
+    """
+    ring = n_radial + (1 if seam else 0)
+    i = np.arange(n_axial, dtype=np.int32)[:, None]
+    j = np.arange(n_radial, dtype=np.int32)[None, :]
+    j_next = j + 1 if seam else (j + 1) % n_radial
+
+    # Углы четырехугольника: a — текущая точка, b — следующая по кругу, c и d — над ними
+    a = i * ring + j
+    b = i * ring + j_next
+    c = b + ring
+    d = a + ring
+
+    faces = np.empty((n_axial, n_radial, 2, 3), dtype=np.int32)
+    if seam:
+        faces[:, :, 0] = np.stack((a, b, d), axis=-1)
+        faces[:, :, 1] = np.stack((b, c, d), axis=-1)
+    else:
+        faces[:, :, 0] = np.stack((a, b, c), axis=-1)
+        faces[:, :, 1] = np.stack((a, c, d), axis=-1)
+    return faces.reshape(-1, 3)
+
+
+def barrel_profile(h, r_bottom, r_max):
+    """
+    Синусоидальный профиль бочки: радиус r_bottom у оснований и r_max посередине.
+    :return: Векторизованная функция r(z).
+    """
+    def profile(z):
+        return r_bottom + (r_max - r_bottom) * np.sin(np.pi * z / h)
+    return profile
+
+
+def generate_barrel_mesh(h, r_bottom, r_max, n_radial, n_axial=None):
+    """
+    Вершины и грани бочки в системе координат Labs3 (ось z вверх, со швом).
+    :return: Кортеж (vertices, faces).
+    """
+    n_axial = n_radial if n_axial is None else n_axial
+    vertices = generate_ring_vertices(barrel_profile(h, r_bottom, r_max), h, n_radial, n_axial)
+    faces = generate_ring_faces(n_radial, n_axial)
+    return vertices, faces
+
+
+def generate_cylinder_mesh(h, r, n_radial, n_axial=1, up='y', seam=False):
+    """
+    Вершины и грани боковой поверхности цилиндра.
+    По умолчанию — в системе координат OpenGL-лабораторных (ось y вверх, без шва).
+    :return: Кортеж (vertices, faces).
+    """
+    vertices = generate_ring_vertices(r, h, n_radial, n_axial, up=up, seam=seam)
+    faces = generate_ring_faces(n_radial, n_axial, seam=seam)
+    return vertices, faces
+
+
+def dodecahedron():
+    """
+    Правильный додекаэдр Labs2: 20 вершин и 12 пятиугольных граней.
+    Обход граней согласован так, что все нормали смотрят наружу.
+    :return: Кортеж (vertices (20, 3), faces (12, 5)).
+    """
+    # Золотое сечение
+    phi = (1 + np.sqrt(5)) / 2
+    vertices = np.array([
+        [1, 1, -1],
+        [phi, 0, -1 / phi],
+        [1, -1, -1],
+        [0, -1 / phi, -phi],
+        [0, 1 / phi, -phi],
+        [1, 1, 1],
+        [1, -1, 1],
+        [-1, -1, -1],
+        [-1, -1, 1],
+        [-1, 1, -1],
+        [-1, 1, 1],
+        [0, 1 / phi, phi],
+        [0, -1 / phi, phi],
+        [1 / phi, phi, 0],
+        [1 / phi, -phi, 0],
+        [-1 / phi, phi, 0],
+        [-1 / phi, -phi, 0],
+        [phi, 0, 1 / phi],
+        [-phi, 0, 1 / phi],
+        [-phi, 0, -1 / phi]
+    ])
+    faces = np.array([
+        [0, 1, 2, 3, 4],
+        [3, 4, 9, 19, 7],
+        [3, 2, 14, 16, 7],
+        [0, 4, 9, 15, 13],
+        [15, 13, 5, 11, 10],
+        [11, 10, 18, 8, 12],
+        [18, 8, 16, 7, 19],
+        [18, 19, 9, 15, 10],
+        [14, 16, 8, 12, 6],
+        [12, 6, 17, 5, 11],
+        [6, 17, 1, 2, 14],
+        [17, 1, 0, 13, 5]
+    ])
+    return vertices, orient_outward(vertices, faces)
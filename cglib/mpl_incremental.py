@@ -0,0 +1,158 @@
+import time
+from collections import deque
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+
+class MeshArtist:
+    """
+    Постоянная Poly3DCollection для сетки: данные обновляются без ax.clear()
+    и без создания новой коллекции.
+    """
+
+    def __init__(self, ax, **kwargs):
+        """
+        :param ax: Оси matplotlib 3D.
+        :param kwargs: Параметры Poly3DCollection (linewidths, edgecolors и т.п.).
+        """
+        self.collection = Poly3DCollection([], **kwargs)
+        ax.add_collection3d(self.collection)
+        self._mesh = None
+        self.mesh_updates = 0
+        self.color_updates = 0
+
+    def set_mesh(self, vertices, faces):
+        """
+        Заменяет вершины коллекции; если сетка та же, ничего не делает.
+        :return: True, если вершины были заменены.
+        """
+        if self._mesh is not None and self._mesh[0] is vertices and self._mesh[1] is faces:
+            return False
+        self._mesh = (vertices, faces)
+        self.collection.set_verts(vertices[faces])
+        self.mesh_updates += 1
+        return True
+
+    def set_colors(self, colors):
+        """
+        Меняет только цвета граней.
+        """
+        self.collection.set_facecolor(colors)
+        self.color_updates += 1
+
+
+class CurveFamilyArtist:
+    """
+    Семейство кривых одной LineCollection: один артист вместо N вызовов plot,
+    обновление заменяет сегменты без создания новой коллекции.
+    """
+
+    def __init__(self, ax, **kwargs):
+        """
+        :param ax: Оси matplotlib 2D.
+        :param kwargs: Параметры LineCollection (linewidths, colors, cmap и т.п.).
+        """
+        self.ax = ax
+        self.collection = LineCollection([], **kwargs)
+        ax.add_collection(self.collection)
+        self.updates = 0
+
+    def set_curves(self, curves, values=None, autoscale=False):
+        """
+        Заменяет кривые семейства.
+        :param curves: Точки формы (P, S, 2), например результат rose_family.
+        :param values: Необязательные значения (P,) для раскраски через cmap.
+        :param autoscale: Подогнать пределы осей под новые кривые.
+        """
+        self.collection.set_segments(curves)
+        if values is not None:
+            self.collection.set_array(np.asarray(values))
+        if autoscale:
+            self.ax.update_datalim(np.reshape(curves, (-1, 2)))
+            self.ax.autoscale_view()
+        self.updates += 1
+
+
+class FrameTimes:
+    """
+    Последние длительности кадров и их перцентили.
+    """
+
+    def __init__(self, maxlen=1000):
+        self.samples = deque(maxlen=maxlen)
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+
+    def summary(self):
+        """
+        :return: Словарь с количеством кадров и перцентилями в миллисекундах.
+        """
+        if not self.samples:
+            return {'frames': 0}
+        ms = np.array(self.samples) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        return {'frames': len(ms), 'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99),
+                'max_ms': float(ms.max())}
+
+
+class CoalescingUpdater:
+    """
+    Объединяет частые события (перетаскивание ползунка) в одну перерисовку за кадр.
+    request() лишь помечает состояние устаревшим и взводит таймер; по таймеру
+    вызывается apply() и одна перерисовка холста. Время кадра — от начала apply()
+    до конца отрисовки (событие draw_event).
+    """
+
+    def __init__(self, canvas, apply, interval_ms=16):
+        """
+        :param canvas: Холст фигуры matplotlib.
+        :param apply: Функция, применяющая накопленные изменения к артистам.
+        :param interval_ms: Минимальный интервал между перерисовками.
+        """
+        self.canvas = canvas
+        self.apply = apply
+        self.frame_times = FrameTimes()
+        self.requests = 0
+        self.flushes = 0
+        self._pending = False
+        self._frame_start = None
+        self._timer = canvas.new_timer(interval=interval_ms)
+        self._timer.single_shot = True
+        self._timer.add_callback(self.flush)
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def request(self, *args):
+        """
+        Отмечает, что состояние изменилось; подходит как обработчик on_changed.
+        """
+        self.requests += 1
+        if not self._pending:
+            self._pending = True
+            self._timer.start()
+
+    def flush(self):
+        """
+        Применяет накопленные изменения и запрашивает перерисовку.
+        Можно вызывать напрямую, например без цикла событий.
+        """
+        if not self._pending:
+            return
+        self._pending = False
+        self.flushes += 1
+        self._frame_start = time.perf_counter()
+        self.apply()
+        self.canvas.draw_idle()
+
+    def _on_draw(self, event):
+        if self._frame_start is not None:
+            self.frame_times.record(time.perf_counter() - self._frame_start)
+            self._frame_start = None
+
+    def stats(self):
+        """
+        :return: Счетчики событий и перцентили времени кадра.
+        """
+        return {'requests': self.requests, 'flushes': self.flushes, **self.frame_times.summary()}
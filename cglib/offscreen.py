@@ -0,0 +1,58 @@
+import ctypes
+
+from OpenGL.GL import *
+from OpenGL.raw.GL.VERSION.GL_1_0 import glReadPixels as raw_glReadPixels
+
+
+class Framebuffer:
+    """
+    Внеэкранный буфер кадра: цветовой рендербуфер RGBA8 и буфер глубины.
+    """
+
+    def __init__(self, width, height):
+        """
+        :param width: Ширина в пикселях.
+        :param height: Высота в пикселях.
+        """
+        self.width = width
+        self.height = height
+        self.fbo = glGenFramebuffers(1)
+        self.color, self.depth = glGenRenderbuffers(2)
+
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.color)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.depth)
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError(f'Буфер кадра не готов: 0x{status:x}')
+
+    def bind(self):
+        """
+        Делает буфер целью отрисовки и выставляет область вывода.
+        """
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glViewport(0, 0, self.width, self.height)
+
+    def unbind(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+    def read_into(self, buffer):
+        """
+        Читает цвет в заранее выделенный массив без промежуточных копий.
+        :param buffer: C-непрерывный массив uint8 формы (height, width, 3).
+        """
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        glReadBuffer(GL_COLOR_ATTACHMENT0)
+        raw_glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE,
+                         buffer.ctypes.data_as(ctypes.c_void_p))
+
+    def release(self):
+        glDeleteFramebuffers(1, [self.fbo])
+        glDeleteRenderbuffers(2, [self.color, self.depth])
@@ -0,0 +1,192 @@
+import json
+import time
+
+import numpy as np
+
+
+class _Section:
+    """
+    Переиспользуемый контекст замера одного участка кадра (без создания объектов на каждый вызов).
+    """
+    __slots__ = ('profiler', 'column', 'start')
+
+    def __init__(self, profiler, column):
+        self.profiler = profiler
+        self.column = column
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.profiler._record(self.column, self.start, end)
+        self.profiler._nested += end - self.start
+
+
+class _NullSection:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_SECTION = _NullSection()
+
+
+class FrameProfiler:
+    """
+    Длительности участков кадра в кольцевых буферах numpy фиксированного размера.
+    Последовательные фазы кадра отмечаются lap(name) (время с предыдущей отметки),
+    вложенные участки — контекстом section(name). Если участок встречается в кадре
+    несколько раз, длительности складываются. Выключенный профилировщик ничего не пишет.
+    В сводке время отметки не включает вложенные в нее участки, поэтому участки не
+    учитываются дважды и в сумме дают кадр; в Chrome-trace отметка показана целиком,
+    а вложенные участки — внутри нее.
+    """
+
+    def __init__(self, sections=('events', 'mesh', 'draw', 'flip', 'wait'), capacity=1024, enabled=True):
+        """
+        :param sections: Имена участков кадра.
+        :param capacity: Сколько последних кадров хранится.
+        :param enabled: Включено ли профилирование.
+        """
+        self.names = list(sections) + ['frame']
+        self.enabled = enabled
+        self.capacity = capacity
+        self.starts = np.full((capacity, len(self.names)), np.nan)
+        self.durations = np.full((capacity, len(self.names)), np.nan)
+        # Время вложенных участков внутри каждой отметки lap
+        self.nested = np.zeros((capacity, len(self.names)))
+        self.frames = 0
+        self._columns = {name: i for i, name in enumerate(sections)}
+        self._sections = {name: _Section(self, i) for i, name in enumerate(sections)}
+        self._origin = time.perf_counter()
+        self._frame_start = None
+        self._lap_start = None
+        self._nested = 0.0
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        row = self.frames % self.capacity
+        self.starts[row] = np.nan
+        self.durations[row] = np.nan
+        self.nested[row] = 0.0
+        self._nested = 0.0
+        self._frame_start = self._lap_start = time.perf_counter()
+
+    def lap(self, name):
+        """
+        Записывает время от предыдущей отметки (или начала кадра) как участок name.
+        """
+        if self._frame_start is None:
+            return
+        now = time.perf_counter()
+        column = self._columns[name]
+        self._record(column, self._lap_start, now)
+        self.nested[self.frames % self.capacity, column] += self._nested
+        self._lap_start = now
+        self._nested = 0.0
+
+    def section(self, name):
+        """
+        Контекст замера участка name внутри кадра.
+        """
+        return self._sections[name] if self.enabled else _NULL_SECTION
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        self._record(len(self.names) - 1, self._frame_start, time.perf_counter())
+        self.frames += 1
+        self._frame_start = None
+
+    def _record(self, column, start, end):
+        if self._frame_start is None:
+            return
+        row = self.frames % self.capacity
+        # NaN — участок в этом кадре еще не встречался (сравнение дешевле np.isnan для скаляра)
+        if self.durations[row, column] != self.durations[row, column]:
+            self.starts[row, column] = start - self._origin
+            self.durations[row, column] = end - start
+        else:
+            self.durations[row, column] += end - start
+
+    def _recorded(self):
+        """
+        Строки завершенных кадров в порядке записи.
+        :return: Кортеж (начала, полные длительности, длительности без вложенных участков).
+        """
+        count = min(self.frames, self.capacity)
+        order = np.arange(self.frames - count, self.frames) % self.capacity
+        return self.starts[order], self.durations[order], self.durations[order] - self.nested[order]
+
+    def summary(self):
+        """
+        :return: Словарь: количество кадров и перцентили p50/p95/p99/max в миллисекундах по участкам
+            (для отметок lap — без вложенных участков).
+        """
+        _, _, durations = self._recorded()
+        result = {'frames': self.frames}
+        for column, name in enumerate(self.names):
+            ms = durations[:, column]
+            ms = ms[~np.isnan(ms)] * 1000
+            if len(ms):
+                p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+                result[name] = {'count': len(ms), 'p50_ms': float(p50), 'p95_ms': float(p95),
+                                'p99_ms': float(p99), 'max_ms': float(ms.max())}
+        return result
+
+    def chrome_trace(self):
+        """
+        События в формате Chrome Trace (chrome://tracing, Perfetto): участок — событие 'X'.
+        """
+        starts, durations, _ = self._recorded()
+        events = []
+        for frame_starts, frame_durations in zip(starts, durations):
+            for column, name in enumerate(self.names):
+                if not np.isnan(frame_durations[column]):
+                    events.append({'name': name, 'cat': 'frame', 'ph': 'X', 'pid': 0, 'tid': 0,
+                                   'ts': float(frame_starts[column] * 1e6),
+                                   'dur': float(frame_durations[column] * 1e6)})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.chrome_trace(), file)
+
+
+class FrameLimiter:
+    """
+    Ограничивает частоту кадров значением target_fps. Ожидание идет до срока следующего
+    кадра, а не фиксированное время, поэтому время работы кадра не добавляется к паузе.
+    """
+
+    def __init__(self, target_fps):
+        """
+        :param target_fps: Целевая частота кадров; 0 или None — без ограничения.
+        """
+        self.period = 1 / target_fps if target_fps else 0.0
+        self._deadline = None
+
+    def wait(self):
+        """
+        Ждет до срока следующего кадра.
+        :return: Время ожидания в секундах.
+        """
+        if not self.period:
+            return 0.0
+        now = time.perf_counter()
+        if self._deadline is None:
+            self._deadline = now
+        self._deadline += self.period
+        delay = self._deadline - now
+        if delay > 0:
+            time.sleep(delay)
+            return delay
+        if -delay > self.period:
+            # Отстали больше чем на кадр: не пытаемся догонять серией кадров без пауз
+            self._deadline = now
+        return 0.0
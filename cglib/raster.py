@@ -0,0 +1,165 @@
+import numpy as np
+
+
+def triangulate_polygons(faces):
+    """
+    Разбивает выпуклые многоугольники на треугольники веером.
+    :param faces: Массив граней формы (F, k), k >= 3.
+    :return: Кортеж (треугольники формы (F * (k - 2), 3), номер исходной грани для каждого треугольника).
+    """
+    faces = np.asarray(faces)
+    n_faces, k = faces.shape
+    fan = np.arange(1, k - 1)
+    triangles = np.empty((n_faces, k - 2, 3), dtype=faces.dtype)
+    triangles[:, :, 0] = faces[:, :1]
+    triangles[:, :, 1] = faces[:, fan]
+    triangles[:, :, 2] = faces[:, fan + 1]
+    return triangles.reshape(-1, 3), np.repeat(np.arange(n_faces), k - 2)
+
+
+def view_basis(elev, azim):
+    """
+    Базис камеры для ортографического вида, как у осей matplotlib 3D.
+    :param elev: Угол возвышения в градусах.
+    :param azim: Азимут в градусах.
+    :return: Матрица 3x3, строки — направления вправо, вверх и на зрителя.
+    """
+    e, a = np.radians(elev), np.radians(azim)
+    right = np.array([-np.sin(a), np.cos(a), 0.0])
+    up = np.array([-np.sin(e) * np.cos(a), -np.sin(e) * np.sin(a), np.cos(e)])
+    toward = np.array([np.cos(e) * np.cos(a), np.cos(e) * np.sin(a), np.sin(e)])
+    return np.stack((right, up, toward))
+
+
+def orthographic_screen(vertices, width, height, elev=30, azim=-60, margin=0.9):
+    """
+    Переводит вершины в экранные координаты с подгонкой под размер кадра.
+    :param vertices: Массив вершин формы (N, 3).
+    :param width: Ширина кадра в пикселях.
+    :param height: Высота кадра в пикселях.
+    :param margin: Доля кадра, занимаемая описанной сферой сетки.
+    :return: Массив формы (N, 3): x и y в пикселях (y вниз) и глубина (меньше — ближе).
+    """
+    view = vertices @ view_basis(elev, azim).T
+    center = (view.min(axis=0) + view.max(axis=0)) / 2
+    radius = np.linalg.norm(view - center, axis=1).max() or 1.0
+    scale = margin * min(width, height) / (2 * radius)
+
+    screen = np.empty_like(view)
+    screen[:, 0] = width / 2 + (view[:, 0] - center[0]) * scale
+    screen[:, 1] = height / 2 - (view[:, 1] - center[1]) * scale
+    screen[:, 2] = center[2] - view[:, 2]
+    return screen
+
+
+def _edge_setup(tris):
+    """
+    Коэффициенты барицентрических координат w = A * x + B * y + C для каждого треугольника.
+    """
+    x, y = tris[:, :, 0], tris[:, :, 1]
+    area = (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (x[:, 2] - x[:, 0]) * (y[:, 1] - y[:, 0])
+    valid = np.abs(area) > 1e-12
+    inv_area = np.zeros_like(area)
+    inv_area[valid] = 1 / area[valid]
+
+    coeffs = np.empty((len(tris), 2, 3))
+    # Барицентрическая координата вершины i пропорциональна площади против нее (ребро j -> k)
+    for row, (j, k) in enumerate(((1, 2), (2, 0))):
+        coeffs[:, row, 0] = (y[:, j] - y[:, k]) * inv_area
+        coeffs[:, row, 1] = (x[:, k] - x[:, j]) * inv_area
+        coeffs[:, row, 2] = (x[:, j] * y[:, k] - x[:, k] * y[:, j]) * inv_area
+    return coeffs, valid
+
+
+def rasterize(screen, faces, face_colors, width, height, background=(1.0, 1.0, 1.0), max_pairs=1 << 22):
+    """
+    Растеризует треугольники с буфером глубины.
+    Для каждого треугольника перебираются пиксели его ограничивающего прямоугольника;
+    пары (треугольник, пиксель) строятся векторно порциями не больше max_pairs.
+    :param screen: Экранные координаты вершин формы (N, 3) (см. orthographic_screen).
+    :param faces: Треугольники формы (F, 3).
+    :param face_colors: Цвета граней формы (F, 3) в диапазоне [0, 1].
+    :param width: Ширина кадра.
+    :param height: Высота кадра.
+    :param background: Цвет фона.
+    :param max_pairs: Ограничение на размер промежуточных массивов.
+    :return: Изображение uint8 формы (height, width, 3).
+    """
+    faces = np.asarray(faces)
+    face_colors = np.asarray(face_colors, dtype=np.float64)
+    tris = screen[faces]
+
+    # Ограничивающие прямоугольники по центрам пикселей, обрезанные кадром
+    x0 = np.clip(np.ceil(tris[:, :, 0].min(axis=1) - 0.5), 0, width).astype(np.int64)
+    x1 = np.clip(np.floor(tris[:, :, 0].max(axis=1) - 0.5) + 1, 0, width).astype(np.int64)
+    y0 = np.clip(np.ceil(tris[:, :, 1].min(axis=1) - 0.5), 0, height).astype(np.int64)
+    y1 = np.clip(np.floor(tris[:, :, 1].max(axis=1) - 0.5) + 1, 0, height).astype(np.int64)
+    box_w = np.maximum(x1 - x0, 0)
+    box_h = np.maximum(y1 - y0, 0)
+
+    coeffs, valid = _edge_setup(tris)
+    visible = np.flatnonzero(valid & (box_w > 0) & (box_h > 0))
+
+    depth = np.full(width * height, np.inf)
+    color_index = np.full(width * height, -1, dtype=np.int64)
+
+    ends = np.cumsum(box_w[visible] * box_h[visible])
+    start = 0
+    while start < len(visible):
+        # Порция заканчивается там, где число пар превысит max_pairs (но не меньше одного треугольника)
+        base = ends[start - 1] if start else 0
+        stop = max(int(np.searchsorted(ends, base + max_pairs, side='right')), start + 1)
+        chunk = visible[start:stop]
+        start = stop
+
+        counts = box_w[chunk] * box_h[chunk]
+        tri = np.repeat(chunk, counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        px = x0[tri] + local % box_w[tri]
+        py = y0[tri] + local // box_w[tri]
+        cx = px + 0.5
+        cy = py + 0.5
+
+        c = coeffs[tri]
+        w0 = c[:, 0, 0] * cx + c[:, 0, 1] * cy + c[:, 0, 2]
+        w1 = c[:, 1, 0] * cx + c[:, 1, 1] * cy + c[:, 1, 2]
+        w2 = 1 - w0 - w1
+        inside = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+
+        tri, w0, w1, w2 = tri[inside], w0[inside], w1[inside], w2[inside]
+        pixel = py[inside] * width + px[inside]
+        z = tris[tri, 0, 2] * w0 + tris[tri, 1, 2] * w1 + tris[tri, 2, 2] * w2
+
+        # Для каждого пикселя порции оставляем ближайший фрагмент и сравниваем с буфером глубины
+        order = np.lexsort((z, pixel))
+        pixel, z, tri = pixel[order], z[order], tri[order]
+        first = np.ones(pixel.size, dtype=bool)
+        first[1:] = pixel[1:] != pixel[:-1]
+        pixel, z, tri = pixel[first], z[first], tri[first]
+        closer = z < depth[pixel]
+        depth[pixel[closer]] = z[closer]
+        color_index[pixel[closer]] = tri[closer]
+
+    image = np.empty((width * height, 3))
+    image[:] = background
+    covered = color_index >= 0
+    image[covered] = face_colors[color_index[covered]]
+    return (np.clip(image, 0, 1) * 255 + 0.5).astype(np.uint8).reshape(height, width, 3)
+
+
+def render_mesh(vertices, faces, face_colors, width=800, height=800, elev=30, azim=-60, background=(1.0, 1.0, 1.0)):
+    """
+    Отрисовывает сетку в изображение без matplotlib: ортографический вид и буфер глубины.
+    Многоугольные грани (например, пятиугольники додекаэдра) разбиваются на треугольники.
+    :param vertices: Массив вершин формы (N, 3).
+    :param faces: Грани формы (F, k).
+    :param face_colors: Цвета граней формы (F, 3) или один цвет.
+    :return: Изображение uint8 формы (height, width, 3).
+    """
+    faces = np.asarray(faces)
+    face_colors = np.broadcast_to(np.asarray(face_colors, dtype=np.float64), (len(faces), 3))
+    if faces.shape[1] != 3:
+        faces, source = triangulate_polygons(faces)
+        face_colors = face_colors[source]
+    screen = orthographic_screen(np.asarray(vertices, dtype=np.float64), width, height, elev, azim)
+    return rasterize(screen, faces, face_colors, width, height, background)
@@ -0,0 +1,116 @@
+from OpenGL import error
+from OpenGL.GL import *
+
+# Фрагментный шейдер анимации цвета, общий для цилиндра Labs6 и инстансинга (cglib.instancing).
+# GLSL 1.20 читает состояние освещения и материала фиксированного конвейера (gl_LightSource,
+# gl_FrontMaterial). Вершинный шейдер передает position и normal в координатах камеры
+# и сдвиг фазы цвета color_phase (0 для одиночного цилиндра).
+COLOR_FRAGMENT_SHADER = """
+#version 120
+uniform float time;
+varying vec3 position;
+varying vec3 normal;
+varying float color_phase;
+
+vec4 shade(vec3 n, vec3 position, float phase) {
+    // Те же синусоиды, что в set_animated_color: сдвиги фаз 0, pi/2, pi для R, G, B
+    vec3 color = (sin(time + phase + vec3(0.0, 1.5707963, 3.1415927)) + 1.0) / 2.0;
+
+    // Освещение по модели фиксированного конвейера, но в каждом пикселе
+    vec3 l = normalize(gl_LightSource[0].position.xyz - position);
+    float diffuse = max(dot(n, l), 0.0);
+    float specular = 0.0;
+    if (diffuse > 0.0) {
+        vec3 h = normalize(l + vec3(0.0, 0.0, 1.0));
+        specular = pow(max(dot(n, h), 0.0), gl_FrontMaterial.shininess);
+    }
+    vec3 rgb = gl_FrontLightModelProduct.sceneColor.rgb + gl_FrontLightProduct[0].ambient.rgb
+             + gl_LightSource[0].diffuse.rgb * color * diffuse
+             + gl_LightSource[0].specular.rgb * color * specular;
+    return vec4(rgb, gl_FrontMaterial.diffuse.a);
+}
+
+void main() {
+    gl_FragColor = shade(normalize(normal), position, color_phase);
+}
+"""
+
+
+def _compile(kind, source):
+    shader = glCreateShader(kind)
+    glShaderSource(shader, source)
+    glCompileShader(shader)
+    if not glGetShaderiv(shader, GL_COMPILE_STATUS):
+        log = glGetShaderInfoLog(shader)
+        glDeleteShader(shader)
+        raise RuntimeError('Ошибка компиляции шейдера: ' + (log.decode() if isinstance(log, bytes) else str(log)))
+    return shader
+
+
+class ShaderProgram:
+    """
+    Программа GLSL из вершинного и фрагментного шейдеров.
+    Положения uniform-переменных запрашиваются один раз и кэшируются.
+    """
+
+    def __init__(self, vertex_source, fragment_source, attributes=None):
+        """
+        :param vertex_source: Текст вершинного шейдера.
+        :param fragment_source: Текст фрагментного шейдера.
+        :param attributes: Словарь имя атрибута -> номер, назначаемый до сборки программы.
+        """
+        vertex = _compile(GL_VERTEX_SHADER, vertex_source)
+        try:
+            fragment = _compile(GL_FRAGMENT_SHADER, fragment_source)
+        except RuntimeError:
+            glDeleteShader(vertex)
+            raise
+        self.program = glCreateProgram()
+        glAttachShader(self.program, vertex)
+        glAttachShader(self.program, fragment)
+        for name, location in (attributes or {}).items():
+            glBindAttribLocation(self.program, location, name)
+        glLinkProgram(self.program)
+        # Шейдеры больше не нужны: программа держит скомпилированный код сама
+        glDeleteShader(vertex)
+        glDeleteShader(fragment)
+        if not glGetProgramiv(self.program, GL_LINK_STATUS):
+            log = glGetProgramInfoLog(self.program)
+            glDeleteProgram(self.program)
+            raise RuntimeError('Ошибка сборки программы: ' + (log.decode() if isinstance(log, bytes) else str(log)))
+        self._locations = {}
+
+    def location(self, name):
+        if name not in self._locations:
+            self._locations[name] = glGetUniformLocation(self.program, name)
+        return self._locations[name]
+
+    def use(self):
+        glUseProgram(self.program)
+
+    @staticmethod
+    def unuse():
+        glUseProgram(0)
+
+    def set_uniform(self, name, value):
+        """
+        Задает float-uniform; программа должна быть активна.
+        """
+        glUniform1f(self.location(name), value)
+
+    def release(self):
+        glDeleteProgram(self.program)
+        self.program = 0
+
+
+def try_create_program(vertex_source, fragment_source, attributes=None):
+    """
+    Собирает программу, если контекст поддерживает шейдеры.
+    :return: Кортеж (ShaderProgram или None, причина отказа или None).
+    """
+    try:
+        if not (bool(glCreateShader) and bool(glUseProgram)):
+            return None, 'функции шейдеров недоступны'
+        return ShaderProgram(vertex_source, fragment_source, attributes), None
+    except (error.Error, RuntimeError) as exc:
+        return None, str(exc)
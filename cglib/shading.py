@@ -0,0 +1,68 @@
+import numpy as np
+
+
+def face_normals(vertices, faces):
+    """
+    Вычисляет единичные нормали всех граней за один векторизованный проход.
+    :param vertices: Массив вершин формы (N, 3).
+    :param faces: Массив треугольников формы (F, 3).
+    :return: Массив нормалей формы (F, 3); вырожденные грани получают нулевую нормаль.
+    """
+    tris = vertices[faces]
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths != 0)
+    return normals
+
+
+def light_direction(azimuth, altitude):
+    """
+    Единичный вектор направления на источник света.
+    Совпадает с matplotlib.colors.LightSource.direction.
+    :param azimuth: Азимут в градусах (по часовой стрелке от севера).
+    :param altitude: Высота над горизонтом в градусах.
+    :return: Массив формы (3,).
+    """
+    az = np.radians(90 - azimuth)
+    alt = np.radians(altitude)
+    return np.array([np.cos(az) * np.cos(alt), np.sin(az) * np.cos(alt), np.sin(alt)])
+
+
+class ShadingEngine:
+    """
+    Затенение по Ламберту с кэшированием нормалей граней.
+    Нормали пересчитываются только при смене геометрии, а смена света —
+    это одно умножение матрицы нормалей на вектор направления света.
+    """
+
+    def __init__(self):
+        self._vertices = None
+        self._faces = None
+        self.normals = None
+
+    def set_geometry(self, vertices, faces, normals=None):
+        """
+        Задает геометрию; нормали пересчитываются, только если массивы другие.
+        :param vertices: Массив вершин формы (N, 3).
+        :param faces: Массив треугольников формы (F, 3).
+        :param normals: Готовые нормали граней (например, из кэша сеток).
+        """
+        if vertices is self._vertices and faces is self._faces:
+            return
+        self._vertices = vertices
+        self._faces = faces
+        self.normals = face_normals(vertices, np.asarray(faces)) if normals is None else normals
+
+    def intensity(self, azimuth, altitude):
+        """
+        Освещенность каждой грани, обрезанная в диапазон [0, 1].
+        :return: Массив формы (F,).
+        """
+        return np.clip(self.normals @ light_direction(azimuth, altitude), 0, 1)
+
+    def shade(self, azimuth, altitude):
+        """
+        Цвета граней в оттенках серого, как у LightSource.shade_normals для одной нормали.
+        :return: Массив формы (F, 3).
+        """
+        return np.repeat(self.intensity(azimuth, altitude)[:, None], 3, axis=1)
@@ -0,0 +1,452 @@
+import numpy as np
+
+# Базисная матрица Эрмита: p(t) = [t^3, t^2, t, 1] @ HERMITE_BASIS @ [P0, P1, T0, T1]
+HERMITE_BASIS = np.array([
+    [2, -2, 1, 1],
+    [-3, 3, -2, -1],
+    [0, 0, 1, 0],
+    [1, 0, 0, 0],
+], dtype=np.float64)
+
+
+def power_basis(t, derivative=0):
+    """
+    Строки [t^3, t^2, t, 1] или их производные по t.
+    :param t: Значения параметра формы (S,).
+    :param derivative: Порядок производной (0–3).
+    :return: Матрица формы (S, 4).
+    """
+    t = np.asarray(t, dtype=np.float64)
+    one, zero = np.ones_like(t), np.zeros_like(t)
+    rows = {
+        0: (t ** 3, t ** 2, t, one),
+        1: (3 * t ** 2, 2 * t, one, zero),
+        2: (6 * t, 2 * one, zero, zero),
+        3: (6 * one, zero, zero, zero),
+    }
+    return np.stack(rows[derivative], axis=-1)
+
+
+class HermiteSegments:
+    """
+    Пакет кубических сегментов Эрмита, заданных концами и касательными.
+    Коэффициенты степенного базиса считаются один раз при создании, после чего
+    все сегменты вычисляются в общих точках одним матричным произведением.
+    Размерность данных любая (2D, 3D); параметр каждого сегмента t ∈ [0, 1].
+    """
+
+    def __init__(self, p0, p1, m0, m1):
+        """
+        :param p0: Начальные точки формы (N, D) (или (D,) для одного сегмента).
+        :param p1: Конечные точки формы (N, D).
+        :param m0: Касательные в начальных точках формы (N, D).
+        :param m1: Касательные в конечных точках формы (N, D).
+        """
+        control = np.stack(np.broadcast_arrays(*(np.atleast_2d(np.asarray(a, dtype=np.float64))
+                                                 for a in (p0, p1, m0, m1))), axis=1)
+        self.coefficients = HERMITE_BASIS @ control
+
+    @classmethod
+    def from_points(cls, points, tangents):
+        """
+        Цепочка сегментов через последовательные точки с касательными в них.
+        :param points: Точки формы (N + 1, D).
+        :param tangents: Касательные формы (N + 1, D).
+        """
+        points, tangents = np.asarray(points), np.asarray(tangents)
+        return cls(points[:-1], points[1:], tangents[:-1], tangents[1:])
+
+    def __len__(self):
+        return len(self.coefficients)
+
+    def evaluate(self, t, derivative=0):
+        """
+        Вычисляет все сегменты в одних и тех же значениях параметра.
+        :param t: Значения параметра формы (S,).
+        :param derivative: Порядок производной (0 — точки, 1 — касательные, 2 — вторые производные).
+        :return: Массив формы (N, S, D).
+        """
+        return power_basis(t, derivative) @ self.coefficients
+
+    def update(self, start, p0, p1, m0, m1):
+        """
+        Пересчитывает коэффициенты сегментов start, start + 1, ... по новым концам и касательным.
+        """
+        control = np.stack(np.broadcast_arrays(*(np.atleast_2d(np.asarray(a, dtype=np.float64))
+                                                 for a in (p0, p1, m0, m1))), axis=1)
+        self.coefficients[start:start + len(control)] = HERMITE_BASIS @ control
+
+    def evaluate_at(self, index, t, derivative=0):
+        """
+        Вычисляет произвольные пары (номер сегмента, параметр).
+        :param index: Номера сегментов формы (Q,).
+        :param t: Значения параметра формы (Q,).
+        :return: Массив формы (Q, D).
+        """
+        return np.einsum('qi,qid->qd', power_basis(t, derivative), self.coefficients[index])
+
+
+class TridiagonalSolver:
+    """
+    Разложение трехдиагональной матрицы (метод прогонки), пригодное для многих правых частей.
+    """
+
+    def __init__(self, lower, diagonal, upper):
+        """
+        :param lower: Поддиагональ длины n (lower[0] не используется).
+        :param diagonal: Главная диагональ длины n.
+        :param upper: Наддиагональ длины n (upper[-1] не используется).
+        """
+        self.lower = np.array(lower, dtype=np.float64)
+        self.diagonal = np.array(diagonal, dtype=np.float64)
+        self.upper = np.array(upper, dtype=np.float64)
+        n = len(self.diagonal)
+        self.pivots = np.empty(n)
+        self.ratios = np.zeros(n)
+        self._factor(0, n)
+
+    def _factor(self, start, stop):
+        """
+        Прямой ход разложения для строк [start, stop); возвращает строку, на которой
+        ведущие элементы перестали меняться (дальше разложение прежнее).
+        """
+        n = len(self.diagonal)
+        for i in range(start, n):
+            pivot = self.diagonal[i] - (self.lower[i] * self.ratios[i - 1] if i else 0)
+            if i >= stop and pivot == self.pivots[i]:
+                return i
+            self.pivots[i] = pivot
+            if i < n - 1:
+                self.ratios[i] = self.upper[i] / pivot
+        return n
+
+    def update_rows(self, start, stop, lower, diagonal, upper):
+        """
+        Заменяет строки [start, stop) матрицы и обновляет разложение. Ведущие элементы
+        следующих строк сходятся к прежним, поэтому пересчет обычно короткий.
+        """
+        self.lower[start:stop] = lower
+        self.diagonal[start:stop] = diagonal
+        self.upper[start:stop] = upper
+        return self._factor(start, stop)
+
+    def solve(self, rhs):
+        """
+        :param rhs: Правая часть формы (n,) или (n, k).
+        :return: Решение той же формы.
+        """
+        x = np.array(rhs, dtype=np.float64)
+        x[0] /= self.pivots[0]
+        for i in range(1, len(x)):
+            x[i] = (x[i] - self.lower[i] * x[i - 1]) / self.pivots[i]
+        for i in range(len(x) - 2, -1, -1):
+            x[i] -= self.ratios[i] * x[i + 1]
+        return x
+
+    def solve_local(self, rhs, start, tolerance=1e-16):
+        """
+        Решение для правой части, отличной от нуля только в строках start, start + 1, ...
+        Для диагонально преобладающей матрицы решение затухает геометрически по обе
+        стороны от этих строк, поэтому прогонка обрывается, когда поправки становятся
+        меньше tolerance относительно наибольшей.
+        :param rhs: Ненулевые строки правой части формы (k,) или (k, D).
+        :param start: Номер первой из этих строк.
+        :return: Кортеж (first, x): решение отлично от нуля только в строках first, first + 1, ...
+        """
+        rhs = np.asarray(rhs, dtype=np.float64)
+        # Одностолбцовая правая часть решается на обычных числах: так цикл заметно быстрее
+        columns = rhs.shape[1:]
+        rhs = rhs.ravel().tolist() if rhs.size == len(rhs) else list(rhs)
+        size = abs if not columns or columns == (1,) else (lambda value: np.abs(value).max())
+        lower, pivots, ratios = self.lower, self.pivots, self.ratios
+        n, stop = len(pivots), start + len(rhs)
+
+        forward = []
+        previous, largest = 0.0, 0.0
+        for i in range(start, n):
+            value = ((rhs[i - start] if i < stop else 0.0) - (float(lower[i]) * previous if i else 0.0)) / float(pivots[i])
+            forward.append(value)
+            previous = value
+            largest = max(largest, size(value))
+            if i >= stop and size(value) <= tolerance * largest:
+                break
+
+        end = start + len(forward)
+        backward = [forward[-1]]
+        for i in range(end - 2, -1, -1):
+            value = (forward[i - start] if i >= start else 0.0) - float(ratios[i]) * backward[-1]
+            backward.append(value)
+            if i < start and size(value) <= tolerance * largest:
+                break
+        return end - len(backward), np.array(backward[::-1]).reshape((len(backward),) + columns)
+
+
+class InterpolatingSpline:
+    """
+    Кубический C2-сплайн y(x) через точки, хранимый как сегменты Эрмита.
+    Наклоны в узлах находятся из трехдиагональной системы; на концах задаются
+    касательные (закрепленный сплайн) или нулевая вторая производная (естественный).
+    """
+
+    def __init__(self, x, y, start_slope=None, end_slope=None):
+        """
+        :param x: Узлы, строго возрастающие.
+        :param y: Значения в узлах формы (n,) или (n, D).
+        :param start_slope: Производная dy/dx в первом узле; None — естественное условие.
+        :param end_slope: Производная dy/dx в последнем узле; None — естественное условие.
+        """
+        self.x = np.array(x, dtype=np.float64)
+        self.y = np.array(y, dtype=np.float64)
+        if len(self.x) < 2 or np.any(np.diff(self.x) <= 0):
+            raise ValueError('x должны строго возрастать, нужно не меньше двух узлов')
+        self.start_slope, self.end_slope = start_slope, end_slope
+        self.h = np.diff(self.x)
+        self.solver = TridiagonalSolver(*self._matrix())
+        self.slopes = self.solver.solve(self._rhs())
+        self.segments = self._segments()
+
+    def _matrix(self):
+        n, inv = len(self.x), 1 / self.h
+        lower, diagonal, upper = np.zeros(n), np.zeros(n), np.zeros(n)
+        lower[1:-1], upper[1:-1] = inv[:-1], inv[1:]
+        diagonal[1:-1] = 2 * (inv[:-1] + inv[1:])
+        # Закрепленный конец: наклон задан; естественный: 2·m0 + m1 = 3·d0
+        diagonal[0] = diagonal[-1] = 1
+        if self.start_slope is None:
+            diagonal[0], upper[0] = 2, 1
+        if self.end_slope is None:
+            diagonal[-1], lower[-1] = 2, 1
+        return lower, diagonal, upper
+
+    def _rhs(self):
+        h = self.h.reshape((-1,) + (1,) * (self.y.ndim - 1))
+        d = np.diff(self.y, axis=0) / h
+        rhs = np.empty_like(self.y)
+        rhs[1:-1] = 3 * (d[:-1] / h[:-1] + d[1:] / h[1:])
+        rhs[0] = 3 * d[0] if self.start_slope is None else self.start_slope
+        rhs[-1] = 3 * d[-1] if self.end_slope is None else self.end_slope
+        return rhs
+
+    def _segments(self):
+        # Параметр сегмента u = (x - x_i) / h_i, поэтому касательные по u равны h_i·dy/dx
+        h = self.h.reshape((-1,) + (1,) * (self.y.ndim - 1))
+        return HermiteSegments(self._column(self.y[:-1]), self._column(self.y[1:]),
+                               self._column(h * self.slopes[:-1]), self._column(h * self.slopes[1:]))
+
+    def _column(self, values):
+        return values.reshape(len(values), -1)
+
+    def move_point(self, index, x=None, y=None):
+        """
+        Перемещает один узел и обновляет только затронутые сегменты.
+        Новая система отличается от старой лишь в строках index - 1 .. index + 1, поэтому
+        поправка наклонов решается с правой частью из невязки этих строк (solve_local) на
+        прежнем разложении; при сдвиге по x разложение обновляется с этих строк.
+        :return: Срез затронутых сегментов.
+        """
+        if x is not None:
+            low = self.x[index - 1] if index > 0 else -np.inf
+            high = self.x[index + 1] if index < len(self.x) - 1 else np.inf
+            if not low < x < high:
+                raise ValueError('узел не может перейти через соседние: x должны строго возрастать')
+            self.x[index] = x
+            self.h = np.diff(self.x)
+        if y is not None:
+            self.y[index] = y
+        start, stop = max(index - 1, 0), min(index + 2, len(self.x))
+        if x is not None:
+            lower, diagonal, upper = self._matrix()
+            self.solver.update_rows(start, stop, lower[start:stop], diagonal[start:stop], upper[start:stop])
+        return self._refit(start, stop, (max(index - 1, 0), min(index + 1, len(self.h))))
+
+    def set_end_slopes(self, start_slope=None, end_slope=None):
+        """
+        Меняет условия на концах (наклоны или естественное условие при None).
+        :return: Срез затронутых сегментов.
+        """
+        changed = [i for i, old, new in ((0, self.start_slope, start_slope), (len(self.x) - 1, self.end_slope, end_slope))
+                   if (old is None) != (new is None) or (old is not None and not np.all(old == new))]
+        self.start_slope, self.end_slope = start_slope, end_slope
+        if not changed:
+            return slice(0, 0)
+        lower, diagonal, upper = self._matrix()
+        affected = []
+        for i in changed:
+            self.solver.update_rows(i, i + 1, lower[i], diagonal[i], upper[i])
+            affected.append(self._refit(i, i + 1))
+        return slice(min(a.start for a in affected), max(a.stop for a in affected))
+
+    def _refit(self, start, stop, moved=None):
+        """
+        Поправляет наклоны по невязке строк [start, stop) и пересчитывает сегменты,
+        у которых изменились наклоны или концы (moved — диапазон сегментов с новыми точками).
+        """
+        solver = self.solver
+        rows = np.arange(start, stop)
+        slopes = self.slopes
+        # Строки A @ m; нули по краям заменяют отсутствующих соседей
+        padded = np.pad(self._column(slopes), ((1, 1), (0, 0)))
+        product = (solver.lower[rows, None] * padded[rows] + solver.diagonal[rows, None] * padded[rows + 1]
+                   + solver.upper[rows, None] * padded[rows + 2])
+        residual = self._column(self._rhs()[start:stop]) - product
+        first, delta = solver.solve_local(residual, start)
+        slopes[first:first + len(delta)] += delta.reshape((len(delta),) + slopes.shape[1:])
+
+        begin, end = max(first - 1, 0), min(first + len(delta), len(self.h))
+        if moved is not None:
+            begin, end = min(begin, moved[0]), max(end, moved[1])
+        h = self.h[begin:end].reshape((-1,) + (1,) * (self.y.ndim - 1))
+        self.segments.update(begin, self._column(self.y[begin:end]), self._column(self.y[begin + 1:end + 1]),
+                             self._column(h * slopes[begin:end]), self._column(h * slopes[begin + 1:end + 1]))
+        return slice(begin, end)
+
+    def as_curve(self):
+        """
+        График сплайна как параметрическая кривая (x(u), y(u)) из сегментов Эрмита;
+        нужен, например, для длины дуги (ArcLengthTable).
+        """
+        h = self.h[:, None]
+        return HermiteSegments(np.column_stack([self.x[:-1], self._column(self.y[:-1])]),
+                               np.column_stack([self.x[1:], self._column(self.y[1:])]),
+                               np.column_stack([h, h * self._column(self.slopes[:-1])]),
+                               np.column_stack([h, h * self._column(self.slopes[1:])]))
+
+    def locate(self, x):
+        """
+        :return: Номера сегментов и локальные параметры u ∈ [0, 1] для значений x.
+        """
+        index = np.clip(np.searchsorted(self.x, x, side='right') - 1, 0, len(self.h) - 1)
+        return index, (x - self.x[index]) / self.h[index]
+
+    def __call__(self, x, derivative=0):
+        """
+        Значения сплайна (или его производной по x) в точках x.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        index, u = self.locate(x.ravel())
+        values = self.segments.evaluate_at(index, u, derivative) / self.h[index, None] ** derivative
+        return values.reshape(x.shape + self.y.shape[1:])
+
+
+class ArcLengthTable:
+    """
+    Таблица накопленной длины дуги цепочки сегментов Эрмита и обратный поиск s -> (сегмент, t).
+    Скорость |p'(t)| — корень из многочлена 4-й степени, его коэффициенты считаются один раз.
+    Каждый сегмент делится на несколько равных частей, длина каждой части считается
+    квадратурой Гаусса–Лежандра сразу для всех частей. Обратный поиск: np.searchsorted
+    по таблице, линейное начальное приближение внутри части и несколько шагов Ньютона
+    (производная длины по t — скорость).
+    """
+
+    def __init__(self, segments, subdivisions=8, order=5):
+        """
+        :param segments: Сегменты HermiteSegments, идущие друг за другом.
+        :param subdivisions: На сколько частей делится каждый сегмент.
+        :param order: Количество узлов квадратуры Гаусса–Лежандра.
+        """
+        self.segments = segments
+        self.subdivisions = subdivisions
+        nodes, weights = np.polynomial.legendre.leggauss(order)
+        # Узлы и веса на отрезке [0, 1]
+        self.nodes, self.weights = (nodes + 1) / 2, weights / 2
+
+        self.speed2 = self._speed_coefficients(segments.coefficients)
+        # Длины частей подряд по всем сегментам; таблица — их накопленная сумма
+        self.parts = self._part_lengths(np.arange(len(segments)))
+        self.lengths = np.concatenate([[0], np.cumsum(self.parts)])
+
+    def update(self, segments, affected):
+        """
+        Пересчитывает таблицу после изменения части сегментов (например, после
+        InterpolatingSpline.move_point); длины остальных сегментов не пересчитываются.
+        :param segments: Сегменты HermiteSegments того же количества.
+        :param affected: Срез измененных сегментов.
+        """
+        self.segments = segments
+        if affected.start == affected.stop:
+            return
+        self.speed2[affected] = self._speed_coefficients(segments.coefficients[affected])
+        begin, end = affected.start * self.subdivisions, affected.stop * self.subdivisions
+        self.parts[begin:end] = self._part_lengths(np.arange(affected.start, affected.stop))
+        self.lengths[begin + 1:] = self.lengths[begin] + np.cumsum(self.parts[begin:])
+
+    @staticmethod
+    def _speed_coefficients(coefficients):
+        # p'(t) = 3a·t^2 + 2b·t + c, поэтому |p'(t)|^2 — свертка коэффициентов по каждой координате
+        a, b, c = coefficients[:, 0], coefficients[:, 1], coefficients[:, 2]
+        return np.stack([
+            np.sum(9 * a * a, axis=-1),
+            np.sum(12 * a * b, axis=-1),
+            np.sum(4 * b * b + 6 * a * c, axis=-1),
+            np.sum(4 * b * c, axis=-1),
+            np.sum(c * c, axis=-1),
+        ], axis=-1)
+
+    def _part_lengths(self, index):
+        """
+        Длины равных частей сегментов index подряд (по subdivisions на сегмент).
+        """
+        step = 1 / self.subdivisions
+        local = (np.arange(self.subdivisions)[:, None] + self.nodes) * step
+        speed = self._speed(index[:, None, None], local)
+        return (speed @ self.weights * step).ravel()
+
+    @property
+    def total_length(self):
+        return self.lengths[-1]
+
+    def _speed(self, index, t):
+        """
+        Скорость |p'(t)| сегментов index (схема Горнера; index согласуется с t по broadcast).
+        """
+        coefficients = self.speed2[index]
+        value = coefficients[..., 0]
+        for k in range(1, 5):
+            value = value * t + coefficients[..., k]
+        return np.sqrt(np.maximum(value, 0))
+
+    def _partial(self, index, start, t):
+        """
+        Длина дуги сегментов index от start до t той же квадратурой.
+        """
+        tt = start[:, None] + (t - start)[:, None] * self.nodes
+        return self._speed(index[:, None], tt) @ self.weights * (t - start)
+
+    def locate(self, s, newton_steps=3, chunk=1 << 16):
+        """
+        Обратная функция длины дуги для большого массива запросов.
+        :param s: Значения длины дуги (обрезаются до [0, total_length]).
+        :param newton_steps: Количество шагов Ньютона.
+        :param chunk: Сколько запросов обрабатывается за раз (ограничивает память).
+        :return: Номера сегментов и параметры t ∈ [0, 1] той же формы, что и s.
+        """
+        s = np.clip(np.asarray(s, dtype=np.float64), 0, self.total_length)
+        flat = s.ravel()
+        index = np.empty(flat.shape, dtype=np.intp)
+        t = np.empty(flat.shape)
+        for begin in range(0, len(flat), chunk):
+            query = flat[begin:begin + chunk]
+            piece = np.clip(np.searchsorted(self.lengths, query, side='right') - 1, 0, len(self.lengths) - 2)
+            segment, part = np.divmod(piece, self.subdivisions)
+            start, end = part / self.subdivisions, (part + 1) / self.subdivisions
+            base = self.lengths[piece]
+            width = self.lengths[piece + 1] - base
+            guess = start + (query - base) / np.where(width > 0, width, 1) * (end - start)
+            for _ in range(newton_steps):
+                error = base + self._partial(segment, start, guess) - query
+                guess = np.clip(guess - error / np.maximum(self._speed(segment, guess), 1e-12), start, end)
+            index[begin:begin + chunk], t[begin:begin + chunk] = segment, guess
+        return index.reshape(s.shape), t.reshape(s.shape)
+
+    def points(self, s, **kwargs):
+        """
+        Точки кривой на заданной длине дуги; форма (..., D).
+        """
+        index, t = self.locate(s, **kwargs)
+        return self.segments.evaluate_at(index.ravel(), t.ravel()).reshape(np.shape(s) + (-1,))
+
+    def resample(self, count):
+        """
+        count точек, равномерно расставленных по длине дуги (постоянная скорость движения).
+        """
+        return self.points(np.linspace(0, self.total_length, count))
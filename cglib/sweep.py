@@ -0,0 +1,253 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cglib.frame_writer import encode_png
+from cglib.indexed_mesh import weld_vertices
+from cglib.mesh_cache import MeshCache
+from cglib.meshgen import dodecahedron, generate_ring_faces, generate_ring_vertices
+from cglib.raster import render_mesh
+from cglib.shading import ShadingEngine, face_normals
+from cglib.transforms import TransformStack
+
+# Параметры сцен и их значения по умолчанию; порядок задает порядок перебора и имена файлов
+SCENES = {
+    'barrel': {'segments': 20, 'light_azimuth': 45, 'elev': 30, 'azim': -60},
+    'dodecahedron': {'alpha': 0, 'beta': 0, 'gamma': 0, 'light_azimuth': 135, 'elev': 30, 'azim': -60},
+}
+
+# Баррель Labs3/lab3V2.py: высота и радиус
+BARREL_H, BARREL_R = 15, 3
+
+# Цвет граней додекаэдра, как в Labs2/labs2.py, и доля рассеянного света: без ребер
+# неосвещенные грани иначе слились бы в одно черное пятно
+DODECAHEDRON_COLOR = (0.0, 1.0, 1.0)
+AMBIENT = 0.25
+
+# Состояние рабочего процесса: кэш сеток на общем каталоге и параметры вывода
+_worker = {}
+
+
+def barrel_key(n_segments):
+    """
+    Ключ кэша сеток барреля, совпадающий с ключом Labs3/lab3V2.py (каталог CGLIB_MESH_DIR общий).
+    """
+    return 'cylinder', BARREL_H, (BARREL_R,), n_segments
+
+
+def build_barrel(n_segments):
+    # Та же сетка, что в Labs3/lab3V2.py: шов слит
+    vertices, faces, _ = weld_vertices(generate_ring_vertices(BARREL_R, BARREL_H, n_segments, n_segments),
+                                       generate_ring_faces(n_segments, n_segments))
+    return vertices, faces, face_normals(vertices, faces)
+
+
+def expand_sweep(spec):
+    """
+    Разворачивает описание перебора в список заданий в детерминированном порядке.
+    Описание — словарь {'scene': имя, параметр: значение или список значений, ...}
+    или список таких словарей; задания — декартово произведение списков.
+    :return: Список пар (сцена, словарь параметров).
+    """
+    jobs = []
+    for item in ([spec] if isinstance(spec, dict) else spec):
+        item = dict(item)
+        scene = item.pop('scene', None)
+        if scene not in SCENES:
+            raise ValueError(f'Неизвестная сцена: {scene}')
+        unknown = set(item) - set(SCENES[scene])
+        if unknown:
+            raise ValueError(f'Неизвестные параметры сцены {scene}: {", ".join(sorted(unknown))}')
+        names = list(SCENES[scene])
+        values = [item.get(name, default) for name, default in SCENES[scene].items()]
+        values = [value if isinstance(value, (list, tuple)) else [value] for value in values]
+        for combination in itertools.product(*values):
+            jobs.append((scene, dict(zip(names, combination))))
+    return jobs
+
+
+def _format_value(value):
+    if isinstance(value, (int, np.integer)):
+        return f'{value:03d}'
+    return f'{value:g}'
+
+
+def image_name(scene, params):
+    """
+    Имя файла изображения по параметрам, например barrel_segments020_light_azimuth045_elev030_azim-60.png.
+    """
+    return '_'.join([scene] + [name + _format_value(value) for name, value in params.items()]) + '.png'
+
+
+def _init_worker(mesh_dir, backend, width, height, barrier=None):
+    _worker['cache'] = MeshCache(directory=mesh_dir)
+    _worker['shading'] = ShadingEngine()
+    _worker['backend'] = backend
+    _worker['size'] = width, height
+    _worker['barrier'] = barrier
+
+
+def _warm_up():
+    # Процесс ждет остальных, поэтому каждое задание прогрева достается отдельному процессу
+    _worker['barrier'].wait(timeout=60)
+
+
+def _scene_mesh(scene, params):
+    """
+    Геометрия сцены и цвета граней при освещении по Ламберту.
+    Высота света следует за азимутом, как у объединенного ползунка Labs3/lab3V2.py.
+    """
+    light_altitude = 90 - abs(params['light_azimuth'] - 180)
+    if scene == 'barrel':
+        # Сетка уже построена родительским процессом: кэш отображает контейнер с диска
+        n_segments = params['segments']
+        vertices, faces, normals = _worker['cache'].get(barrel_key(n_segments), lambda: build_barrel(n_segments))
+        shading = _worker['shading']
+        shading.set_geometry(vertices, faces, normals)
+        return vertices, faces, shading.shade(params['light_azimuth'], light_altitude)
+
+    if 'dodecahedron' not in _worker:
+        _worker['dodecahedron'] = dodecahedron()
+    vertices, faces = _worker['dodecahedron']
+    angles = np.radians([params['alpha'], params['beta'], params['gamma']])
+    vertices = TransformStack().rotate(*angles).apply(vertices)
+    shading = ShadingEngine()
+    shading.set_geometry(vertices, faces)
+    intensity = AMBIENT + (1 - AMBIENT) * shading.intensity(params['light_azimuth'], light_altitude)
+    colors = intensity[:, None] * DODECAHEDRON_COLOR
+    return vertices, faces, colors
+
+
+def _render_agg(vertices, faces, colors, width, height, elev, azim):
+    """
+    Отрисовка через matplotlib без окна: Figure с холстом Agg, без pyplot.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+    fig = Figure(figsize=(width / 100, height / 100), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes((0, 0, 1, 1), projection='3d')
+    ax.add_collection3d(Poly3DCollection(vertices[np.asarray(faces)], facecolors=colors, linewidths=0.5,
+                                         edgecolors=(0, 0, 0, 0.3)))
+    center = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+    radius = np.abs(vertices - center).max()
+    ax.set_xlim(center[0] - radius, center[0] + radius)
+    ax.set_ylim(center[1] - radius, center[1] + radius)
+    ax.set_zlim(center[2] - radius, center[2] + radius)
+    ax.set_box_aspect((1, 1, 1))
+    ax.set_axis_off()
+    ax.view_init(elev, azim)
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())[:, :, :3]
+
+
+def render_job(job):
+    """
+    Рабочая функция: отрисовывает одно задание и записывает PNG.
+    :param job: Кортеж (сцена, параметры, путь к файлу).
+    :return: Путь к файлу.
+    """
+    scene, params, path = job
+    vertices, faces, colors = _scene_mesh(scene, params)
+    width, height = _worker['size']
+    render = _render_agg if _worker['backend'] == 'agg' else render_mesh
+    image = render(vertices, faces, colors, width, height, params['elev'], params['azim'])
+    with open(path, 'wb') as file:
+        file.write(encode_png(image))
+    return path
+
+
+def prepare_meshes(jobs, mesh_dir):
+    """
+    Строит сетки всех разрешений барреля один раз и сохраняет их в контейнеры каталога mesh_dir.
+    Рабочие процессы отображают эти файлы через np.memmap и делят страницы в кэше ОС.
+    """
+    cache = MeshCache(directory=mesh_dir)
+    for n_segments in sorted({params['segments'] for scene, params in jobs if scene == 'barrel'}):
+        cache.get(barrel_key(n_segments), lambda: build_barrel(n_segments))
+
+
+def run_sweep(spec, out_dir, workers=None, backend='raster', width=400, height=400, mesh_dir=None):
+    """
+    Отрисовывает все задания перебора в пуле процессов.
+    :param spec: Описание перебора (см. expand_sweep).
+    :param out_dir: Каталог изображений; имена файлов зависят только от параметров.
+    :param workers: Количество процессов; None — по числу ядер, 0 — в текущем процессе.
+    :param backend: 'raster' — программный растеризатор, 'agg' — matplotlib с холстом Agg.
+    :param mesh_dir: Каталог контейнеров сеток или None — временный на время перебора.
+    :return: Словарь со временем подготовки сеток, запуска процессов, отрисовки и пропускной
+        способностью; пропускная способность считается только по времени отрисовки.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(scene, params, os.path.join(out_dir, image_name(scene, params))) for scene, params in expand_sweep(spec)]
+    with tempfile.TemporaryDirectory() as temporary:
+        mesh_dir = temporary if mesh_dir is None else mesh_dir
+        start = time.perf_counter()
+        prepare_meshes([job[:2] for job in jobs], mesh_dir)
+        prepared = time.perf_counter()
+        if workers == 0:
+            _init_worker(mesh_dir, backend, width, height)
+            started = time.perf_counter()
+            for job in jobs:
+                render_job(job)
+        else:
+            workers = workers or os.cpu_count()
+            # Задания раздаются пачками, чтобы пересылка не преобладала над отрисовкой
+            chunksize = max(1, len(jobs) // (4 * workers))
+            context = multiprocessing.get_context()
+            with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                     initargs=(mesh_dir, backend, width, height, context.Barrier(workers))) as pool:
+                # Запуск и инициализация всех процессов до замера отрисовки
+                for future in [pool.submit(_warm_up) for _ in range(workers)]:
+                    future.result()
+                started = time.perf_counter()
+                for _ in pool.map(render_job, jobs, chunksize=chunksize):
+                    pass
+        finished = time.perf_counter()
+    render_s = finished - started
+    return {'workers': workers, 'images': len(jobs), 'prepare_s': prepared - start, 'startup_s': started - prepared,
+            'render_s': render_s, 'images_per_s': len(jobs) / render_s if render_s > 0 else float('inf')}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Пакетная отрисовка барреля Labs3 и додекаэдра Labs2 по сетке параметров. '
+                    'Пример: python -m cglib.sweep \'{"scene": "barrel", "segments": [8, 16, 32], '
+                    '"light_azimuth": [0, 90, 180]}\' --workers 1 2 4')
+    parser.add_argument('spec', help='Файл JSON с описанием перебора или сам текст JSON')
+    parser.add_argument('--out', default='renders', help='Каталог изображений')
+    parser.add_argument('--workers', type=int, nargs='+', default=[os.cpu_count()],
+                        help='Количество процессов; несколько значений — замер масштабирования')
+    parser.add_argument('--backend', choices=('raster', 'agg'), default='raster')
+    parser.add_argument('--size', type=int, nargs=2, default=(400, 400), metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--mesh-dir', default=os.environ.get('CGLIB_MESH_DIR'),
+                        help='Каталог контейнеров сеток (по умолчанию CGLIB_MESH_DIR или временный)')
+    args = parser.parse_args()
+
+    if os.path.exists(args.spec):
+        with open(args.spec) as file:
+            spec = json.load(file)
+    else:
+        spec = json.loads(args.spec)
+
+    base = None
+    for workers in args.workers:
+        result = run_sweep(spec, args.out, workers, args.backend, *args.size, args.mesh_dir)
+        base = base or result['images_per_s']
+        print(f'Процессов: {workers}, изображений: {result["images"]}, подготовка сеток: '
+              f'{result["prepare_s"]:.3f} с, запуск процессов: {result["startup_s"]:.3f} с, '
+              f'отрисовка: {result["render_s"]:.3f} с, '
+              f'{result["images_per_s"]:.1f} изобр./с (x{result["images_per_s"] / base:.2f})')
+
+
+if __name__ == '__main__':
+    main()
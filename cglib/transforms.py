@@ -0,0 +1,135 @@
+import numpy as np
+
+
+def rotation(alpha, beta, gamma):
+    """
+    Однородная матрица поворота Rz @ Ry @ Rx для углов Эйлера (в радианах).
+    """
+    ca, sa = np.cos(alpha), np.sin(alpha)
+    cb, sb = np.cos(beta), np.sin(beta)
+    cg, sg = np.cos(gamma), np.sin(gamma)
+    matrix = np.eye(4)
+    matrix[:3, :3] = [
+        [cg * cb, cg * sb * sa - sg * ca, cg * sb * ca + sg * sa],
+        [sg * cb, sg * sb * sa + cg * ca, sg * sb * ca - cg * sa],
+        [-sb, cb * sa, cb * ca],
+    ]
+    return matrix
+
+
+def scaling(scale):
+    """
+    Однородная матрица масштабирования (число или тройка коэффициентов).
+    """
+    matrix = np.eye(4)
+    matrix[[0, 1, 2], [0, 1, 2]] = scale
+    return matrix
+
+
+def translation(offset):
+    """
+    Однородная матрица переноса на вектор offset.
+    """
+    matrix = np.eye(4)
+    matrix[:3, 3] = offset
+    return matrix
+
+
+def orthographic():
+    """
+    Ортографическая проекция на плоскость XY (координата z обнуляется).
+    """
+    return scaling((1, 1, 0))
+
+
+class TransformStack:
+    """
+    Композиция преобразований в одну однородную матрицу 4x4.
+    Точки рассматриваются как столбцы: каждая следующая операция применяется
+    после предыдущих, то есть matrix = M_new @ matrix. Методы возвращают self.
+    """
+
+    def __init__(self, matrix=None):
+        self.matrix = np.eye(4) if matrix is None else np.array(matrix, dtype=np.float64)
+        self._saved = []
+
+    def then(self, matrix):
+        """
+        Добавляет произвольную матрицу 4x4 (или 3x3 линейную часть).
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.shape == (3, 3):
+            full = np.eye(4)
+            full[:3, :3] = matrix
+            matrix = full
+        self.matrix = matrix @ self.matrix
+        return self
+
+    def rotate(self, alpha, beta, gamma):
+        return self.then(rotation(alpha, beta, gamma))
+
+    def scale(self, scale):
+        return self.then(scaling(scale))
+
+    def translate(self, offset):
+        return self.then(translation(offset))
+
+    def project(self, matrix=None):
+        """
+        Добавляет проекцию; по умолчанию ортографическую на плоскость XY.
+        """
+        return self.then(orthographic() if matrix is None else matrix)
+
+    def push(self):
+        """
+        Запоминает текущую матрицу (как glPushMatrix).
+        """
+        self._saved.append(self.matrix.copy())
+        return self
+
+    def pop(self):
+        """
+        Восстанавливает последнюю запомненную матрицу.
+        """
+        self.matrix = self._saved.pop()
+        return self
+
+    def apply(self, vertices, out=None):
+        """
+        Применяет композицию к вершинам; см. transform_points.
+        """
+        return transform_points(self.matrix, vertices, out)
+
+
+def transform_points(matrices, vertices, out=None):
+    """
+    Применяет однородные матрицы к пакетам вершин одним matmul.
+    :param matrices: Матрица (4, 4) или пакет матриц (B, 4, 4).
+    :param vertices: Вершины формы (N, 3) или (B, N, 3).
+    :param out: Необязательный выходной буфер нужной формы (может совпадать с vertices).
+    :return: Преобразованные вершины; при перспективной матрице выполняется деление на w.
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    vertices = np.asarray(vertices)
+    linear = np.swapaxes(matrices[..., :3, :3], -1, -2)
+    offset = matrices[..., None, :3, 3]
+    affine = np.all(matrices[..., 3, :] == (0, 0, 0, 1))
+
+    if affine:
+        shape = np.broadcast_shapes(vertices.shape[:-2], matrices.shape[:-2]) + vertices.shape[-2:]
+        if out is None:
+            out = np.empty(shape)
+        if out is vertices:
+            # matmul не работает на месте, поэтому промежуточный результат нужен
+            out[...] = vertices @ linear
+        else:
+            np.matmul(vertices, linear, out=out)
+        out += offset
+        return out
+
+    w = vertices @ np.swapaxes(matrices[..., 3:, :3], -1, -2) + matrices[..., None, 3:, 3]
+    result = (vertices @ linear + offset) / w
+    if out is None:
+        return result
+    out[...] = result
+    return out
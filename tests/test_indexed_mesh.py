@@ -0,0 +1,37 @@
+"""
+Слияние вершин шва сеток колец (cglib.indexed_mesh.weld_vertices).
+
+Запуск: python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cglib.indexed_mesh import weld_vertices
+from cglib.meshgen import barrel_profile, generate_ring_faces, generate_ring_vertices
+
+
+@pytest.mark.parametrize('profile', [3, barrel_profile(15, 2, 5)])
+@pytest.mark.parametrize('n_radial, n_axial', [(3, 1), (20, 20), (37, 8)])
+def test_weld_removes_seam(profile, n_radial, n_axial):
+    vertices = generate_ring_vertices(profile, 15, n_radial, n_axial)
+    faces = generate_ring_faces(n_radial, n_axial)
+    welded, welded_faces, remap = weld_vertices(vertices, faces)
+
+    # Каждое из n_axial + 1 колец теряет только повтор первой точки
+    assert len(welded) == len(vertices) - (n_axial + 1)
+    assert len(welded_faces) == len(faces)
+    np.testing.assert_allclose(welded[remap], vertices, atol=1e-9)
+    np.testing.assert_allclose(welded[welded_faces], vertices[faces], atol=1e-9)
+
+
+def test_weld_keeps_seamless_ring():
+    vertices = generate_ring_vertices(3, 15, 20, 20, seam=False)
+    faces = generate_ring_faces(20, 20, seam=False)
+    welded, welded_faces, _ = weld_vertices(vertices, faces)
+    assert len(welded) == len(vertices)
+    np.testing.assert_array_equal(welded_faces, faces)